@@ -1,16 +1,24 @@
-with open("day1.txt") as f:
-    lines = f.readlines()
-
-chunks = "".join(lines).split("\n\n")
-
-
 def chunk_to_sum(s: str) -> int:
     vals = s.split()
     return sum(int(i) for i in vals)
 
 
-elves = [chunk_to_sum(s) for s in chunks]
+def parse(text: str) -> list[int]:
+    chunks = text.split("\n\n")
+    return [chunk_to_sum(s) for s in chunks]
+
+
+def part1(elves: list[int]) -> int:
+    return max(elves)
+
+
+def part2(elves: list[int]) -> int:
+    return sum(sorted(elves, reverse=True)[:3])
+
+
+if __name__ == "__main__":
+    with open("day1.txt") as f:
+        elves = parse(f.read())
 
-print(f"Part 1: {max(elves)}")
-elves.sort(reverse=True)
-print(f"Part 2: {sum(elves[:3])}")
+    print(f"Part 1: {part1(elves)}")
+    print(f"Part 2: {part2(elves)}")
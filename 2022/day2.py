@@ -1,11 +1,5 @@
 from typing import Tuple, List
 
-with open("day2.txt") as f:
-    lines = f.readlines()
-
-rounds: List[Tuple] = [tuple(l.strip().split()) for l in lines]
-rounds = [("ABC".index(p1), "XYZ".index(p2)) for p1, p2 in rounds]
-
 
 def choice_score(p2: int) -> int:
     return [1, 2, 3][p2]
@@ -24,5 +18,22 @@ def result_to_choice(players: Tuple[int, int]) -> Tuple[int, int]:
     return p1, (p1 + (p2 - 1)) % 3
 
 
-print(f"Part 1: {sum(choice_score(p2) + win_score(p1, p2) for p1, p2 in rounds)}")
-print(f"Part 2: {sum(choice_score(p2) + win_score(p1, p2) for p1, p2 in map(result_to_choice, rounds))}")
\ No newline at end of file
+def parse(text: str) -> List[Tuple[int, int]]:
+    rounds: List[Tuple] = [tuple(l.strip().split()) for l in text.splitlines() if l.strip()]
+    return [("ABC".index(p1), "XYZ".index(p2)) for p1, p2 in rounds]
+
+
+def part1(rounds: List[Tuple[int, int]]) -> int:
+    return sum(choice_score(p2) + win_score(p1, p2) for p1, p2 in rounds)
+
+
+def part2(rounds: List[Tuple[int, int]]) -> int:
+    return sum(choice_score(p2) + win_score(p1, p2) for p1, p2 in map(result_to_choice, rounds))
+
+
+if __name__ == "__main__":
+    with open("day2.txt") as f:
+        rounds = parse(f.read())
+
+    print(f"Part 1: {part1(rounds)}")
+    print(f"Part 2: {part2(rounds)}")
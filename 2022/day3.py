@@ -3,9 +3,6 @@ import string
 from functools import reduce
 from typing import Tuple, Set, List
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    lines = [l.strip() for l in f.readlines()]
-
 
 def split_line(s: str) -> Tuple[str, str]:
     return s[:len(s) // 2], s[len(s) // 2:]
@@ -21,13 +18,26 @@ def letter_to_score(s: set) -> int:
     return alphabet.index(s.pop()) + 1
 
 
-lines_map = sum(map(letter_to_score,
-                    map(find_duplicates,
-                        map(split_line, lines))))
+def parse(text: str) -> List[str]:
+    return [l.strip() for l in text.splitlines() if l.strip()]
+
+
+def part1(lines: List[str]) -> int:
+    return sum(map(letter_to_score,
+                   map(find_duplicates,
+                       map(split_line, lines))))
+
+
+def part2(lines: List[str]) -> int:
+    lines_as_sets: List[Set] = [set(l) for l in lines]
+    groups: List[List[Set]] = [lines_as_sets[i:i+3] for i in range(0, len(lines_as_sets), 3)]
+    unique_letters = [reduce(operator.and_, group) for group in groups]
+    return sum(letter_to_score(s) for s in unique_letters)
+
 
-print(f"Part 1: {lines_map}")
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        lines = parse(f.read())
 
-lines_as_sets: List[Set] = [set(l) for l in lines]
-groups: List[List[Set]] = [lines_as_sets[i:i+3] for i in range(0, len(lines_as_sets), 3)]
-unique_letters = [reduce(operator.and_, group) for group in groups]
-print(f"Part 2: {sum(letter_to_score(s) for s in unique_letters)}")
+    print(f"Part 1: {part1(lines)}")
+    print(f"Part 2: {part2(lines)}")
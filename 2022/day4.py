@@ -1,10 +1,35 @@
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    lines = [l.strip() for l in f.readlines()]
+from typing import List, Tuple
 
-lines = [tuple(line.split(",")) for line in lines]
-lines = [tuple(x1.split("-") + x2.split("-")) for x1, x2 in lines]
-lines = [(int(x1), int(x2), int(x3), int(x4)) for x1, x2, x3, x4 in lines]
+Assignment = Tuple[int, int, int, int]
 
-print(f"Part 1: {sum(1 for xstart, xend, ystart, yend in lines if (ystart <= xstart <= xend <= yend) or (xstart <= ystart <= yend <= xend))}")
-print(f"Part 2: {sum(1 for xstart, xend, ystart, yend in lines if (ystart <= xstart <= yend) or (ystart <= xend <= yend) or (xstart <= ystart <= xend) or (xstart <= yend <= xend))}")
-print(f"Part 2: {sum(1 for xstart, xend, ystart, yend in lines if (ystart <= max(xstart, xend) <= yend) or (xstart <= max(ystart, yend)<= xend))}")
\ No newline at end of file
+
+def parse(text: str) -> List[Assignment]:
+    lines = [tuple(line.strip().split(",")) for line in text.splitlines() if line.strip()]
+    lines = [tuple(x1.split("-") + x2.split("-")) for x1, x2 in lines]
+    return [(int(x1), int(x2), int(x3), int(x4)) for x1, x2, x3, x4 in lines]
+
+
+def part1(lines: List[Assignment]) -> int:
+    return sum(1 for xstart, xend, ystart, yend in lines
+               if (ystart <= xstart <= xend <= yend) or (xstart <= ystart <= yend <= xend))
+
+
+def part2(lines: List[Assignment]) -> int:
+    return sum(1 for xstart, xend, ystart, yend in lines
+               if (ystart <= xstart <= yend) or (ystart <= xend <= yend)
+               or (xstart <= ystart <= xend) or (xstart <= yend <= xend))
+
+
+def part2_max(lines: List[Assignment]) -> int:
+    """ Shorter version of `part2()`. """
+    return sum(1 for xstart, xend, ystart, yend in lines
+               if (ystart <= max(xstart, xend) <= yend) or (xstart <= max(ystart, yend) <= xend))
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        lines = parse(f.read())
+
+    print(f"Part 1: {part1(lines)}")
+    print(f"Part 2: {part2(lines)}")
+    print(f"Part 2: {part2_max(lines)}")
@@ -1,39 +1,58 @@
 from collections import defaultdict
 from copy import deepcopy
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    lines = [l.strip("\n") for l in f.readlines()]
+Stacks = Dict[str, List]
 
-state = lines[:8]
-operations = lines[10:]
 
-state_lists: Dict[str, List] = defaultdict(lambda: list())
+def parse(text: str) -> Tuple[Stacks, List[str]]:
+    lines = text.split("\n")
+    state = lines[:8]
+    operations = [line for line in lines[10:] if line]
 
-for line in reversed(state):
-    for state_key, col_index in enumerate(range(1, len(line), 4), start=1):
-        if s := line[col_index].strip():
-            state_lists[str(state_key)].append(s)
+    state_lists: Stacks = defaultdict(lambda: list())
 
-state_lists2: Dict[str, List] = deepcopy(state_lists)
+    for line in reversed(state):
+        for state_key, col_index in enumerate(range(1, len(line), 4), start=1):
+            if s := line[col_index].strip():
+                state_lists[str(state_key)].append(s)
 
-# Process instructions - Part 1
-for instruction in operations:
-    _, iterations, _, src, _, dest = instruction.split()
-    for _ in range(int(iterations)):
-        state_lists[dest].append(state_lists[src].pop())
+    return state_lists, operations
 
-print(f'Part 1: {"".join([l[-1] for l in state_lists.values()])}')
 
-# ## Part 2
-# Process instructions - Part 2
-for instruction in operations:
-    _, height, _, src, _, dest = instruction.split()
-    height = int(height)
-    state_lists2[dest] += state_lists2[src][-height:]
-    state_lists2[src] = state_lists2[src][:-height]
+def part1(crates: Tuple[Stacks, List[str]]) -> str:
+    state, operations = crates
+    state_lists: Stacks = deepcopy(state)
 
-print(f'Part 2: {"".join([l[-1] for l in state_lists2.values()])}')
+    # Process instructions - Part 1
+    for instruction in operations:
+        _, iterations, _, src, _, dest = instruction.split()
+        for _ in range(int(iterations)):
+            state_lists[dest].append(state_lists[src].pop())
+
+    return "".join([l[-1] for l in state_lists.values()])
+
+
+def part2(crates: Tuple[Stacks, List[str]]) -> str:
+    state, operations = crates
+    state_lists2: Stacks = deepcopy(state)
+
+    # Process instructions - Part 2
+    for instruction in operations:
+        _, height, _, src, _, dest = instruction.split()
+        height = int(height)
+        state_lists2[dest] += state_lists2[src][-height:]
+        state_lists2[src] = state_lists2[src][:-height]
+
+    return "".join([l[-1] for l in state_lists2.values()])
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        crates = parse(f.read())
+
+    print(f'Part 1: {part1(crates)}')
+    print(f'Part 2: {part2(crates)}')
 
 """
 {0: ['R', 'G', 'J', 'B', 'T', 'V', 'Z'], 
@@ -1,7 +1,3 @@
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    line = [l.strip("\n") for l in f.readlines()][0]
-
-
 def find_unique_sequence_index(text: str, length: int) -> int:
     for i in range(len(text)):
         chunk = text[i:i + 4]
@@ -9,5 +5,21 @@ def find_unique_sequence_index(text: str, length: int) -> int:
             return i + length
 
 
-print(f"Part 1: {find_unique_sequence_index(line, 4)}")
-print(f"Part 2: {find_unique_sequence_index(line, 14)}")
\ No newline at end of file
+def parse(text: str) -> str:
+    return text.split("\n")[0]
+
+
+def part1(line: str) -> int:
+    return find_unique_sequence_index(line, 4)
+
+
+def part2(line: str) -> int:
+    return find_unique_sequence_index(line, 14)
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        line = parse(f.read())
+
+    print(f"Part 1: {part1(line)}")
+    print(f"Part 2: {part2(line)}")
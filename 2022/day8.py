@@ -3,9 +3,6 @@ import operator
 from functools import reduce
 from typing import List
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    trees = [l.strip("\n") for l in f.readlines()]
-
 
 def is_tree_visible_from_edge(forest: List[str], row: int, col: int) -> bool:
     """
@@ -66,8 +63,23 @@ def scenic_score(forest: List[str], row: int, col: int) -> int:
                   [view_distance(tree_row, int(forest[row][col])) for tree_row in tree_heights])
 
 
-coordinates = itertools.product(range(len(trees)), range(len(trees[0])))
-print(f"Part 1: {sum(1 for row, col in coordinates if is_tree_visible_from_edge(trees, row, col))}")
+def parse(text: str) -> List[str]:
+    return [l for l in text.split("\n") if l]
+
+
+def part1(trees: List[str]) -> int:
+    coordinates = itertools.product(range(len(trees)), range(len(trees[0])))
+    return sum(1 for row, col in coordinates if is_tree_visible_from_edge(trees, row, col))
+
+
+def part2(trees: List[str]) -> int:
+    coordinates = itertools.product(range(len(trees)), range(len(trees[0])))
+    return max(scenic_score(trees, row, col) for row, col in coordinates)
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        trees = parse(f.read())
 
-coordinates = itertools.product(range(len(trees)), range(len(trees[0])))
-print(f"Part 2: {max(scenic_score(trees, row, col) for row, col in coordinates)}")
+    print(f"Part 1: {part1(trees)}")
+    print(f"Part 2: {part2(trees)}")
@@ -1,10 +1,5 @@
 from typing import Tuple, List, Set
 
-# ### Uses the day9-test.txt input to replay an example from the explanation
-# with open(f'{__file__.split(".")[0]}-test.txt') as f:
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    moves = [l.strip("\n") for l in f.readlines()]
-
 # Mathematical meaning of move directions
 move_distances = {
     "U": (0, -1),
@@ -74,5 +69,23 @@ def calculate_tail_positions(rope_length: int, move_list: List[str]) -> Set[Tupl
     return visited_fields
 
 
-print(f"Part 1: Rope Tail for length 2 visited {len(calculate_tail_positions(2, moves))} field(s)!")
-print(f"Part 2: Rope Tail for length 10 visited {len(calculate_tail_positions(10, moves))} field(s)!")
+def parse(text: str) -> List[str]:
+    return [l for l in text.split("\n") if l]
+
+
+def part1(moves: List[str]) -> int:
+    return len(calculate_tail_positions(2, moves))
+
+
+def part2(moves: List[str]) -> int:
+    return len(calculate_tail_positions(10, moves))
+
+
+if __name__ == "__main__":
+    # ### Uses the day9-test.txt input to replay an example from the explanation
+    # with open(f'{__file__.split(".")[0]}-test.txt') as f:
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        moves = parse(f.read())
+
+    print(f"Part 1: Rope Tail for length 2 visited {part1(moves)} field(s)!")
+    print(f"Part 2: Rope Tail for length 10 visited {part2(moves)} field(s)!")
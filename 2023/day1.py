@@ -1,5 +1,6 @@
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    input_lines = [l.strip() for l in f.readlines()]
+def parse(text: str) -> list[str]:
+    return [l.strip() for l in text.splitlines()]
+
 
 def p1_digits_from_line(line_text: str) -> int:
     # Simple number finder for part 1
@@ -30,8 +31,17 @@ def p2_digits_from_line(line_text: str) -> int:
     return min_index_value * 10 + max_index_value
 
 
-part1_sum = sum(map(p1_digits_from_line, input_lines))
-print(f"Challenge 1: {part1_sum}")
+def part1(input_lines: list[str]) -> int:
+    return sum(map(p1_digits_from_line, input_lines))
+
+
+def part2(input_lines: list[str]) -> int:
+    return sum(map(p2_digits_from_line, input_lines))
+
+
+if __name__ == '__main__':
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_lines = parse(f.read())
 
-part2_sum = sum(map(p2_digits_from_line, input_lines))
-print(f"Challenge 2: {part2_sum}")
+    print(f"Challenge 1: {part1(input_lines)}")
+    print(f"Challenge 2: {part2(input_lines)}")
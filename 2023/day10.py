@@ -1,6 +1,7 @@
-import itertools
 from collections.abc import Generator
-from typing import Literal
+from typing import Literal, NamedTuple
+
+import gridpath
 
 Direction = Literal["N", "S", "E", "W"]
 direction_map: dict[Direction, tuple[int, int]] = {
@@ -9,6 +10,7 @@ direction_map: dict[Direction, tuple[int, int]] = {
     "E": (0, 1),
     "W": (0, -1)
 }
+direction_ids: dict[Direction, int] = {"N": gridpath.N, "E": gridpath.E, "S": gridpath.S, "W": gridpath.W}
 pipes: dict[str, tuple[Direction, Direction | None]] = {
     # Directions are alphabetically ordered, so that searching for the replacement of "S",
     # based on the locations it is pointing to, becomes easier.
@@ -21,25 +23,6 @@ pipes: dict[str, tuple[Direction, Direction | None]] = {
 }
 
 
-def redirect(pipe: str, enter_direction: Direction) -> Direction | None:
-    """
-    Calculate the new direction after visiting `pipe` from `enter_direction`.
-    If `pipe` cannot be entered from `enter_direction` or `pipe` is not walkable at all or unknown,
-    `None` is returned to indicate a dead end.
-
-    :param pipe: Letter representing the pipe on the field to be entered.
-    :param enter_direction: `Direction` string which represents the direction from which `pipe` is entered.
-    :return: New `Direction` in which `pipe` will be exited through. `None`, if `pipe` cannot be entered from
-        `enter_direction` or is not a known pipe tile at all (= dead end).
-    """
-    # Enter direction is inverted, as entering in southern direction uses the pipes northern entrance.
-    invert_map = {"S": "N", "N": "S", "E": "W", "W": "E"}
-    enter_direction = invert_map[enter_direction]
-    if enter_direction not in pipes.get(pipe, tuple()):
-        return None
-    return next(direction for direction in pipes[pipe] if direction != enter_direction)
-
-
 def pipe_steps(pipe_map: list[str],
                start_pos: tuple[int, int],
                direction: Direction) -> Generator[tuple[int, int]]:
@@ -47,55 +30,113 @@ def pipe_steps(pipe_map: list[str],
     Generates the locations that are visited by following the pipes starting at `start_pos`.
     Generator will terminate on dead-ends.
     Will NOT return the starting position as first position, but start with the first new tile.
+    The pipes are followed by `gridpath.PipeRule`, which is shared with the other grid puzzles.
 
     :param pipe_map: `list` of `str` representing the individual pipes.
     :param start_pos: Position to start at in format `(row, column)`, effectively index in `pipe_map`
     :param direction: String representing the direction in which to move initially.
     :return: `tuple[int, int]` representing the position like `start_pos`.
     """
+    rule = gridpath.PipeRule(pipe_map)
+    for state in gridpath.walk(rule, rule.encode(*start_pos, direction_ids[direction])):
+        row, col, _ = rule.decode(state)
+        yield row, col
+
+
+class Loop(NamedTuple):
+    # Byte per tile, `1` for tiles of the loop, at index `row * width + col`
+    mask: bytearray
+    length: int
+    # Twice the signed area enclosed by the loop, through the centers of its tiles (shoelace formula)
+    double_area: int
+
+
+def trace_loop(pipe_map: list[str], start_pos: tuple[int, int], direction: Direction) -> Loop:
+    """
+    Follows the pipes from `start_pos` back to it, recording each tile in the mask along the way.
+    Steps directly on the flat tile index with the turn table of `gridpath.PipeRule`, without any per-step tuples.
+
+    :raises ValueError: If the pipes lead into a dead end or off the grid, instead of back to `start_pos`.
+    """
+    height, width = len(pipe_map), len(pipe_map[0])
+    tiles = "".join(pipe_map)
+    turns = gridpath.PipeRule(pipe_map).turns
+    offsets = [delta_row * width + delta_col for delta_row, delta_col in gridpath.DELTAS]
+    mask = bytearray(len(tiles))
+    row, col = start_pos
+    start = tile = row * width + col
+    direction_id = direction_ids[direction]
+    length = double_area = 0
     while True:
-        start_pos = tuple(x + y for x, y in zip(start_pos, direction_map[direction]))
-        row, col = start_pos
-        if not (0 <= row < len(pipe_map) and 0 <= col <= len(pipe_map[row])):
-            # If any of the two indices run out-of-bounds on the pipe-map, no more steps are possible
-            break
-        pipe_char = pipe_map[row][col]
-        direction = redirect(pipe_char, direction)
-        if direction is None:
-            break
-        yield start_pos
-
-
-def count_tile_in_loop(pipe_map: list[str], loop_tiles: list[tuple[int, int]]) -> int:
+        delta_row, delta_col = gridpath.DELTAS[direction_id]
+        # The flat index would wrap around to the next row or leave the mask, so the bounds are checked on the side
+        if not (0 <= row + delta_row < height and 0 <= col + delta_col < width):
+            raise ValueError(f"Pipes from {start_pos} lead off the grid at {(row, col)}")
+        # Shoelace term of the step from (row, col) to (row + delta_row, col + delta_col)
+        double_area += row * delta_col - delta_row * col
+        row, col, tile = row + delta_row, col + delta_col, tile + offsets[direction_id]
+        mask[tile] = 1
+        length += 1
+        if tile == start:
+            return Loop(mask, length, double_area)
+        direction_id = turns[tiles[tile]][direction_id] if tiles[tile] in turns else -1
+        if direction_id < 0:
+            raise ValueError(f"Pipes from {start_pos} run into a dead end at {(row, col)}")
+
+
+def count_tile_in_loop(pipe_map: list[str], loop_mask: bytearray) -> int:
+    """
+    Scans each row from left to right, toggling between outside and inside of the loop when crossing it.
+    Only the loop tiles are looked at (`bytearray.find()` skips the others), the tiles between them are counted at once.
+    """
+    width = len(pipe_map[0])
     tiles_in_loop = 0
     for row, line in enumerate(pipe_map):
         in_loop = False
         # Remember the last corner pipe
         last_corner = ""
-        for col, char in enumerate(line):
-            if (row, col) in loop_tiles:
-                if char == "-":
-                    pass
-                elif char in ["-", "|"]:
-                    in_loop = not in_loop
-                # If corners are encountered, it is important to see, if the ending-corner's direction (up/down) is
-                # the same as the starting-corner, to determine whether we're in the loop or out of the loop.
-                # For reference, compare the first example of part 2 line 2, 3 and 6.
-                # If the direction is the same, we stay in the same `in_loop` state as before, otherwise it's changed.
-                elif char in ["L", "F"]:
-                    last_corner = char
-                elif char == "J":
-                    in_loop = in_loop if last_corner == "L" else not in_loop
-                elif char == "7":
-                    in_loop = in_loop if last_corner == "F" else not in_loop
-            elif in_loop:
-                tiles_in_loop += 1
+        row_start, row_end = row * width, (row + 1) * width
+        previous = row_start - 1
+        tile = loop_mask.find(1, row_start, row_end)
+        while tile >= 0:
+            if in_loop:
+                tiles_in_loop += tile - previous - 1
+            char = line[tile - row_start]
+            if char == "|":
+                in_loop = not in_loop
+            # If corners are encountered, it is important to see, if the ending-corner's direction (up/down) is
+            # the same as the starting-corner, to determine whether we're in the loop or out of the loop.
+            # For reference, compare the first example of part 2 line 2, 3 and 6.
+            # If the direction is the same, we stay in the same `in_loop` state as before, otherwise it's changed.
+            elif char in ["L", "F"]:
+                last_corner = char
+            elif char == "J":
+                in_loop = in_loop if last_corner == "L" else not in_loop
+            elif char == "7":
+                in_loop = in_loop if last_corner == "F" else not in_loop
+            previous = tile
+            tile = loop_mask.find(1, tile + 1, row_end)
     return tiles_in_loop
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+def count_tile_in_loop_by_area(loop: Loop) -> int:
+    """
+    Pick's theorem gives the amount of tiles fully inside the loop: `inner = area - border / 2 + 1`,
+    where `area` is the shoelace area through the centers of the loop tiles and `border` is the loop length.
+    """
+    return abs(loop.double_area) // 2 - loop.length // 2 + 1
+
+
+class PipeMap(NamedTuple):
+    lines: list[str]
+    start_pos: tuple[int, int]
+    # The two directions, in which pipes are connected to the "S" tile
+    directions: list[Direction]
+    loop: Loop
+
+
+def parse(text: str) -> PipeMap:
+    input_lines = [line.strip() for line in text.splitlines()]
 
     # Search through each line for S and return index of the line itself and index of "S" in that line.
     # As per puzzle description, there is EXACTLY ONE "S" tile.
@@ -105,24 +146,34 @@ def main():
     # If the direction hasn't a next step, it's a dead-end. Exactly two directions are valid, as per description.
     directions: list[Direction] = list(filter(lambda d: next(pipe_steps(input_lines, start_pos, d), None),
                                               direction_map.keys()))
+    # Both parts follow the same loop, so it is traced once
+    return PipeMap(input_lines, start_pos, directions, trace_loop(input_lines, start_pos, directions[0]))
 
-    # Part 1
-    walkers = zip(*(pipe_steps(input_lines, start_pos, d) for d in directions))
-    walk_until_meet = itertools.takewhile(lambda positions: len(set(positions)) > 1, walkers)
-    # As the last step towards the identical location is not generated by takewhile(),
-    # as it already violates the condition, we need to add one step.
-    steps_until_meet = sum(1 for step in walk_until_meet) + 1
-    print(f"Challenge 1: {steps_until_meet}")
 
-    # Part 2
+def part1(pipe_map: PipeMap) -> int:
+    # The tile furthest away along the loop is half the loop length away, no matter which direction is taken.
+    return pipe_map.loop.length // 2
+
+
+def part2(pipe_map: PipeMap) -> int:
     # noinspection PyTypeChecker
-    s_replacement = {v: k for k, v in pipes.items()}.get(tuple(sorted(directions)))
-    input_lines[start_pos[0]] = input_lines[start_pos[0]].replace("S", s_replacement)
-    steps_along_loop = itertools.takewhile(lambda pos: pos != start_pos,
-                                           pipe_steps(input_lines, start_pos, directions[0]))
-    loop_tiles = [start_pos] + list(steps_along_loop)
-    amount_tiles_in_loop = count_tile_in_loop(input_lines, loop_tiles)
-    print(f"Challenge 2: {amount_tiles_in_loop}")
+    s_replacement = {v: k for k, v in pipes.items()}.get(tuple(sorted(pipe_map.directions)))
+    # Replace "S" in a copy of the lines, so the parsed map stays as it is
+    input_lines = list(pipe_map.lines)
+    row = pipe_map.start_pos[0]
+    input_lines[row] = input_lines[row].replace("S", s_replacement)
+    amount_tiles_in_loop = count_tile_in_loop(input_lines, pipe_map.loop.mask)
+    if count_tile_in_loop_by_area(pipe_map.loop) != amount_tiles_in_loop:
+        raise RuntimeError("Tiles found by scanning the rows don't match the tiles found by Pick's theorem")
+    return amount_tiles_in_loop
+
+
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        pipe_map = parse(f.read())
+
+    print(f"Challenge 1: {part1(pipe_map)}")
+    print(f"Challenge 2: {part2(pipe_map)}")
 
 
 if __name__ == '__main__':
@@ -1,44 +1,81 @@
 import itertools
+from collections.abc import Iterable
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+Universe = tuple[list[tuple[int, int]], list[int], list[int]]
+
+
+def parse(text: str) -> Universe:
+    """ :return: Coordinates of the galaxies, the empty rows and the empty columns. """
+    input_lines = [line.strip() for line in text.splitlines()]
 
     empty_rows = [i for i, line in enumerate(input_lines) if set(line) == {"."}]
     empty_cols = [i for i, col in enumerate(zip(*input_lines)) if set(col) == {"."}]
-    coords = itertools.product(range(len(input_lines)), range(len(input_lines[0])))
-    galaxies = {(row, col) for row, col in coords if input_lines[row][col] == "#"}
-    galaxy_pairs = {(g1, g2) for g1, g2 in itertools.combinations(galaxies, 2)}
+    galaxies = [(row, col) for row, line in enumerate(input_lines) for col, char in enumerate(line) if char == "#"]
+    return galaxies, empty_rows, empty_cols
+
+
+def part1(universe: Universe) -> int:
+    return galaxy_distance_sums(*universe, expansion_factors=(2,))[0]
+
+
+def part2(universe: Universe) -> int:
+    return galaxy_distance_sums(*universe, expansion_factors=(10 ** 6,))[0]
+
 
-    # Part 1
-    distances = [galaxy_distance(g1, g2, empty_rows, empty_cols, 1) for g1, g2 in galaxy_pairs]
-    print(f"Challenge 1: {sum(distances)}")
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        universe = parse(f.read())
+
+    # Both parts come from the same coefficients, only the expansion factor differs
+    challenge1, challenge2 = galaxy_distance_sums(*universe, expansion_factors=(2, 10 ** 6))
+    print(f"Challenge 1: {challenge1}")
+    print(f"Challenge 2: {challenge2}")
+
+
+def axis_distance_coefficients(coordinates: list[int], empty_lines: list[int], size: int) -> tuple[int, int]:
+    """
+    Sums the distances of all pairs along one axis, without expansion and only counting the crossed empty lines.
+    With the coordinates sorted, the `i`-th of `n` coordinates is subtracted by the `n - 1 - i` bigger ones and
+    subtracts the `i` smaller ones, so each pair is covered by one factor per coordinate: `2 * i - n + 1`.
+    The same works for the amount of empty lines before each coordinate, as it grows with the coordinate.
+
+    :param size: Any number bigger than all coordinates.
+    :return: Sum of the distances and sum of the crossed empty lines, over all pairs.
+    """
+    # `empty_before[x]` is the amount of empty lines with an index smaller than `x`
+    empty_before = [0] * (size + 1)
+    # Empty lines after the last coordinate are never crossed
+    for line in empty_lines:
+        if line < size:
+            empty_before[line + 1] = 1
+    empty_before = list(itertools.accumulate(empty_before))
 
-    # Part 2
-    distances = [galaxy_distance(g1, g2, empty_rows, empty_cols, 10 ** 6) for g1, g2 in galaxy_pairs]
-    print(f"Challenge 1: {sum(distances)}")
+    n = len(coordinates)
+    distances = empty_crossings = 0
+    for i, coordinate in enumerate(sorted(coordinates)):
+        distances += coordinate * (2 * i - n + 1)
+        empty_crossings += empty_before[coordinate] * (2 * i - n + 1)
+    return distances, empty_crossings
 
 
-def galaxy_distance(g1: tuple[int, int],
-                    g2: tuple[int, int],
-                    empty_rows: list[int],
-                    empty_cols: list[int],
-                    expansion_factor: int) -> int:
+def galaxy_distance_sums(galaxies: list[tuple[int, int]],
+                         empty_rows: list[int],
+                         empty_cols: list[int],
+                         expansion_factors: Iterable[int]) -> list[int]:
     """
-    Colculates the distance between `g1` and `g2`, considering each crossed row or column present in `empty_rows` or
-    `empty_cols` respectively, as `expansion_factor`-times as big. The puzzle asks for twice as big (factor = 2) and
-    one million times as big (factor = 1.000.000).
+    Sums the distances of all galaxy pairs in O(n log n). Each crossed empty row or column counts `expansion_factor`
+    times, so the sum is `distances + empty_crossings * (expansion_factor - 1)` and any amount of factors only needs
+    the coefficients of both axes once.
 
-    :return: Calculates distance between `g1` and `g2`
+    :return: Sum of all distances, per expansion factor.
     """
-    # noinspection PyTupleAssignmentBalance
-    g1_row, g1_col, g2_row, g2_col = *g1, *g2
-    rows = set(range(min(g1_row, g2_row), max(g1_row, g2_row)))
-    cols = set(range(min(g1_col, g2_col), max(g1_col, g2_col)))
-    row_distance = len(rows) + len(rows.intersection(empty_rows)) * (expansion_factor - 1)
-    col_distance = len(cols) + len(cols.intersection(empty_cols)) * (expansion_factor - 1)
-    return row_distance + col_distance
+    height = max((row for row, _ in galaxies), default=0) + 1
+    width = max((col for _, col in galaxies), default=0) + 1
+    row_distances, row_crossings = axis_distance_coefficients([row for row, _ in galaxies], empty_rows, height)
+    col_distances, col_crossings = axis_distance_coefficients([col for _, col in galaxies], empty_cols, width)
+    distances, empty_crossings = row_distances + col_distances, row_crossings + col_crossings
+    return [distances + empty_crossings * (expansion_factor - 1) for expansion_factor in expansion_factors]
 
 
 if __name__ == '__main__':
@@ -5,27 +5,144 @@ including brute-force or trial-and-error-recursion failed).
 """
 
 import itertools
+import math
 import re
 from collections.abc import Iterable
-from functools import lru_cache
 from typing import Generator
 
+import memo
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+Record = tuple[str, tuple[int, ...]]
+# Index of each character in the transition tables. Lines are padded with `PAD`, which keeps all progressions.
+char_codes = {".": 0, "#": 1, "?": 2}
+PAD = 3
+
+
+def parse(text: str) -> list[Record]:
+    input_lines = [line.strip() for line in text.splitlines()]
+    return [(line, tuple(int(i) for i in pattern.split(","))) for line, pattern in
+            (line.split() for line in input_lines)]
+
+
+def part1(records: list[Record]) -> int:
+    # Brute-forcing all variants with `possible_patterns()` and `pattern_to_regex()` is way slower, but still works
+    # to cross-check the automaton:
+    # sum(count_valid_patterns(possible_patterns(line), pattern_to_regex(pattern)) for line, pattern in records)
+    return sum(count_arrangements(records))
+
+
+def part2(records: list[Record]) -> int:
+    return sum(count_arrangements(records, unfold=5))
+
 
 def main():
     with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
-    lines = [line.split() for line in input_lines]
+        records = parse(f.read())
+
+    print(f"Challenge 1: {part1(records)}")
+    print(f"Challenge 2: {part2(records)}")
+
+
+def count_arrangements(records: list[Record], unfold: int = 1, batch_size: int = 4096) -> list[int]:
+    """
+    Counts the arrangements of each record with the automaton of `count_automaton()`, after unfolding it.
+    If NumPy is available, the records are processed in batches, stepping all automatons of a batch at once.
+
+    :param records: Tuples of condition record and group sizes.
+    :param unfold: How many copies of each record are joined, separated by "?" (group sizes are just repeated).
+    :param batch_size: Amount of records stepped together.
+    :return: Amount of arrangements per record, in the same order.
+    """
+    records = [("?".join([line] * unfold), patterns * unfold) for line, patterns in records]
+    if np is None:
+        return [count_automaton(line, patterns) for line, patterns in records]
+
+    counts = [0] * len(records)
+    # Records, whose counts could overflow `int64`, are batched on their own, so the others keep the fast arrays
+    overflowing = [may_overflow(record) for record in records]
+    for dtype in (np.int64, object):
+        group = [i for i in range(len(records)) if overflowing[i] == (dtype is object)]
+        # Records of similar length are batched together, so there is less padding
+        order = sorted(group, key=lambda i: len(records[i][0]))
+        for batch_start in range(0, len(order), batch_size):
+            batch = order[batch_start:batch_start + batch_size]
+            for i, count in zip(batch, count_automaton_batch([records[i] for i in batch], dtype)):
+                counts[i] = count
+    return counts
+
+
+def may_overflow(record: Record) -> bool:
+    """
+    Every progression of the automaton counts distinct ways to fill the "?" of a prefix of the line. Each of these
+    turns at most `sum(patterns)` of its "?" into "#", so no count exceeds the largest `comb(n, j)` with `n` "?" and
+    `j <= sum(patterns)`. Bounding by `2 ** n` instead would push most records of part 2 to Python `int`s.
+
+    :return: Whether the counts of `record` might not fit into `int64`.
+    """
+    line, patterns = record
+    unknowns = line.count("?")
+    # `comb(n, j)` grows up to `j = n // 2`
+    return math.comb(unknowns, min(sum(patterns), unknowns // 2)) >= 2 ** 63
+
+
+def compile_automaton(patterns: tuple[int, ...]) -> tuple[list[list[bool]], list[list[bool]]]:
+    """
+    Compiles the automaton of `count_automaton()` into transition tables.
+    For each character code and progress, `stay` tells whether the progress is kept and `advance` whether the progress
+    moves on to the next state, when reading that character.
+
+    :return: `stay` and `advance` tables, indexed by `[char_code][progress]`.
+    """
+    states = ".".join("#" * pattern for pattern in patterns) + "."
+    last = len(states) - 1
+    stay = [[False] * len(states) for _ in range(4)]
+    advance = [[False] * len(states) for _ in range(4)]
+    for progress, state in enumerate(states):
+        # A progression can wait on the current state, as long as the last state was a "." (or everything is done)
+        can_wait = states[progress - 1] == "." or progress == last
+        stay[char_codes["?"]][progress] = stay[char_codes["."]][progress] = can_wait
+        advance[char_codes["?"]][progress] = progress < last
+        advance[char_codes["."]][progress] = state == "." and progress < last
+        advance[char_codes["#"]][progress] = state == "#" and progress < last
+        stay[PAD][progress] = True
+    return stay, advance
+
+
+def count_automaton_batch(records: list[Record], dtype: type) -> list[int]:
+    """
+    Steps the automatons of all `records` in lockstep, one character per step for all of them.
+
+    :param dtype: Type of the progression array. `int64` unless `may_overflow()` holds for a record, in which case
+        Python `int`s are used (NumPy `object` array), which are slower, but can't overflow.
+    :return: Amount of arrangements per record, in the same order.
+    """
+    lengths = [len(".".join("#" * pattern for pattern in patterns) + ".") for _, patterns in records]
+    max_states = max(lengths)
+    max_chars = max(len(line) for line, _ in records)
 
-    # Part 1
-    possibilities_per_line = ((possible_patterns(line), pattern_to_regex(pattern)) for line, pattern in lines)
-    options_per_line = (count_valid_patterns(s, regex) for s, regex in possibilities_per_line)
-    # options_per_line = (guess_next_char(s, pattern) for s, pattern in lines)
-    print(f"Challenge 1: {sum((options for options in options_per_line))}")
+    stay = np.zeros((len(records), 4, max_states), dtype=bool)
+    advance = np.zeros((len(records), 4, max_states), dtype=bool)
+    codes = np.full((len(records), max_chars), PAD, dtype=np.int8)
+    for i, (line, patterns) in enumerate(records):
+        line_stay, line_advance = compile_automaton(patterns)
+        stay[i, :, :lengths[i]] = line_stay
+        advance[i, :, :lengths[i]] = line_advance
+        codes[i, :len(line)] = [char_codes[char] for char in line]
 
-    # Part 2
-    lines = [("?".join([line] * 5), ",".join([pattern] * 5)) for line, pattern in lines]
-    lines = [(line, tuple(int(i) for i in patterns.split(","))) for line, patterns in lines]
-    print(f"Challenge 2: {sum(count_automaton(line, patterns) for line, patterns in lines)}")
+    rows = np.arange(len(records))
+    progressions = np.zeros((len(records), max_states), dtype=dtype)
+    progressions[:, 0] = 1
+    for step in range(max_chars):
+        step_codes = codes[:, step]
+        advanced = progressions * advance[rows, step_codes]
+        progressions = progressions * stay[rows, step_codes]
+        progressions[:, 1:] += advanced[:, :-1]
+    return [int(count) for count in progressions[rows, np.array(lengths) - 1]]
 
 
 def count_automaton(line: str, patterns: tuple[int, ...]) -> int:
@@ -112,7 +229,7 @@ def permutations_for_line(line: str, patterns: tuple[int, ...]) -> int:
     return 1
 
 
-@lru_cache(maxsize=None)
+@memo.memoize(maxsize=1 << 16)
 def arrangements(amount_q: int, patterns: tuple[int, ...]) -> int:
     if len(patterns) - 1 + sum(patterns) > amount_q:
         return 0
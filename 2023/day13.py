@@ -1,72 +1,78 @@
 import itertools
-from functools import lru_cache
-from typing import Callable
 
+# Rows and columns are read as binary numbers, with "#" as 1
+BITS = str.maketrans("#.", "10")
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+# Rows and columns of one block, each encoded as bitmask
+Block = tuple[list[int], list[int]]
+
+
+def parse(text: str) -> list[Block]:
+    input_lines = [line.strip() for line in text.splitlines()]
     line_iter = iter(input_lines)
     blocks = []
     while block := list(itertools.takewhile(lambda row: len(row), line_iter)):
-        blocks.append(block)
-
-    # Part 1
-    block_scores = [get_block_score(block, find_mirror) for block in blocks]
-    print(f"Challenge 1: {sum(block_scores)}")
-
-    # Part 2
-    block_scores = [get_block_score(block, find_mirror_off_by_one) for block in blocks]
-    print(f"Challenge 2: {sum(block_scores)}")
-
-
-def get_block_score(block: list[str], mirror_finder: Callable[[list[str]], int | None]) -> int:
-    # Try vertical mirror, then transpose the block and try again (looking for horizontal mirrors).
-    vertical = mirror_finder(block)
-    horizontal = None
-    if vertical is None:
-        horizontal = mirror_finder(["".join(rows) for rows in zip(*block)])
-    return vertical if vertical is not None else horizontal * 100
-
-
-def find_mirror(block: list[str]) -> int | None:
-    """ Tests `block` for vertical mirrors and returns the index of the mirror (the amount of columns left to it). """
-    # For this puzzle, it's safe to assume all lines are of equal length
-    row_length = len(block[0])
-    for i in range(1, row_length):
-        # Find the shorter side
-        min_side_length = min(i, row_length - i)
-        if all(mirror_diffs(row[i - min_side_length:i + min_side_length]) == 0 for row in block):
-            return i
-    # No mirrors found
-    return None
+        blocks.append(encode_block(block))
+    return blocks
+
+
+def part1(blocks: list[Block]) -> int:
+    return sum(block_score(block, smudges=0) for block in blocks)
+
+
+def part2(blocks: list[Block]) -> int:
+    return sum(block_score(block, smudges=1) for block in blocks)
 
 
-def find_mirror_off_by_one(block: list[str]) -> int | None:
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        blocks = parse(f.read())
+
+    print(f"Challenge 1: {part1(blocks)}")
+    print(f"Challenge 2: {part2(blocks)}")
+
+
+def encode_block(block: list[str]) -> Block:
+    """ Encodes each row and column of `block` as bitmask once, so both parts compare whole lines at once. """
+    rows = [int(line.translate(BITS), 2) for line in block]
+    cols = [int("".join(col).translate(BITS), 2) for col in zip(*block)]
+    return rows, cols
+
+
+def reflection_axis(lines: list[int], smudges: int) -> int | None:
     """
-    Works like `find_mirror()` but finds a mirror location where there's exactly one character,
-    which is not perfectly mirrored.
+    Tests each axis between two lines for a reflection, comparing the lines as bitmasks.
+    The popcount of two XORed lines is the amount of differing tiles, so the smudged reflection is the axis where
+    all mirrored line pairs differ by exactly 1 tile in total.
+
+    :param smudges: Amount of tiles, which differ from their mirrored tile.
+    :return: Axis (the amount of lines before it) of the reflection, `None` if there is none.
     """
-    row_length = len(block[0])
-    for i in range(1, row_length):
-        # Find the shorter side
-        min_side_length = min(i, row_length - i)
-        if sum(mirror_diffs(row[i - min_side_length:i + min_side_length]) for row in block) == 1:
-            return i
-    # No mirrors found
+    for axis in range(1, len(lines)):
+        differences = 0
+        for offset in range(min(axis, len(lines) - axis)):
+            differences += (lines[axis - 1 - offset] ^ lines[axis + offset]).bit_count()
+            if differences > smudges:
+                break
+        if differences == smudges:
+            return axis
     return None
 
 
-@lru_cache
-def mirror_diffs(line: str) -> int:
+def block_score(block: Block, smudges: int) -> int:
     """
-    Checks whether `line` is a palindrome and return the amount of character pairs, which do NOT match.
+    Looks for vertical mirrors (between columns) first, then for horizontal ones (between rows, counting 100 times).
 
-    :param line: Iterable with EVEN length (odd length will never return `0`).
-    :return: Amount of differing character pairs
+    :param smudges: See `reflection_axis()`, `0` for part 1 and `1` for part 2.
     """
-    line_chars_pairwise = zip(line[:len(line) // 2], reversed(line[len(line) // 2:]))
-    return sum(1 for c1, c2 in line_chars_pairwise if c1 != c2)
+    rows, cols = block
+    vertical = reflection_axis(cols, smudges)
+    if vertical is not None:
+        return vertical
+    horizontal = reflection_axis(rows, smudges)
+    if horizontal is None:
+        raise ValueError(f"No reflection with {smudges} smudge(s) found in block with first row {rows[0]:b}")
+    return horizontal * 100
 
 
 if __name__ == '__main__':
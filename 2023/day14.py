@@ -1,80 +1,105 @@
-from functools import cache
+SPIN_CYCLES = 1000000000
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
-
-    # Part 1
-    shifted_rocks = push_north(tuple(input_lines))
-    weight = calculate_weight(shifted_rocks)
-    print(f"Challenge 1: {weight}")
-
-    # Part 2
-    cycled_rocks = tuple(input_lines)
-    for i in range(1000000000):
-        cycled_rocks = do_cycle(cycled_rocks)
-        if i % 10 ** 7 == 1:
-            done_percentage = i / 1000000000
-            print(f"Done with {done_percentage * 100:.0f}%")
-    weight = calculate_weight(cycled_rocks)
-    print(f"Challenge 2: {weight}")
-
-
-@cache
-def do_cycle(lines: tuple[str]) -> tuple[str]:
-    lines = push_north(lines)
-    lines = push_west(lines)
-    lines = push_south(lines)
-    lines = push_east(lines)
-    return lines
+def parse(text: str) -> list[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
 
 
-def calculate_weight(lines: tuple[str]) -> int:
-    rocks_per_line = [len(line.replace("#", "").replace(".", "")) for line in lines]
-    row_weights = [weight * rocks for weight, rocks in zip(range(len(lines), 0, -1), rocks_per_line)]
-    return sum(row_weights)
+def part1(input_lines: list[str]) -> int:
+    platform = Platform(input_lines)
+    platform.tilt(-platform.stride)
+    return platform.weight()
 
 
-@cache
-def push_north(lines: tuple[str]) -> tuple:
-    # Transpose the lines, so colunns become rows
-    lines = zip(*lines)
-    sorted_lines = (sort_line(line) for line in lines)
-    # Re-Transpose into original orientation
-    return tuple("".join(column) for column in zip(*sorted_lines))
+def part2(input_lines: list[str]) -> int:
+    _, _, weight = Platform(input_lines).spin(SPIN_CYCLES)
+    return weight
 
 
-@cache
-def push_south(lines: tuple[str]) -> tuple:
-    # Transpose the lines, so colunns become rows
-    lines = zip(*lines)
-    sorted_lines = (sort_line(line, rocks_first=False) for line in lines)
-    # Re-Transpose into original orientation
-    return tuple("".join(column) for column in zip(*sorted_lines))
-
-
-@cache
-def push_west(lines: tuple[str]) -> tuple:
-    sorted_lines = (sort_line(line) for line in lines)
-    # Re-Transpose into original orientation
-    return tuple(sorted_lines)
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_lines = parse(f.read())
 
+    print(f"Challenge 1: {part1(input_lines)}")
 
-@cache
-def push_east(lines: tuple[str]) -> tuple:
-    sorted_lines = (sort_line(line, rocks_first=False) for line in lines)
-    # Re-Transpose into original orientation
-    return tuple(sorted_lines)
+    cycle_start, period, weight = Platform(input_lines).spin(SPIN_CYCLES)
+    print(f"Spin cycles repeat after {cycle_start} cycles, every {period} cycles")
+    print(f"Challenge 2: {weight}")
 
 
-@cache
-def sort_line(line: str | list[str] | tuple[str], rocks_first: bool = True) -> str:
-    if isinstance(line, (list, tuple)):
-        line = "".join(line)
-    # Sorting the string in reverse-mode puts "O"-characters before "."-characters
-    sorted_segments = ("".join(sorted(segment, reverse=rocks_first)) for segment in line.split("#"))
-    return "#".join(sorted_segments)
+class Platform:
+    """
+    Platform with all round rocks stored in one bitmask, where bit `row * stride + col` is set for a rock.
+    Each row has an extra (always blocked) bit at its end, so rocks can't wrap into the next row when moved sideways.
+    Tilting moves all rocks with a free field next to them one field at once, by shifting the bitmask by `stride`
+    (north and south) or by 1 (west and east), until no rock can move any more. This works the same for rows and
+    columns, so no direction requires rebuilding the bitmask in another orientation.
+    """
+    height: int
+    width: int
+    stride: int
+    rocks: int
+    # Fields without a cube rock, excluding the extra bit of each row
+    open_fields: int
+
+    def __init__(self, lines: list[str] | tuple[str, ...]):
+        self.height, self.width = len(lines), len(lines[0])
+        self.stride = self.width + 1
+        self.rocks = self.fields(lines, "O")
+        row_mask = sum(((1 << self.width) - 1) << (row * self.stride) for row in range(self.height))
+        self.open_fields = row_mask & ~self.fields(lines, "#")
+
+    def fields(self, lines: list[str] | tuple[str, ...], char: str) -> int:
+        """ :return: Bitmask with the bits of all fields containing `char` set. """
+        return sum(1 << (row * self.stride + col) for row, line in enumerate(lines)
+                   for col, field in enumerate(line) if field == char)
+
+    def tilt(self, shift: int):
+        """
+        Moves all rocks as far as possible, by `shift` bits per step: `-stride` is north, `stride` south,
+        `-1` west and `1` east. A rock moves, if the field it moves to is open and not taken by another rock.
+        The number of steps is the longest distance a rock moves.
+        """
+        rocks = self.rocks
+        while True:
+            free = self.open_fields & ~rocks
+            movable = rocks & (free >> shift if shift > 0 else free << -shift)
+            if not movable:
+                break
+            rocks ^= movable
+            rocks |= movable << shift if shift > 0 else movable >> -shift
+        self.rocks = rocks
+
+    def do_cycle(self):
+        """ Tilts north, west, south and east. """
+        for shift in (-self.stride, -1, self.stride, 1):
+            self.tilt(shift)
+
+    def weight(self) -> int:
+        """ Each rock weighs the amount of rows from its row to the southern edge, including its own row. """
+        row_mask = (1 << self.width) - 1
+        return sum((self.height - row) * (self.rocks >> (row * self.stride) & row_mask).bit_count()
+                   for row in range(self.height))
+
+    def spin(self, cycles: int) -> tuple[int, int, int]:
+        """
+        Performs `cycles` spin cycles. Each state is recorded after a spin cycle, until a known state comes up again.
+        From there on, the states repeat, so the remaining cycles can be skipped with a modulo-calculation.
+
+        :return: Amount of cycles until the repetition starts, length of the repetition and the weight after `cycles`.
+        """
+        known_states: dict[int, int] = {self.rocks: 0}
+        states = [self.rocks]
+        for cycle in range(1, cycles + 1):
+            self.do_cycle()
+            if self.rocks in known_states:
+                cycle_start = known_states[self.rocks]
+                period = cycle - cycle_start
+                self.rocks = states[cycle_start + (cycles - cycle_start) % period]
+                return cycle_start, period, self.weight()
+            known_states[self.rocks] = cycle
+            states.append(self.rocks)
+        return cycles, 0, self.weight()
 
 
 if __name__ == '__main__':
@@ -1,16 +1,18 @@
 import itertools
-from functools import cache
 
+import memo
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = list(f.readline().strip().split(","))
 
-    # Part 1
+def parse(text: str) -> list[str]:
+    return list(text.split("\n")[0].strip().split(","))
+
+
+def part1(input_lines: list[str]) -> int:
     hash_per_line = [hash_line(line) for line in input_lines]
-    print(f"Challenge 1: {sum(hash_per_line)}")
+    return sum(hash_per_line)
+
 
-    # Part 2
+def part2(input_lines: list[str]) -> int:
     # Dicts are ordered by default since Python 3.7, so using collections.OrderedDict is not necessary
     boxes = [dict() for _ in range(256)]
     for line in input_lines:
@@ -24,14 +26,22 @@ def main():
             boxes[box][label] = int(length)
 
     powers = [i * focusing_power(box) for i, box in enumerate(boxes, start=1)]
-    print(f"Challenge 2: {sum(powers)}")
+    return sum(powers)
+
+
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_lines = parse(f.read())
+
+    print(f"Challenge 1: {part1(input_lines)}")
+    print(f"Challenge 2: {part2(input_lines)}")
 
 
 def focusing_power(box: dict[str, int]) -> int:
     return sum(i * length for i, length in enumerate(box.values(), start=1))
 
 
-@cache
+@memo.memoize(maxsize=4096)
 def hash_line(line: str) -> int:
     hash_val = 0
     for char in line:
@@ -39,7 +49,7 @@ def hash_line(line: str) -> int:
     return hash_val
 
 
-@cache
+@memo.memoize(maxsize=4096)
 def hash_char(char: str, init_value: int) -> int:
     return ((init_value + ord(char)) * 17) % 256
 
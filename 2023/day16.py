@@ -1,59 +1,293 @@
-from functools import cache
-from queue import Queue
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import Literal
 
 Direction = Literal["<", ">", "^", "v"]
 Beam = tuple[tuple[int, int], Direction]
 
+dir_to_delta: dict[Direction, tuple[int, int]] = {
+    "<": (0, -1),
+    ">": (0, 1),
+    "^": (-1, 0),
+    "v": (1, 0)
+}
+
 
 def main():
     with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
-
-    # Part 1
-    # Length of visited tiles minus 1 for the out-of-bounds starting tile
-    energy = len(simulate_beams(input_lines, ((0, -1), ">")))
-    print(f"Challenge 1: {energy}")
-
-    # Part 2
-    start_locations: list[Beam] = [
-        *[((-1, col), "v") for col in range(len(input_lines[0]))],
-        *[((row, len(input_lines[0])), "<") for row in range(len(input_lines))],
-        *[((len(input_lines), col), "^") for col in range(len(input_lines[0]))],
-        *[((row, -1), ">") for row in range(len(input_lines))],
+        beam_graph = parse(f.read())
+
+    print(f"Challenge 1: {part1(beam_graph)}")
+    print(f"Challenge 2: {part2(beam_graph)}")
+
+
+def edge_starts(grid: list[str]) -> list[Beam]:
+    """ :return: All starting locations, which are out-of-bounds by 1 and head into the grid. """
+    return [
+        *[((-1, col), "v") for col in range(len(grid[0]))],
+        *[((row, len(grid[0])), "<") for row in range(len(grid))],
+        *[((len(grid), col), "^") for col in range(len(grid[0]))],
+        *[((row, -1), ">") for row in range(len(grid))],
     ]
-    highest_energy = max(len(simulate_beams(input_lines, loc)) for loc in start_locations)
-    print(f"Challenge 2: {highest_energy}")
+
+
+def deflect(char: str, direction: Direction) -> list[Direction] | None:
+    """
+    :return: Directions the beam leaves the tile `char` in, when entering it in `direction`.
+        `None`, if the tile doesn't change the beam at all (empty tile or prism parallel to the beam).
+    """
+    if char == "|" and direction in ["<", ">"]:
+        return ["^", "v"]
+    if char == "-" and direction in ["^", "v"]:
+        return ["<", ">"]
+    if char == "/":
+        return [{"^": ">", ">": "^", "v": "<", "<": "v"}[direction]]
+    if char == "\\":
+        return [{"^": "<", ">": "v", "v": ">", "<": "^"}[direction]]
+    return None
+
+
+class BeamGraph:
+    """
+    Compressed version of the mirror grid. Instead of single beam steps, the nodes are the tiles that change a beam
+    (mirrors and orthogonal prisms), along with the direction the beam enters them in.
+    Each node stores the straight segments of tiles energized until the beam hits the next node(s).
+    Tiles are collected as bitsets, with bit `row * width + col`, so overlapping beams are only counted once.
+
+    Beams may run in loops, so the graph is split into strongly connected components first.
+    All nodes of a component energize the same tiles, so the tiles reachable from each component are collected once
+    (from the tiles of its successor components) and shared between all starts.
+    """
+    grid: list[str]
+    height: int
+    width: int
+    # Node IDs of each deflecting tile and entering direction
+    node_ids: dict[Beam, int]
+    # Tiles of the node itself and until the next nodes are reached, as `(first_tile, stride, length)` segments
+    node_segments: list[list[tuple[int, int, int]]]
+    node_successors: list[list[int]]
+    # Component of each node, along with the nodes and successor components of each component
+    node_component: list[int]
+    component_nodes: list[list[int]]
+    component_successors: list[set[int]]
+    # Reachable tiles of the components collected so far, as bitset
+    component_tiles: dict[int, int]
+
+    def __init__(self, grid: list[str]):
+        self.grid = grid
+        self.height, self.width = len(grid), len(grid[0])
+        # Bitset with the first tile of each row set. Shifted, its lower part gives any vertical segment.
+        column_bits = bytearray((self.height * self.width + 7) // 8)
+        for row in range(self.height):
+            column_bits[row * self.width // 8] |= 1 << (row * self.width % 8)
+        self.column_mask = int.from_bytes(column_bits, "little")
+
+        self.node_ids = {}
+        for row, line in enumerate(grid):
+            for col, char in enumerate(line):
+                for direction in dir_to_delta:
+                    if deflect(char, direction) is not None:
+                        self.node_ids[((row, col), direction)] = len(self.node_ids)
+
+        self.node_segments = [[] for _ in self.node_ids]
+        self.node_successors = [[] for _ in self.node_ids]
+        for ((row, col), direction), node in self.node_ids.items():
+            self.node_segments[node].append((row * self.width + col, 1, 1))
+            for next_direction in deflect(grid[row][col], direction):
+                segment, next_node = self.trace(((row, col), next_direction))
+                if segment is not None:
+                    self.node_segments[node].append(segment)
+                if next_node is not None:
+                    self.node_successors[node].append(next_node)
+
+        self.find_components()
+        self.component_tiles = {}
+
+    def trace(self, beam: Beam) -> tuple[tuple[int, int, int] | None, int | None]:
+        """
+        Follows `beam` in a straight line until it enters a deflecting tile or leaves the grid.
+
+        :return: Segment of the passed tiles, not including the tile of `beam` and the deflecting tile (`None` if there
+            are no tiles in between), along with the node of the deflecting tile (`None`, if the beam left the grid).
+        """
+        (row, col), direction = beam
+        delta_row, delta_col = dir_to_delta[direction]
+        length = 0
+        while True:
+            row, col = row + delta_row, col + delta_col
+            if not (0 <= row < self.height) or not (0 <= col < self.width):
+                node = None
+                break
+            node = self.node_ids.get(((row, col), direction))
+            if node is not None:
+                break
+            length += 1
+        if length == 0:
+            return None, node
+        # Segments always start at their lowest tile, which is the last passed one, when going left or up
+        stride = 1 if delta_row == 0 else self.width
+        last_row, last_col = row - delta_row, col - delta_col
+        first_row, first_col = last_row - delta_row * (length - 1), last_col - delta_col * (length - 1)
+        first_tile = min(first_row * self.width + first_col, last_row * self.width + last_col)
+        return (first_tile, stride, length), node
+
+    def segment_bits(self, segment: tuple[int, int, int]) -> int:
+        first_tile, stride, length = segment
+        if stride == 1:
+            return ((1 << length) - 1) << first_tile
+        return (self.column_mask >> ((self.height - length) * self.width)) << first_tile
+
+    def find_components(self):
+        """
+        Finds the strongly connected components with Tarjan's algorithm (iterative, as beams can be very long chains).
+        """
+        node_count = len(self.node_segments)
+        index = [-1] * node_count
+        low_link = [0] * node_count
+        on_stack = [False] * node_count
+        stack: list[int] = []
+        self.node_component = [-1] * node_count
+        self.component_nodes = []
+        next_index = 0
+
+        for root in range(node_count):
+            if index[root] >= 0:
+                continue
+            # Each entry is a node along with the position of the next successor to look at
+            work = [(root, 0)]
+            while work:
+                node, successor_idx = work.pop()
+                if successor_idx == 0:
+                    index[node] = low_link[node] = next_index
+                    next_index += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                successors = self.node_successors[node]
+                if successor_idx < len(successors):
+                    successor = successors[successor_idx]
+                    work.append((node, successor_idx + 1))
+                    if index[successor] < 0:
+                        work.append((successor, 0))
+                    elif on_stack[successor]:
+                        low_link[node] = min(low_link[node], index[successor])
+                    continue
+                # All successors are done, propagate the low link to the parent
+                if work:
+                    parent = work[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index[node]:
+                    component = len(self.component_nodes)
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        self.node_component[member] = component
+                        members.append(member)
+                        if member == node:
+                            break
+                    self.component_nodes.append(members)
+
+        self.component_successors = [
+            {self.node_component[successor] for node in members for successor in self.node_successors[node]} - {c}
+            for c, members in enumerate(self.component_nodes)
+        ]
+
+    def reachable_tiles(self, component: int) -> int:
+        """
+        Collects the tiles of `component` and all components it leads to.
+        Tarjan's algorithm numbers the components in reverse topological order, so the successors of a component always
+        have lower numbers. Collecting the missing components in ascending order thus only ever combines the tiles
+        of components, which are already collected, without any recursion.
+
+        :return: Bitset of the reachable tiles.
+        """
+        if component in self.component_tiles:
+            return self.component_tiles[component]
+        missing = set()
+        components = [component]
+        while components:
+            current = components.pop()
+            if current in missing or current in self.component_tiles:
+                continue
+            missing.add(current)
+            components.extend(self.component_successors[current])
+        for current in sorted(missing):
+            tiles = 0
+            for node in self.component_nodes[current]:
+                for segment in self.node_segments[node]:
+                    tiles |= self.segment_bits(segment)
+            for successor in self.component_successors[current]:
+                tiles |= self.component_tiles[successor]
+            self.component_tiles[current] = tiles
+        return self.component_tiles[component]
+
+    def energized(self, start_location: Beam) -> int:
+        """
+        :param start_location: Out-of-bounds by 1 and heading into the grid.
+        :return: Amount of energized tiles.
+        """
+        segment, node = self.trace(start_location)
+        tiles = self.segment_bits(segment) if segment is not None else 0
+        if node is not None:
+            tiles |= self.reachable_tiles(self.node_component[node])
+        return tiles.bit_count()
+
+
+def energized_per_start(grid: list[str],
+                        start_locations: list[Beam],
+                        processes: int | None = 1,
+                        beam_graph: BeamGraph | None = None) -> list[int]:
+    """
+    Calculates the energized tiles for each start location.
+
+    :param processes: Amount of worker processes, each building its own `BeamGraph` and handling a share of the
+        start locations. `1` runs everything in this process, `None` uses all cores.
+    :param beam_graph: Already built `BeamGraph` for `grid`, only used when running in this process.
+    :return: Amount of energized tiles per start location, in the same order.
+    """
+    if processes == 1:
+        beam_graph = beam_graph or BeamGraph(grid)
+        return [beam_graph.energized(start) for start in start_locations]
+    # Hand out a few chunks per worker, so slow chunks can be balanced by the other workers
+    chunk_size = max(1, len(start_locations) // (4 * (processes or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker, initargs=(grid,)) as executor:
+        return list(executor.map(_worker_energized, start_locations, chunksize=chunk_size))
+
+
+_worker_graph: BeamGraph | None = None
+
+
+def _init_worker(grid: list[str]):
+    global _worker_graph
+    _worker_graph = BeamGraph(grid)
+
+
+def _worker_energized(start_location: Beam) -> int:
+    return _worker_graph.energized(start_location)
 
 
 def simulate_beams(grid: list[str], start_location: Beam) -> set[tuple[int, int]]:
     """
+    Step-by-step simulation of the beams. Much slower than `BeamGraph`, but useful to verify it.
     Takes the mirror grid and a starting location (it should be out-of-bounds by 1 and head into the direction of the
     grid. This additional tile will be subtracted from the resulting `set` of visited tiles
     :return: `set` containing a `tuple[int, int]` for each visited field, not including the `start_location` one.
     """
     known_beam_steps: set[Beam] = set()
-    beams: Queue[Beam] = Queue()
-    beams.put(start_location)
+    beams: deque[Beam] = deque([start_location])
 
-    while not beams.empty():
-        beam = beams.get()
-        for next_beam in next_beams(tuple(grid), beam):
+    while beams:
+        beam = beams.popleft()
+        for next_beam in next_beams(grid, beam):
             if next_beam not in known_beam_steps:
-                beams.put(next_beam)
+                beams.append(next_beam)
                 known_beam_steps.add(next_beam)
 
     return {tile for tile, _ in known_beam_steps}
 
 
-@cache
-def next_beams(grid: tuple[str, ...], beam: Beam) -> list[Beam]:
-    dir_to_delta: dict[Direction, tuple[int, int]] = {
-        "<": (0, -1),
-        ">": (0, 1),
-        "^": (-1, 0),
-        "v": (1, 0)
-    }
+def next_beams(grid: list[str], beam: Beam) -> list[Beam]:
     location, direction = beam
     delta = dir_to_delta[direction]
     new_loc_row, new_loc_col = location[0] + delta[0], location[1] + delta[1]
@@ -61,17 +295,21 @@ def next_beams(grid: tuple[str, ...], beam: Beam) -> list[Beam]:
     if not (0 <= new_loc_row < len(grid)) or not (0 <= new_loc_col < len(grid[0])):
         return []
 
-    if grid[new_loc_row][new_loc_col] == "|" and direction in ["<", ">"]:
-        return [((new_loc_row, new_loc_col), "^"), ((new_loc_row, new_loc_col), "v")]
-    if grid[new_loc_row][new_loc_col] == "-" and direction in ["^", "v"]:
-        return [((new_loc_row, new_loc_col), "<"), ((new_loc_row, new_loc_col), ">")]
-    if grid[new_loc_row][new_loc_col] == "/":
-        mirror_map = {"^": ">", ">": "^", "v": "<", "<": "v"}
-        return [((new_loc_row, new_loc_col), mirror_map[direction])]
-    if grid[new_loc_row][new_loc_col] == "\\":
-        mirror_map = {"^": "<", ">": "v", "v": ">", "<": "^"}
-        return [((new_loc_row, new_loc_col), mirror_map[direction])]
-    return [((new_loc_row, new_loc_col), direction)]
+    next_directions = deflect(grid[new_loc_row][new_loc_col], direction) or [direction]
+    return [((new_loc_row, new_loc_col), next_direction) for next_direction in next_directions]
+
+
+def parse(text: str) -> BeamGraph:
+    return BeamGraph([line.strip() for line in text.splitlines()])
+
+
+def part1(beam_graph: BeamGraph) -> int:
+    return beam_graph.energized(((0, -1), ">"))
+
+
+def part2(beam_graph: BeamGraph) -> int:
+    grid = beam_graph.grid
+    return max(energized_per_start(grid, edge_starts(grid), beam_graph=beam_graph))
 
 
 if __name__ == '__main__':
@@ -8,27 +8,69 @@ directions = {
 }
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip().split() for line in f.readlines()]
+def parse(text: str) -> list[list[str]]:
+    return [line.strip().split() for line in text.splitlines()]
+
 
-    # Part 1
+def part1(input_lines: list[list[str]], verify: bool = False) -> int:
+    """
+    :param verify: Also calculate the size by filling the lagoon field by field, to check the result of `lagoon_size()`.
+    """
     instructions: list[tuple[str, int]] = [(direction, int(x)) for direction, x, _ in input_lines]
-    borders = get_border_fields(instructions)
-    filled_space = fill_space(borders)
-    total_holes = borders.union(filled_space)
-    print(f"Challenge 1: {len(total_holes)}")
+    total_holes = lagoon_size(instructions)
+    if verify and lagoon_size_by_filling(instructions) != total_holes:
+        raise RuntimeError("Lagoon size doesn't match the size found by filling the lagoon")
+    return total_holes
+
 
-    # Part 2
-    # This won't finish anytime soon. Time-complexity is too high and the input too large.
-    # For the better approach, see README.md - I'm honestly too bored of the part2-time-complexity tasks to do this rn.
+def part2(input_lines: list[list[str]]) -> int:
+    # Filling this won't finish anytime soon, since the trench is hundreds of millions of fields long.
+    # Only looking at the corners of the trench is independent of its length, though.
     direction_map = {"0": "R", "1": "D", "2": "L", "3": "U"}
     instructions: list[tuple[str, int]] = [(direction_map[color[-2]], int(color[2:-2], 16)) for _, _, color in
                                            input_lines]
+    return lagoon_size(instructions)
+
+
+def main(verify: bool = False):
+    """
+    :param verify: Also calculate part 1 by filling the lagoon field by field, to check the result of `lagoon_size()`.
+    """
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_lines = parse(f.read())
+
+    print(f"Challenge 1: {part1(input_lines, verify)}")
+    print(f"Challenge 2: {part2(input_lines)}")
+
+
+def lagoon_size(instructions: list[tuple[str, int]]) -> int:
+    """
+    Calculates the amount of holes (trench and inner area) from the corners of the trench only.
+    The shoelace formula gives the area of the polygon through the centers of the trench fields.
+    Pick's theorem then gives the amount of fields fully inside of it: `inner = area - border / 2 + 1`,
+    where `border` is the amount of trench fields (= total length of all instructions).
+
+    :return: Amount of inner fields plus trench fields.
+    """
+    current_x, current_y = 0, 0
+    double_area = 0
+    border = 0
+    for direction, steps, *_ in instructions:
+        delta_x, delta_y = directions[direction]
+        next_x, next_y = current_x + delta_x * steps, current_y + delta_y * steps
+        # Shoelace formula, summing up the cross product of each pair of consecutive corners
+        double_area += current_x * next_y - next_x * current_y
+        border += steps
+        current_x, current_y = next_x, next_y
+    inner = (abs(double_area) - border) // 2 + 1
+    return inner + border
+
+
+def lagoon_size_by_filling(instructions: list[tuple[str, int]]) -> int:
+    """ Calculates the amount of holes by collecting every single trench and inner field. Slow, but easy to follow. """
     borders = get_border_fields(instructions)
     filled_space = fill_space(borders)
-    total_holes = borders.union(filled_space)
-    print(f"Challenge 2: {len(total_holes)}")
+    return len(borders.union(filled_space))
 
 
 def fill_space(borders: set[tuple[int, int]]) -> set[tuple[int, int]]:
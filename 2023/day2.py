@@ -1,8 +1,5 @@
 from collections import namedtuple
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 Dices = namedtuple("Dices", "red green blue")
 
 
@@ -22,9 +19,11 @@ def game_to_dices(line: str) -> Dices:
                  color_to_amount.get("blue", 0))
 
 
-# Cut off the "Game 10" text as we don't need that
-game_lines = [line.split(":")[-1].strip() for line in input_lines]
-total_games: list[list[Dices]] = [line_to_games(line) for line in game_lines]
+def parse(text: str) -> list[list[Dices]]:
+    input_lines = [l.strip() for l in text.splitlines()]
+    # Cut off the "Game 10" text as we don't need that
+    game_lines = [line.split(":")[-1].strip() for line in input_lines]
+    return [line_to_games(line) for line in game_lines]
 
 
 # Part 1
@@ -34,9 +33,9 @@ def game_possible(games: list[Dices], limit: Dices) -> bool:
         all(dice.blue <= limit.blue for dice in games)
 
 
-indexed_games = enumerate(total_games, start=1)
-part1_sum = sum(i for i, game in indexed_games if game_possible(game, Dices(12, 13, 14)))
-print(f"Challenge 1: {part1_sum}")
+def part1(total_games: list[list[Dices]]) -> int:
+    indexed_games = enumerate(total_games, start=1)
+    return sum(i for i, game in indexed_games if game_possible(game, Dices(12, 13, 14)))
 
 
 # Part 2
@@ -50,7 +49,15 @@ def dice_power(dice: Dices) -> int:
     return dice.red * dice.blue * dice.green
 
 
-minimum_list = map(minimum_dices, total_games)
-dice_powers = map(dice_power, minimum_list)
-part2_sum = sum(dice_powers)
-print(f"Challenge 2: {part2_sum}")
+def part2(total_games: list[list[Dices]]) -> int:
+    minimum_list = map(minimum_dices, total_games)
+    dice_powers = map(dice_power, minimum_list)
+    return sum(dice_powers)
+
+
+if __name__ == '__main__':
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        total_games = parse(f.read())
+
+    print(f"Challenge 1: {part1(total_games)}")
+    print(f"Challenge 2: {part2(total_games)}")
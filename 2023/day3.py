@@ -1,8 +1,4 @@
 import itertools
-
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 import re
 from collections import namedtuple
 
@@ -39,39 +35,57 @@ def surrounding_symbols(lines: list[str | list], pos: Coords, coords_only: bool
     return surrounding_chars.difference(non_symbol_chars)
 
 
-re_numbers = re.compile(r'\d+')
-# Holds one tuple for each number, which represents the line the match is in,
-# as well as the start-index and end-index of the number
-number_coords: list[Coords] = []
+def parse(text: str) -> tuple[list[str], list[Coords]]:
+    """ :return: Lines of the schematic and the `Coords` of each number in it. """
+    input_lines = [l.strip() for l in text.splitlines()]
+    re_numbers = re.compile(r'\d+')
+    # Holds one tuple for each number, which represents the line the match is in,
+    # as well as the start-index and end-index of the number
+    number_coords: list[Coords] = []
+
+    for i, line in enumerate(input_lines):
+        number_coords.extend(Coords(i,
+                                    match.start(),
+                                    match.end(),
+                                    int(input_lines[i][match.start():match.end()]))
+                             for match in re_numbers.finditer(line))
+    return input_lines, number_coords
+
+
+def part1(schematic: tuple[list[str], list[Coords]]) -> int:
+    input_lines, number_coords = schematic
+    # Get all those coordinates, which have at least one symbol around them (= function return value is not {})
+    valid_coords = filter(lambda nc: surrounding_symbols(input_lines, nc), number_coords)
+    return sum(c.value for c in valid_coords)
+
+
+def part2(schematic: tuple[list[str], list[Coords]]) -> int:
+    input_lines, number_coords = schematic
+    # Make the grid a list of lists with one character or NamedTuple each, so it's easier to mutate
+    number_grid: list[list[str | Coords]] = [list(line) for line in input_lines]
+    # Place the Coords object in place of each digit it consists of, so we can instantly find the full number if we
+    # come across a digit. This also allows us to easily check, whether two digits belong to the same number
+    # (= same object).
+    for c in number_coords:
+        for idx in range(c.start, c.end):
+            number_grid[c.line][idx] = c
 
-for i, line in enumerate(input_lines):
-    number_coords.extend(Coords(i,
-                                match.start(),
-                                match.end(),
-                                int(input_lines[i][match.start():match.end()])) for match in re_numbers.finditer(line))
+    # Go through all coordinates in the grid and find all "*" fields
+    height, width = len(number_grid), len(number_grid[0])
+    coord_iter = itertools.product(range(height), range(width))
+    star_coords = [Coords(i, j, j + 1, 0) for i, j in coord_iter if number_grid[i][j] == "*"]
+    # Using the same function, we find all objects in coordinates around the asterisk character, specifically the
+    # numbers. As it returns a set, so each number (or rather tuple representing a number) only once, we can easily
+    # check if there are exactly two numbers around that asterisk.
+    gear_factor_coords = [list(surrounding_symbols(number_grid, c)) for c in star_coords]
+    # Filter the chunks of numbers around the asterisk characters for the ones with exactly two factors.
+    gear_products = [coords[0].value * coords[1].value for coords in gear_factor_coords if len(coords) == 2]
+    return sum(gear_products)
 
-# Part 1
-# Get all those coordinates, which have at least one symbol around them (= function return value is not {})
-valid_coords = filter(lambda nc: surrounding_symbols(input_lines, nc), number_coords)
-print(f"Challenge 1: {sum(c.value for c in valid_coords)}")
 
-# Part 2
-# Make the grid a list of lists with one character or NamedTuple each, so it's easier to mutate
-number_grid: list[list[str | Coords]] = [list(line) for line in input_lines]
-# Place the Coords object in place of each digit it consists of, so we can instantly find the full number if we come
-# across a digit. This also allows us to easily check, whether two digits belong to the same number (= same object).
-for c in number_coords:
-    for idx in range(c.start, c.end):
-        number_grid[c.line][idx] = c
+if __name__ == '__main__':
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        schematic = parse(f.read())
 
-# Go through all coordinates in the grid and find all "*" fields
-height, width = len(number_grid), len(number_grid[0])
-coord_iter = itertools.product(range(height), range(width))
-star_coords = [Coords(i, j, j + 1, 0) for i, j in coord_iter if number_grid[i][j] == "*"]
-# Using the same function, we find all objects in coordinates around the asterisk character, specifically the numbers.
-# As it returns a set, so each number (or rather tuple representing a number) only once, we can easily check if there
-# are exactly two numbers around that asterisk.
-gear_factor_coords = [list(surrounding_symbols(number_grid, c)) for c in star_coords]
-# Filter the chunks of numbers around the asterisk characters for the ones with exactly two factors.
-gear_products = [coords[0].value * coords[1].value for coords in gear_factor_coords if len(coords) == 2]
-print(f"Challenge 2: {sum(gear_products)}")
+    print(f"Challenge 1: {part1(schematic)}")
+    print(f"Challenge 2: {part2(schematic)}")
@@ -2,9 +2,6 @@ import re
 import time
 from typing import NamedTuple, Iterator
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 Card = NamedTuple("Card", num=int, winners=set[int], pulls=set[int], wins=int)
 
 
@@ -31,35 +28,31 @@ def card_value(card: Card) -> int:
     return 2 ** (len(winning_pulls) - 1) if len(winning_pulls) > 0 else 0
 
 
-# Make objects out of each card. The amount of winning numbers is convenient to calculate here (for part 2).
-cards = [Card(i, winners(l), pulls(l), len(winners(l).intersection(pulls(l))))
-         for i, l in enumerate(input_lines, start=1)]
+def parse(text: str) -> list[Card]:
+    input_lines = [l.strip() for l in text.splitlines()]
+    # Make objects out of each card. The amount of winning numbers is convenient to calculate here (for part 2).
+    return [Card(i, winners(l), pulls(l), len(winners(l).intersection(pulls(l))))
+            for i, l in enumerate(input_lines, start=1)]
+
 
-# Part 1
-card_values = map(card_value, cards)
-print(f"Challenge 1: {sum(card_values)}")
+def part1(cards: list[Card]) -> int:
+    card_values = map(card_value, cards)
+    return sum(card_values)
 
 
-# Part 2
-def count_cards(card_stack: list[Card]) -> int:
+def count_cards(cards: list[Card], card_stack: list[Card]) -> int:
     if len(card_stack) == 0:
         return 0
     # Generates indices of the won duplicate cards, by taking the number of the current card and using it as an index
     # (it's 1-indexed, so no need to add 1) and proceeding until the amount of wins the top-most card has is reached.
     duplicate_indices = range(card_stack[0].num, card_stack[0].num + card_stack[0].wins)
     won_duplicates = [cards[i] for i in duplicate_indices]
-    return 1 + count_cards(won_duplicates) + count_cards(card_stack[1:])
-
+    return 1 + count_cards(cards, won_duplicates) + count_cards(cards, card_stack[1:])
 
-start_time = time.time_ns()
-amount_cards = count_cards(cards)
-print(f"Challenge 2 (simple solution in {(time.time_ns() - start_time) / 10 ** 9:.2f} sec):\t{amount_cards}")
 
-
-# Part 2
 # This alternative approach avoids constructing lists directly and tries to use generators instead.
 # Interestingly enough, the simple timing test reveals that the generator-based approach is ~40% slower.
-def count_cards(card_stack: Iterator[Card]) -> int:
+def count_cards_generator(cards: list[Card], card_stack: Iterator[Card]) -> int:
     try:
         current_card = next(card_stack)
     except StopIteration:
@@ -68,9 +61,23 @@ def count_cards(card_stack: Iterator[Card]) -> int:
     # (it's 1-indexed, so no need to add 1) and proceeding until the amount of wins the top-most card has is reached.
     duplicate_indices = range(current_card.num, current_card.num + current_card.wins)
     won_duplicates = (cards[i] for i in duplicate_indices)
-    return 1 + count_cards(won_duplicates) + count_cards(card_stack)
+    return 1 + count_cards_generator(cards, won_duplicates) + count_cards_generator(cards, card_stack)
+
+
+def part2(cards: list[Card]) -> int:
+    return count_cards(cards, cards)
+
+
+if __name__ == '__main__':
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        cards = parse(f.read())
+
+    print(f"Challenge 1: {part1(cards)}")
 
+    start_time = time.time_ns()
+    amount_cards = part2(cards)
+    print(f"Challenge 2 (simple solution in {(time.time_ns() - start_time) / 10 ** 9:.2f} sec):\t{amount_cards}")
 
-start_time = time.time_ns()
-amount_cards = count_cards(iter(cards))
-print(f"Challenge 2 (generator-based in {(time.time_ns() - start_time) / 10 ** 9:.2f} sec):\t{amount_cards}")
+    start_time = time.time_ns()
+    amount_cards = count_cards_generator(cards, iter(cards))
+    print(f"Challenge 2 (generator-based in {(time.time_ns() - start_time) / 10 ** 9:.2f} sec):\t{amount_cards}")
@@ -1,8 +1,13 @@
+import bisect
 import itertools
-from typing import NamedTuple
+from collections.abc import Generator
+from typing import NamedTuple, TextIO
 
 # Declare a lightweight type for the conversions
 Conversion = NamedTuple("Conversion", range=range, delta=int)
+# All categories composed into one function. Numbers from `starts[i]` (inclusive) up to `starts[i + 1]` (exclusive)
+# are converted by adding `deltas[i]`. `starts[0]` is always 0, the last piece goes on forever.
+PiecewiseMap = NamedTuple("PiecewiseMap", starts=list[int], deltas=list[int])
 
 
 def conversion_from_line(line: str) -> Conversion:
@@ -17,20 +22,92 @@ def conversion_from_line(line: str) -> Conversion:
     return Conversion(range(source_start, source_start + range_size), delta=(dest_start - source_start))
 
 
-def apply_conversions(conversions: list[list[Conversion]], num: int) -> int:
-    for mappings in conversions:
-        for mapping in mappings:
-            # Check if the conversion applies to this number (= is within the range).
-            # If it does, apply the delta and end this conversion category, as we were successful.
-            if num in mapping.range:
-                num += mapping.delta
+def piecewise_from_conversions(conversions: list[Conversion]) -> PiecewiseMap:
+    """
+    Turns the conversions of one category into a `PiecewiseMap`, filling the gaps between them with delta 0.
+    """
+    starts, deltas = [0], [0]
+    for conversion in sorted(conversions, key=lambda c: c.range.start):
+        if conversion.range.start == starts[-1]:
+            # Replace the gap piece, that would be empty otherwise
+            starts.pop(), deltas.pop()
+        starts.append(conversion.range.start)
+        deltas.append(conversion.delta)
+        starts.append(conversion.range.stop)
+        deltas.append(0)
+    return PiecewiseMap(starts, deltas)
+
+
+def compose(first: PiecewiseMap, second: PiecewiseMap) -> PiecewiseMap:
+    """
+    Creates a single `PiecewiseMap` that maps like applying `first`, then `second`.
+    Each piece of `first` is split where its converted numbers cross a piece boundary of `second`.
+    """
+    starts, deltas = [], []
+    for i, (start, delta) in enumerate(zip(first.starts, first.deltas)):
+        stop = first.starts[i + 1] if i + 1 < len(first.starts) else None
+        # Find the piece of `second`, the converted start lies in, then go through all pieces until the converted stop
+        j = bisect.bisect_right(second.starts, start + delta) - 1
+        piece_start = start
+        while True:
+            combined_delta = delta + second.deltas[j]
+            # Only start a new piece, if the delta actually changes
+            if not deltas or deltas[-1] != combined_delta:
+                starts.append(piece_start)
+                deltas.append(combined_delta)
+            j += 1
+            if j >= len(second.starts) or (stop is not None and second.starts[j] - delta >= stop):
                 break
-    return num
+            piece_start = second.starts[j] - delta
+    return PiecewiseMap(starts, deltas)
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+def convert_seed(almanac: PiecewiseMap, num: int) -> int:
+    """ Converts `num` with a single binary search for its piece. """
+    return num + almanac.deltas[bisect.bisect_right(almanac.starts, num) - 1]
+
+
+def lowest_in_range(almanac: PiecewiseMap, r: range) -> int:
+    """
+    :return: Lowest converted number of all numbers in `r`. Within a piece, the lowest number is converted to the
+        lowest result, so only the first number of each piece overlapping `r` has to be converted.
+    """
+    i = bisect.bisect_right(almanac.starts, r.start) - 1
+    lowest = r.start + almanac.deltas[i]
+    i += 1
+    while i < len(almanac.starts) and almanac.starts[i] < r.stop:
+        lowest = min(lowest, almanac.starts[i] + almanac.deltas[i])
+        i += 1
+    return lowest
+
+
+def read_numbers(file: TextIO, chunk_size: int = 1 << 20) -> Generator[list[int]]:
+    """
+    Reads whitespace-separated numbers from `file` in chunks of `chunk_size` characters, so files with millions
+    of seeds don't have to be loaded at once. Numbers cut off at the end of a chunk are completed with the next one.
+
+    :return: `list` of the numbers in each chunk.
+    """
+    remainder = ""
+    while chunk := file.read(chunk_size):
+        chunk = remainder + chunk
+        # The last token may continue in the next chunk, unless the chunk ends with whitespace
+        tokens = chunk.split()
+        remainder = tokens.pop() if tokens and not chunk[-1].isspace() else ""
+        yield [int(token) for token in tokens]
+    if remainder:
+        yield [int(remainder)]
+
+
+def convert_stream(file: TextIO, almanac: PiecewiseMap, chunk_size: int = 1 << 20) -> Generator[list[int]]:
+    """ Converts all seeds in `file` chunk by chunk, see `read_numbers()`. """
+    for numbers in read_numbers(file, chunk_size):
+        yield [convert_seed(almanac, num) for num in numbers]
+
+
+def parse(text: str) -> tuple[list[int], PiecewiseMap]:
+    """ :return: Seed numbers and the composition of all category mappings. """
+    input_lines = [line.strip() for line in text.splitlines()]
 
     # Get the seed numbers from the first line, starting after "seeds:"
     seeds = [int(num) for num in input_lines[0][6:].strip().split()]
@@ -49,41 +126,37 @@ def main():
     while list_chunk := list(itertools.takewhile(lambda line: line.strip(), mapping_line_gen)):
         conversions.append([conversion_from_line(line) for line in list_chunk])
 
-    # Part 1
-    transformed_seeds = [apply_conversions(conversions, seed) for seed in seeds]
-    print(f"Challenge 1: {min(transformed_seeds)}")
+    # Compose all categories into a single function, so each seed is converted with one lookup,
+    # no matter how many categories and conversions there are.
+    almanac = piecewise_from_conversions([])
+    for mappings in conversions:
+        almanac = compose(almanac, piecewise_from_conversions(mappings))
+    return seeds, almanac
+
 
-    # Part 2
+def part1(model: tuple[list[int], PiecewiseMap]) -> int:
+    seeds, almanac = model
+    transformed_seeds = [convert_seed(almanac, seed) for seed in seeds]
+    return min(transformed_seeds)
+
+
+def part2(model: tuple[list[int], PiecewiseMap]) -> int:
+    seeds, almanac = model
     # Doing this like part 1 using exhaustive calculations is not sufficient, as there are billions of input values,
     # causing the script to run for an unknown amount of time. One could solve this by spending Cyprus's GDP on Cloud,
     # or being a little more clever and calculating only what is really necessary.
-    # To determine the minimum result value, it is sufficient to look at the ranges, how they are converted by
-    # the mappings and later at the lowest value available in the ranges.
+    # To determine the minimum result value, it is sufficient to look at the pieces of the composed function
+    # overlapping each range and at the lowest value converted in them.
     seed_ranges = [range(start, start + size) for start, size in zip(seeds[0::2], seeds[1::2])]
-    for mappings in conversions:
-        seed_ranges_gen = (split_range_by_conversions(r, mappings) for r in seed_ranges)
-        # Flatten the list of lists to one list of ranges
-        seed_ranges = sum(seed_ranges_gen, [])
-        seed_ranges.sort(key=lambda r: r.start)
-    lowest_result = min(r.start for r in seed_ranges if len(r) > 0)
-    print(f"Challenge 2: {lowest_result}")
-
-
-def split_range_by_conversions(r: range, conversions: list[Conversion]) -> list[range]:
-    # Filter conversions which are irrelevant, as they're out of range.
-    # This also guarantees that we can rely on ranges created from conversion to be within the original range's bounds.
-    conversions = [c for c in conversions if not (c.range.stop < r.start or c.range.start > r.stop)]
-    if len(conversions) == 0:
-        return [r]
-    conversions.sort(key=lambda c: c.range.start)
-    first_range = range(r.start, conversions[0].range.start)
-    last_range = range(conversions[-1].range.stop, r.stop)
-    # Create ranges for each conversion, spanning their destination range after the conversion.
-    conv_ranges = [range(max(c.range.start, r.start) + c.delta, min(c.range.stop, r.stop) + c.delta) for c in
-                   conversions]
-    # Between stop of one range and start of another are numbers which aren't modified either - these are relevant too
-    inter_ranges = [range(c1.range.stop, c2.range.start) for c1, c2 in zip(conversions, conversions[1:])]
-    return sorted([first_range, last_range] + conv_ranges + inter_ranges, key=lambda r: r.start)
+    return min(lowest_in_range(almanac, r) for r in seed_ranges if len(r) > 0)
+
+
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        model = parse(f.read())
+
+    print(f"Challenge 1: {part1(model)}")
+    print(f"Challenge 2: {part2(model)}")
 
 
 if __name__ == '__main__':
@@ -6,12 +6,10 @@ from typing import NamedTuple
 Race = NamedTuple("Race", time=int, distance=int)
 Settings = NamedTuple("Settings", button_duration=int, distance=int)
 
-races = [
-    Race(47, 282),
-    Race(70, 1079),
-    Race(75, 1147),
-    Race(66, 1062),
-]
+
+def parse(text: str) -> list[str]:
+    """ :return: Time and distance line, with the label cut off. """
+    return [line.split(":")[-1] for line in text.splitlines() if line.strip()]
 
 
 def calc_distances(available_time: int, required_distance: int) -> Generator[Settings]:
@@ -19,12 +17,23 @@ def calc_distances(available_time: int, required_distance: int) -> Generator[Set
     return (s for s in settings if s.distance > required_distance)
 
 
-# Part 1
-race_solutions = (list(calc_distances(r.time, r.distance)) for r in races)
-variant_product = reduce(operator.mul, map(len, race_solutions))
-print(f"Challenge 1: {variant_product}")
+def part1(lines: list[str]) -> int:
+    times, distances = ([int(x) for x in line.split()] for line in lines)
+    races = [Race(t, d) for t, d in zip(times, distances)]
+    race_solutions = (list(calc_distances(r.time, r.distance)) for r in races)
+    return reduce(operator.mul, map(len, race_solutions))
+
+
+def part2(lines: list[str]) -> int:
+    # The spaces between the numbers are to be ignored, so it's a single race
+    race = Race(*(int("".join(line.split())) for line in lines))
+    win_conditions = list(calc_distances(race.time, race.distance))
+    return len(win_conditions)
+
+
+if __name__ == '__main__':
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        lines = parse(f.read())
 
-# Part 2
-race = Race(47707566, 282107911471062)
-win_conditions = list(calc_distances(race.time, race.distance))
-print(f"Challenge 2: {len(win_conditions)}")
+    print(f"Challenge 1: {part1(lines)}")
+    print(f"Challenge 2: {part2(lines)}")
@@ -92,21 +92,30 @@ class Hand:
         self.hand = [(card if char == "J" else char) for char in self.hand]
 
 
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+def parse(text: str) -> list[str]:
+    return [line.strip() for line in text.splitlines()]
+
 
-    # Part 1
+def part1(input_lines: list[str]) -> int:
     hands = [Hand(*line.strip().split()) for line in input_lines]
     ordered_hands = sorted(hands, key=lambda hand: hand.rank)
     wins_per_hand = (hand.bid * rank for rank, hand in enumerate(ordered_hands, start=1))
-    print(f"Challenge 1: {sum(wins_per_hand)}")
+    return sum(wins_per_hand)
 
-    # Part 2
+
+def part2(input_lines: list[str]) -> int:
     hands = [Hand(*line.strip().split(), j_are_joker=True) for line in input_lines]
     ordered_hands = sorted(hands, key=lambda hand: hand.rank)
     wins_per_hand = (hand.bid * rank for rank, hand in enumerate(ordered_hands, start=1))
-    print(f"Challenge 2: {sum(wins_per_hand)}")
+    return sum(wins_per_hand)
+
+
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_lines = parse(f.read())
+
+    print(f"Challenge 1: {part1(input_lines)}")
+    print(f"Challenge 2: {part2(input_lines)}")
 
 
 if __name__ == '__main__':
@@ -1,7 +1,109 @@
 import itertools
 import math
 import time
-from collections.abc import Generator
+from collections.abc import Callable, Generator
+from typing import NamedTuple
+
+
+class Network(NamedTuple):
+    """ Nodes interned to integer IDs, with the next node for "L" in `successors[0]` and for "R" in `successors[1]`. """
+    names: list[str]
+    ids: dict[str, int]
+    successors: tuple[list[int], list[int]]
+    # Direction sequence as indices into `successors`
+    directions: list[int]
+
+
+class Walk(NamedTuple):
+    """
+    Path of a walker, which becomes periodic once a `(node, instruction index)` state repeats.
+    Steps count from 0, the start node. The walk repeats steps `tail` to `tail + period - 1` forever after.
+    """
+    tail: int
+    period: int
+    # Steps before the loop and steps of the first loop pass, at which the walker is on a destination node
+    tail_hits: list[int]
+    loop_hits: list[int]
+
+    def hits(self, step: int) -> bool:
+        if step < self.tail:
+            return step in self.tail_hits
+        return self.tail + (step - self.tail) % self.period in self.loop_hits
+
+
+def parse_network(lines: list[str]) -> Network:
+    names = [line[:3] for line in lines[2:] if line]
+    ids = {name: node for node, name in enumerate(names)}
+    left = [ids[line[7:10]] for line in lines[2:] if line]
+    right = [ids[line[12:15]] for line in lines[2:] if line]
+    return Network(names, ids, (left, right), ["LR".index(direction) for direction in lines[0].strip()])
+
+
+def analyze_walk(network: Network, start: int, is_destination: Callable[[str], bool]) -> Walk:
+    """
+    Walks from `start`, until the state of node and position in the direction sequence repeats.
+    Each state is stored with its step in a `dict`, so a repetition is found right away.
+    """
+    names, successors, directions = network.names, network.successors, network.directions
+    visited: dict[tuple[int, int], int] = {}
+    hits = []
+    node, step = start, 0
+    while (node, step % len(directions)) not in visited:
+        visited[(node, step % len(directions))] = step
+        if is_destination(names[node]):
+            hits.append(step)
+        node = successors[directions[step % len(directions)]][node]
+        step += 1
+    tail = visited[(node, step % len(directions))]
+    return Walk(tail, step - tail, [hit for hit in hits if hit < tail], [hit for hit in hits if hit >= tail])
+
+
+def combine_congruences(first: tuple[int, int], second: tuple[int, int]) -> tuple[int, int] | None:
+    """
+    Chinese remainder theorem for moduli, which don't have to be coprime.
+
+    :param first: `(remainder, modulus)` of the first congruence, same for `second`.
+    :return: `(remainder, modulus)` of the steps satisfying both congruences, `None` if there are none.
+    """
+    (remainder, modulus), (other_remainder, other_modulus) = first, second
+    gcd = math.gcd(modulus, other_modulus)
+    if (other_remainder - remainder) % gcd:
+        return None
+    # Find k with remainder + modulus * k = other_remainder (mod other_modulus)
+    k = (other_remainder - remainder) // gcd * pow(modulus // gcd, -1, other_modulus // gcd) % (other_modulus // gcd)
+    combined_modulus = modulus // gcd * other_modulus
+    return (remainder + modulus * k) % combined_modulus, combined_modulus
+
+
+def first_common_hit(walks: list[Walk]) -> int | None:
+    """ :return: First step at which all walkers are on a destination node at once, `None` if that never happens. """
+    # Before all walkers are in their loops, only the hits of the tails have to be checked
+    all_looping = max(walk.tail for walk in walks)
+    tail_hits = sorted({hit for walk in walks for hit in walk.tail_hits if hit < all_looping})
+    common_tail_hit = next((hit for hit in tail_hits if all(walk.hits(hit) for walk in walks)), None)
+    if common_tail_hit is not None:
+        return common_tail_hit
+
+    if all(len(walk.loop_hits) == 1 and walk.loop_hits[0] % walk.period == 0 for walk in walks):
+        # The puzzle input is built like this: each loop has one destination, `period` steps after the start.
+        # So all walkers are on their destination at the multiples of all periods, once they are all in their loop.
+        least_common_multiple = math.lcm(*(walk.period for walk in walks))
+        return all_looping + -all_looping % least_common_multiple
+
+    # In general, each loop hit is a congruence `step = hit (mod period)`, solved for each combination of hits
+    first_hit = None
+    for hits in itertools.product(*(walk.loop_hits for walk in walks)):
+        congruence: tuple[int, int] | None = (0, 1)
+        for hit, walk in zip(hits, walks):
+            congruence = combine_congruences(congruence, (hit % walk.period, walk.period))
+            if congruence is None:
+                break
+        if congruence is not None:
+            remainder, modulus = congruence
+            # Smallest solution, after all walkers have reached their loop
+            step = all_looping + (remainder - all_looping) % modulus
+            first_hit = step if first_hit is None else min(first_hit, step)
+    return first_hit
 
 
 def graph_steps(node_map: dict[str, dict[str, str]],
@@ -28,44 +130,45 @@ def graph_steps(node_map: dict[str, dict[str, str]],
             yield location
 
 
+def parse(text: str) -> Network:
+    return parse_network([line.strip() for line in text.splitlines()])
+
+
+def part1(network: Network) -> int | None:
+    return first_common_hit([analyze_walk(network, network.ids["AAA"], lambda name: name == "ZZZ")])
+
+
+def part2(network: Network) -> int | None:
+    # An exhaustive search turned out to be too much (see exhaustive_ghost_steps()), so the walks are analyzed instead.
+    # There is a finite amount of states (node and position in the direction sequence), so each path has to loop.
+    # Each ghost is on a destination node (ending with "Z") at some steps before its loop and at fixed offsets
+    # within each pass of the loop. With the puzzle input, each loop has exactly one destination, which is reached
+    # "coincidentally" after exactly one loop length, so the answer is the LEAST COMMON MULTIPLE of the loop lengths.
+    # first_common_hit() uses that shortcut if it holds and the Chinese remainder theorem otherwise.
+    # FUN FACT: The sum of cycle length and "introduction steps to reach the cycle" is a prime-number for all paths.
+    start_nodes = [node for node, name in enumerate(network.names) if name.endswith("A")]
+    walks = [analyze_walk(network, node, lambda name: name.endswith("Z")) for node in start_nodes]
+    # Magnitude is ~10**13, which explains why the exhaustive search didn't finish (and wouldn't have had anytime soon)
+    return first_common_hit(walks)
+
+
 def main():
     with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
+        network = parse(f.read())
+
+    print(f"Challenge 1: {part1(network)}")
+    print(f"Challenge 2: {part2(network)}")
 
+
+def exhaustive_ghost_steps(input_lines: list[str]) -> int:
+    """
+    This code works for smaller solutions, but just like day 6, takes an enormous amount of time with puzzle input.
+    I liked the generator-based approach and there are quite cool Python features at display, so I leave it in here.
+    """
     walk_sequence = input_lines[0].strip()
     # Store each node as a dict-key and the value is a dict with the nodes for directions "R" and "L"
     graph = {l[:3]: {"L": l[7:10], "R": l[12:15]} for l in input_lines[2:]}
 
-    # Part 1
-    steps = sum(1 for _ in graph_steps(graph, walk_sequence, start="AAA", end="ZZZ"))
-    print(f"Challenge 1: {steps}")
-
-    # Part 2
-    # As an exhaustive search turned out to be too much (see line 52+), hence some mathematical approach was required.
-    # The paths each explorer takes have to loop, otherwise the maximum steps required for the solution are twice the
-    # length of the node list - which is not the case, since the exhaustive search would've found it then.
-    # The path indeed are cyclic and have exactly one destination location (node ending with "Z").
-    # So we're looking for the cycle in which "coincidentally" all cycles end up at their destination node.
-    # This is effectively looking for a common multiple of all of explorer's cycle sizes - the least common multiple.
-    # So let's start by enumerating the paths each explorer takes until it loops.
-    start_nodes = [node for node in graph.keys() if node.endswith("A")]
-    cycles = [get_cycle(graph, walk_sequence, start=node) for node in start_nodes]
-    # cycles already contains the loop only. For some paths it takes a few steps to get to the looping section.
-    # This requires shifting the list of nodes a bit, to account for these "introduction steps" that happen only once.
-    # Funny enough, this causes the destination node to be the very first node on each path - what a "coincidence"!
-    # So we now just take the length of each cycle (= amount of steps to end up at the first node again, which is the
-    # destination node) and calculate the LEAST COMMON MULTIPLIER of all those to find the amount of steps required
-    # to end up at the start of all path's loop at the same time.
-    # FUN FACT: The sum of cycle length and "introduction steps to reach the cycle" is a prime-number for all paths.
-    least_common_multiple = math.lcm(*(len(cycle) for cycle in cycles))
-    # Magnitude is ~10**13, which explains why the exhaustive search didn't finish (and wouldn't have had anytime soon)
-    print(f"Challenge 2: {least_common_multiple}")
-    return
-
-    # noinspection PyUnreachableCode
-    # This code works for smaller solutions, but just like day 6, takes an enormous amount of time with puzzle input.
-    # I liked the generator-based approach and there are quite cool Python features at display, so I leave it in here.
-
     start_nodes = [node for node in graph.keys() if node.endswith("A")]
     # Create a generator for each of the starting nodes, which will produce the steps, starting at that node
     explorers = (graph_steps(graph, walk_sequence, start=node) for node in start_nodes)
@@ -74,28 +177,7 @@ def main():
     until_all_z_iter = itertools.takewhile(lambda locs: not all(loc.endswith("Z") for loc in locs), zip(*explorers))
     # Count the steps in a memory-friendly way using sum(1 for ...), adding one, since the last step is dropped,
     # due to takewhile's condition failing when we reach locations all ending in "Z", omitting that step in the process.
-    steps = sum(1 for _ in until_all_z_iter) + 1
-    print(f"Challenge 2: {steps}")
-
-
-def get_cycle(node_map: dict[str, dict[str, str]], direction_sequence: str, start: str = "AAA") -> list[str]:
-    """
-    Iterates through graph_steps() until a cycle is detected. Returns all nodes that are part of the cycle,
-    adjusted by the amount of steps required to reach the start of the cycle (cyclic shift-right of the list).
-    """
-    direction_iter = itertools.cycle(direction_sequence)
-    next(direction_iter)
-    steps_iter = zip(graph_steps(node_map, direction_sequence, start=start),
-                     itertools.cycle(range(len(direction_sequence))))
-    cycle: list[tuple[str, int]] = [(start, None)]
-    for step in steps_iter:
-        if step in cycle:
-            # Loop detected - isolate the loop
-            steps_to_loop = cycle.index(step)
-            loop_only = [loc for loc, direction in cycle][steps_to_loop:]
-            # The loop has a couple steps to get into it. Shift the loop start to account for that.
-            return loop_only[-steps_to_loop:] + loop_only[:-steps_to_loop]
-        cycle.append(step)
+    return sum(1 for _ in until_all_z_iter) + 1
 
 
 if __name__ == '__main__':
@@ -1,18 +1,27 @@
-def main():
-    with open(f'{__file__.split(".")[0]}.txt') as f:
-        input_lines = [line.strip() for line in f.readlines()]
-    number_rows: list[list[int]] = list(map(lambda line: [int(x) for x in line.strip().split()], input_lines))
+def parse(text: str) -> list[list[int]]:
+    input_lines = [line.strip() for line in text.splitlines()]
+    return list(map(lambda line: [int(x) for x in line.strip().split()], input_lines))
+
 
-    # Part 1
+def part1(number_rows: list[list[int]]) -> int:
     predictions = [predict_next(numbers) for numbers in number_rows]
-    print(f"Challenge 1: {sum(predictions)}")
+    return sum(predictions)
 
-    # Part 2
+
+def part2(number_rows: list[list[int]]) -> int:
     # This asked to extrapolate the number BEFORE the first one, instead of AFTER the last one, using the same logic.
     # However, this effectively is just a reversal of logic and allows to easily calculate this by re-using part 1.
     # Reversing the values of each line of values converts this problem to the problem already solved in part 1.
     predictions = [predict_next(list(reversed(numbers))) for numbers in number_rows]
-    print(f"Challenge 2: {sum(predictions)}")
+    return sum(predictions)
+
+
+def main():
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        number_rows = parse(f.read())
+
+    print(f"Challenge 1: {part1(number_rows)}")
+    print(f"Challenge 2: {part2(number_rows)}")
 
 
 def predict_next(numbers: list[int]) -> int:
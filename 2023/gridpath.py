@@ -0,0 +1,414 @@
+"""
+Shared path-finding over character grids, used by day 10 and day 17.
+
+States are plain integers `(row * width + col) * states_per_field + extra`, so the searches can keep distances and
+visited flags in flat lists instead of dicts of tuples. What `extra` means and which states follow a state is decided
+by a `MoveRule`. Each day only has to plug in its own rule, while the searches are shared.
+
+Running this file benchmarks the searches on the day 17 input.
+"""
+
+import abc
+import heapq
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+
+# Distance of states that were never reached
+UNREACHED = 10 ** 18
+# Move directions as (delta_row, delta_col), in clockwise order, so the opposite direction is always `(d + 2) % 4`.
+N, E, S, W = range(4)
+DELTAS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+
+class MoveRule(abc.ABC):
+    """
+    Abstract base class for move rules. A rule knows the grid and generates the states that follow a state,
+    along with the cost of that move.
+    """
+    states_per_field: int = 1
+
+    def __init__(self, grid: list[str] | tuple[str, ...]):
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0])
+
+    @property
+    def state_count(self) -> int:
+        return self.height * self.width * self.states_per_field
+
+    def encode(self, row: int, col: int, extra: int = 0) -> int:
+        return (row * self.width + col) * self.states_per_field + extra
+
+    def decode(self, state: int) -> tuple[int, int, int]:
+        """ :return: `(row, col, extra)` of `state`. """
+        field, extra = divmod(state, self.states_per_field)
+        row, col = divmod(field, self.width)
+        return row, col, extra
+
+    def field_states(self, row: int, col: int) -> list[int]:
+        """ :return: All states that belong to the field at `(row, col)`. """
+        first = self.encode(row, col)
+        return list(range(first, first + self.states_per_field))
+
+    @abc.abstractmethod
+    def neighbours(self, state: int) -> Iterable[tuple[int, int]]:
+        """ :return: `(next_state, cost)` for each state that can be reached from `state` with one move. """
+
+    def predecessors(self, state: int) -> Iterable[int]:
+        """
+        :return: Each state from which `state` can be reached with one move.
+            By default, moves are assumed to be reversible. Rules with one-way moves have to override this.
+        """
+        return (prev_state for prev_state, _ in self.neighbours(state))
+
+    def manhattan_to(self, row: int, col: int) -> Callable[[int], int]:
+        """ :return: Heuristic for `dijkstra()`, giving the Manhattan distance of a state's field to `(row, col)`. """
+        def heuristic(state: int) -> int:
+            field = state // self.states_per_field
+            return abs(field // self.width - row) + abs(field % self.width - col)
+        return heuristic
+
+
+class StepRule(MoveRule):
+    """
+    Single steps up, down, left or right onto any field that is not in `blocked`.
+    The cost of a step is given by `cost(char)` of the entered field, 1 by default.
+    """
+
+    def __init__(self, grid: list[str] | tuple[str, ...], blocked: str = "#",
+                 cost: Callable[[str], int] | None = None):
+        super().__init__(grid)
+        # Pre-calculate the cost of entering each field, `None` for blocked fields
+        cost = cost or (lambda char: 1)
+        self.costs = [None if char in blocked else cost(char) for line in grid for char in line]
+
+    def neighbours(self, state: int) -> Iterable[tuple[int, int]]:
+        width, costs = self.width, self.costs
+        col = state % width
+        next_states = []
+        if state >= width and costs[state - width] is not None:
+            next_states.append((state - width, costs[state - width]))
+        if state + width < len(costs) and costs[state + width] is not None:
+            next_states.append((state + width, costs[state + width]))
+        if col > 0 and costs[state - 1] is not None:
+            next_states.append((state - 1, costs[state - 1]))
+        if col < width - 1 and costs[state + 1] is not None:
+            next_states.append((state + 1, costs[state + 1]))
+        return next_states
+
+    def predecessors(self, state: int) -> Iterable[int]:
+        # Steps between two open fields are reversible, but blocked fields can't be entered in the first place
+        if self.costs[state] is None:
+            return []
+        return super().predecessors(state)
+
+
+class CrucibleRule(MoveRule):
+    """
+    Moves of the crucible from day 17. `extra` is the axis the crucible has to leave a field in,
+    `0` for vertical ("|") and `1` for horizontal ("-"). Each move goes between `min_move` and `max_move` steps along
+    that axis and turns 90° afterwards, so the next state has the other axis.
+    The cost of a move is the heat-loss of all entered fields, looked up from row and column prefix sums.
+    """
+    states_per_field = 2
+
+    def __init__(self, grid: list[str] | tuple[str, ...], min_move: int = 1, max_move: int = 3):
+        super().__init__(grid)
+        self.min_move, self.max_move = min_move, max_move
+        # `row_sums[y][x]` is the heat-loss of the first `x` fields in row `y`, `col_sums` the same for columns
+        self.row_sums: list[list[int]] = []
+        for line in grid:
+            sums = [0]
+            for char in line:
+                sums.append(sums[-1] + int(char))
+            self.row_sums.append(sums)
+        self.col_sums: list[list[int]] = []
+        for x in range(self.width):
+            sums = [0]
+            for line in grid:
+                sums.append(sums[-1] + int(line[x]))
+            self.col_sums.append(sums)
+
+    def neighbours(self, state: int) -> Iterable[tuple[int, int]]:
+        field, axis = divmod(state, 2)
+        row, col = divmod(field, self.width)
+        next_states = []
+        if axis == 0:
+            sums = self.col_sums[col]
+            # Moving up, the fields `row - steps` until `row - 1` are entered
+            for steps in range(self.min_move, min(self.max_move, row) + 1):
+                next_states.append((((row - steps) * self.width + col) * 2 + 1, sums[row] - sums[row - steps]))
+            # Moving down, the fields `row + 1` until `row + steps` are entered
+            for steps in range(self.min_move, min(self.max_move, self.height - 1 - row) + 1):
+                next_states.append((((row + steps) * self.width + col) * 2 + 1,
+                                    sums[row + steps + 1] - sums[row + 1]))
+        else:
+            sums = self.row_sums[row]
+            for steps in range(self.min_move, min(self.max_move, col) + 1):
+                next_states.append(((field - steps) * 2, sums[col] - sums[col - steps]))
+            for steps in range(self.min_move, min(self.max_move, self.width - 1 - col) + 1):
+                next_states.append(((field + steps) * 2, sums[col + steps + 1] - sums[col + 1]))
+        return next_states
+
+    def predecessors(self, state: int) -> Iterable[int]:
+        # A state is reached by moving along the other axis, so the moves of the same field with the other axis
+        # lead exactly to the predecessors, only with the axis flipped back.
+        return [prev_state ^ 1 for prev_state, _ in self.neighbours(state ^ 1)]
+
+
+class PipeRule(MoveRule):
+    """
+    Follows the pipes from day 10. `extra` is the direction the pipe is left in (`N`, `E`, `S` or `W`).
+    A move enters the next field and turns according to its pipe. Fields that can't be entered from that side
+    are dead ends without any next state. Each move costs 1.
+    """
+    states_per_field = 4
+    # Pipe characters mapped to the sides they connect
+    pipes = {"|": (N, S), "-": (E, W), "L": (N, E), "J": (N, W), "7": (S, W), "F": (E, S)}
+
+    def __init__(self, grid: list[str] | tuple[str, ...]):
+        super().__init__(grid)
+        # `turns[char][direction]` is the direction a pipe is left in, when moving into it in `direction`, or -1.
+        # Moving in a direction enters the pipe on the opposite side.
+        self.turns: dict[str, tuple[int, ...]] = {}
+        for char, (side1, side2) in self.pipes.items():
+            turn = [-1] * 4
+            turn[(side1 + 2) % 4], turn[(side2 + 2) % 4] = side2, side1
+            self.turns[char] = tuple(turn)
+        self.no_turn = (-1,) * 4
+
+    def neighbours(self, state: int) -> Iterable[tuple[int, int]]:
+        field, direction = divmod(state, 4)
+        row, col = divmod(field, self.width)
+        delta_row, delta_col = DELTAS[direction]
+        row, col = row + delta_row, col + delta_col
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            return []
+        next_direction = self.turns.get(self.grid[row][col], self.no_turn)[direction]
+        if next_direction < 0:
+            return []
+        return [((row * self.width + col) * 4 + next_direction, 1)]
+
+    def predecessors(self, state: int) -> Iterable[int]:
+        # Pipes are two-way, so the predecessor is found by walking backwards and reversing the direction again
+        field, direction = divmod(state, 4)
+        row, col = divmod(field, self.width)
+        turn = self.turns.get(self.grid[row][col])
+        if turn is None:
+            return []
+        # The direction the field was entered in is the one that is turned into `direction`
+        enter_direction = turn.index(direction) if direction in turn else -1
+        if enter_direction < 0:
+            return []
+        delta_row, delta_col = DELTAS[enter_direction]
+        prev_row, prev_col = row - delta_row, col - delta_col
+        if not (0 <= prev_row < self.height and 0 <= prev_col < self.width):
+            return []
+        return [self.encode(prev_row, prev_col, enter_direction)]
+
+
+def walk(rule: MoveRule, state: int) -> Generator[int]:
+    """
+    Follows the moves of `rule` from `state`, as long as there is exactly one next state, i.e. along a pipe.
+    Will NOT return `state` itself, but start with the first new state. Terminates on dead ends and forks.
+    """
+    while True:
+        next_states = list(rule.neighbours(state))
+        if len(next_states) != 1:
+            return
+        state = next_states[0][0]
+        yield state
+
+
+def bfs(rule: MoveRule, starts: Iterable[int], targets: Iterable[int] = ()) -> list[int]:
+    """
+    Breadth-first search, counting moves and ignoring their cost.
+
+    :param rule: `MoveRule` generating the next states.
+    :param starts: States to start from, with distance 0.
+    :param targets: If any of these states is reached, the search stops early.
+    :return: Amount of moves to reach each state, `UNREACHED` for states that were not reached.
+    """
+    distances = [UNREACHED] * rule.state_count
+    targets = set(targets)
+    queue = deque()
+    for state in starts:
+        distances[state] = 0
+        queue.append(state)
+    while queue:
+        state = queue.popleft()
+        if state in targets:
+            break
+        next_distance = distances[state] + 1
+        for next_state, _ in rule.neighbours(state):
+            if distances[next_state] == UNREACHED:
+                distances[next_state] = next_distance
+                queue.append(next_state)
+    return distances
+
+
+def zero_one_bfs(rule: MoveRule, starts: Iterable[int], targets: Iterable[int] = ()) -> list[int]:
+    """
+    Like `dijkstra()`, but only for rules where each move costs either 0 or 1.
+    Moves with cost 0 are explored next by putting them at the front of the queue, so no heap is needed.
+    """
+    distances = [UNREACHED] * rule.state_count
+    visited = bytearray(rule.state_count)
+    targets = set(targets)
+    queue = deque()
+    for state in starts:
+        distances[state] = 0
+        queue.append(state)
+    while queue:
+        state = queue.popleft()
+        if visited[state]:
+            continue
+        if state in targets:
+            break
+        visited[state] = 1
+        distance = distances[state]
+        for next_state, cost in rule.neighbours(state):
+            if distance + cost < distances[next_state]:
+                distances[next_state] = distance + cost
+                if cost == 0:
+                    queue.appendleft(next_state)
+                else:
+                    queue.append(next_state)
+    return distances
+
+
+def dijkstra(rule: MoveRule,
+             starts: Iterable[int],
+             targets: Iterable[int] = (),
+             heuristic: Callable[[int], int] | None = None) -> list[int]:
+    """
+    Dijkstra's algorithm with a priority queue. Outdated entries in the queue are not removed,
+    but skipped once they are popped for an already visited state.
+
+    :param rule: `MoveRule` generating the next states and their cost.
+    :param starts: States to start from, with distance 0.
+    :param targets: If any of these states is visited, the search stops early, as its distance is optimal.
+    :param heuristic: Turns the search into A*. Must never overestimate the remaining cost to the targets,
+        i.e. `MoveRule.manhattan_to()`, if every move costs at least 1 per step.
+    :return: Least cost to reach each state, `UNREACHED` for states that were not reached.
+        When stopped early, only the distance of the visited target is guaranteed to be optimal.
+    """
+    distances = [UNREACHED] * rule.state_count
+    visited = bytearray(rule.state_count)
+    targets = set(targets)
+    queue: list[tuple[int, int]] = []
+    for state in starts:
+        distances[state] = 0
+        queue.append((heuristic(state) if heuristic else 0, state))
+    heapq.heapify(queue)
+    while queue:
+        _, state = heapq.heappop(queue)
+        if visited[state]:
+            continue
+        if state in targets:
+            break
+        visited[state] = 1
+        distance = distances[state]
+        for next_state, cost in rule.neighbours(state):
+            next_distance = distance + cost
+            if next_distance < distances[next_state]:
+                distances[next_state] = next_distance
+                priority = next_distance + heuristic(next_state) if heuristic else next_distance
+                heapq.heappush(queue, (priority, next_state))
+    return distances
+
+
+def bidirectional_bfs(rule: MoveRule, starts: Iterable[int], targets: Iterable[int]) -> int | None:
+    """
+    Breadth-first search from both ends at once, always expanding the smaller frontier by one full layer.
+    Moves are counted, their cost is ignored. Uses `MoveRule.predecessors()` to search backwards from `targets`.
+
+    :return: Least amount of moves from any of `starts` to any of `targets`, `None` if they are not connected.
+    """
+    forward = [UNREACHED] * rule.state_count
+    backward = [UNREACHED] * rule.state_count
+    forward_frontier, backward_frontier = list(starts), list(targets)
+    for state in forward_frontier:
+        forward[state] = 0
+    for state in backward_frontier:
+        backward[state] = 0
+        if forward[state] == 0:
+            return 0
+
+    best = None
+    while forward_frontier and backward_frontier:
+        # Expand the smaller side, the other side's distances tell whether both searches met
+        if len(forward_frontier) <= len(backward_frontier):
+            own, other, frontier = forward, backward, forward_frontier
+            expand = lambda s: (next_state for next_state, _ in rule.neighbours(s))
+        else:
+            own, other, frontier = backward, forward, backward_frontier
+            expand = rule.predecessors
+        next_frontier = []
+        for state in frontier:
+            next_distance = own[state] + 1
+            for next_state in expand(state):
+                if own[next_state] != UNREACHED:
+                    continue
+                own[next_state] = next_distance
+                next_frontier.append(next_state)
+                if other[next_state] != UNREACHED:
+                    total = next_distance + other[next_state]
+                    best = total if best is None else min(best, total)
+        # Once the searches met, finishing the current layer is enough to be sure the shortest connection was found
+        if best is not None:
+            return best
+        if frontier is forward_frontier:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+    return None
+
+
+def benchmark(name: str, search: Callable[[], list[int] | int | None], repeat: int = 3) -> float:
+    """
+    Runs `search` `repeat` times and prints the fastest run, along with the reached states per second,
+    if `search` returns a distances list.
+
+    :return: Fastest run in seconds.
+    """
+    times = []
+    result = None
+    for _ in range(repeat):
+        start_time = time.perf_counter_ns()
+        result = search()
+        times.append((time.perf_counter_ns() - start_time) / 10 ** 9)
+    best = min(times)
+    if isinstance(result, list):
+        reached = sum(1 for distance in result if distance != UNREACHED)
+        print(f"{name}: {best * 1000:.1f} ms ({reached / best:,.0f} states/s)")
+    else:
+        print(f"{name}: {best * 1000:.1f} ms (result {result})")
+    return best
+
+
+def main():
+    with open(os.path.join(os.path.dirname(__file__), "day17.txt")) as f:
+        grid = tuple(line.strip() for line in f.readlines())
+
+    height, width = len(grid), len(grid[0])
+    step_rule = StepRule(grid, cost=int)
+    start, target = step_rule.encode(0, 0), step_rule.encode(height - 1, width - 1)
+    benchmark("BFS (steps)", lambda: bfs(step_rule, [start]))
+    benchmark("Bidirectional BFS (steps)", lambda: bidirectional_bfs(step_rule, [start], [target]))
+    benchmark("0-1 BFS (steps, even digits are free)",
+              lambda: zero_one_bfs(StepRule(grid, cost=lambda char: int(char) % 2), [start]))
+    benchmark("Dijkstra (steps)", lambda: dijkstra(step_rule, [start]))
+
+    for min_move, max_move in ((1, 3), (4, 10)):
+        rule = CrucibleRule(grid, min_move, max_move)
+        starts, targets = rule.field_states(0, 0), rule.field_states(height - 1, width - 1)
+        benchmark(f"Dijkstra (crucible {min_move}-{max_move})", lambda: dijkstra(rule, starts, targets))
+        benchmark(f"A* (crucible {min_move}-{max_move})",
+                  lambda: dijkstra(rule, starts, targets, rule.manhattan_to(height - 1, width - 1)))
+
+
+if __name__ == '__main__':
+    main()
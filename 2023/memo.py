@@ -0,0 +1,200 @@
+"""
+Bounded replacement for `functools.cache`, shared by the solutions of this year.
+
+`functools.cache` never forgets anything, so caches keyed on whole grids grow for as long as a script runs.
+`memoize()` evicts entries once a cache holds `maxsize` entries or `max_bytes` (estimated) bytes,
+either the least recently used (`"lru"`) or the least frequently used (`"lfu"`) entry first.
+Hits, misses and evictions are counted per cache and can be printed per function with `print_stats()`.
+
+It lives next to the solutions like `gridpath`, so they import it without any `sys.path` setup.
+"""
+
+import functools
+import hashlib
+import sys
+import weakref
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from typing import Literal
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    # Entries and estimated bytes currently held by the cache(s) of the function
+    size: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses
+        return self.hits / calls if calls else 0.0
+
+
+# Every live cache, by the stats it keeps. Functions that are memoized several times (i.e. closures created per call)
+# have one cache each, which is dropped along with the closure.
+_caches: dict[int, tuple[str, MemoStats]] = {}
+# Hits, misses and evictions of the caches that were already dropped, by module and qualified function name
+_retired: dict[str, MemoStats] = {}
+
+
+def _retire(cache_id: int):
+    """ Keeps the counters of a dropped cache. Its entries are gone, so its size doesn't count anymore. """
+    name, cache_stats = _caches.pop(cache_id)
+    retired = _retired.setdefault(name, MemoStats())
+    retired.hits += cache_stats.hits
+    retired.misses += cache_stats.misses
+    retired.evictions += cache_stats.evictions
+
+
+def args_key(args: tuple, kwargs: dict) -> Hashable:
+    """ Default key: the arguments themselves, like `functools.cache`. """
+    if kwargs:
+        return args + tuple(sorted(kwargs.items()))
+    return args
+
+
+def hashed_key(args: tuple, kwargs: dict) -> Hashable:
+    """
+    Replaces the arguments by a 16-byte digest of their `repr()`. Meant for huge arguments like whole grids,
+    so the cache doesn't keep a copy of each of them alive. Computing the digest still has to look at all arguments.
+    """
+    return hashlib.blake2b(repr(args_key(args, kwargs)).encode(), digest_size=16).digest()
+
+
+def estimate_size(obj: object) -> int:
+    """ Estimated bytes of `obj`, including the items of (nested) tuples, lists, sets and dicts. """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum(estimate_size(item) for item in obj)
+    elif isinstance(obj, dict):
+        size += sum(estimate_size(key) + estimate_size(value) for key, value in obj.items())
+    return size
+
+
+def memoize(maxsize: int | None = 4096,
+            max_bytes: int | None = None,
+            policy: Literal["lru", "lfu"] = "lru",
+            key: Callable[[tuple, dict], Hashable] = args_key) -> Callable[[Callable], Callable]:
+    """
+    Decorator caching the results of a function, like `functools.lru_cache`, but with more ways to limit it.
+
+    :param maxsize: Maximum amount of cached entries, `None` for no limit.
+    :param max_bytes: Maximum estimated bytes of all cached keys and results, `None` for no limit.
+    :param policy: Which entry is evicted first, the least recently used (`"lru"`) or least frequently used (`"lfu"`).
+        Ties of `"lfu"` are evicted least recently used first.
+    :param key: Builds the cache key from `(args, kwargs)`, i.e. `args_key()` or `hashed_key()`.
+    :return: Decorator. The decorated function offers `cache_info()` and `cache_clear()`.
+    """
+    if policy not in ("lru", "lfu"):
+        raise ValueError(f"Unknown eviction policy {policy!r}, use 'lru' or 'lfu'")
+
+    def decorator(func: Callable) -> Callable:
+        stats = MemoStats()
+        # Results and estimated bytes by key, ordered from least to most recently used
+        entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        # LFU only: usage count per key and keys per usage count (again ordered by recent use)
+        counts: dict[Hashable, int] = {}
+        keys_by_count: defaultdict[int, OrderedDict[Hashable, None]] = defaultdict(OrderedDict)
+        total_bytes = 0
+
+        def touch(cache_key: Hashable):
+            if policy == "lru":
+                entries.move_to_end(cache_key)
+                return
+            count = counts[cache_key]
+            del keys_by_count[count][cache_key]
+            if not keys_by_count[count]:
+                del keys_by_count[count]
+            counts[cache_key] = count + 1
+            keys_by_count[count + 1][cache_key] = None
+
+        def evict():
+            nonlocal total_bytes
+            if policy == "lru":
+                _, (_, entry_bytes) = entries.popitem(last=False)
+            else:
+                lowest_count = min(keys_by_count)
+                cache_key, _ = keys_by_count[lowest_count].popitem(last=False)
+                if not keys_by_count[lowest_count]:
+                    del keys_by_count[lowest_count]
+                del counts[cache_key]
+                _, entry_bytes = entries.pop(cache_key)
+            total_bytes -= entry_bytes
+            stats.evictions += 1
+            stats.size -= 1
+            stats.bytes -= entry_bytes
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal total_bytes
+            cache_key = key(args, kwargs)
+            entry = entries.get(cache_key)
+            if entry is not None:
+                stats.hits += 1
+                touch(cache_key)
+                return entry[0]
+
+            stats.misses += 1
+            result = func(*args, **kwargs)
+            # A recursive call may have cached the same key already
+            if cache_key in entries:
+                return result
+            entry_bytes = estimate_size(cache_key) + estimate_size(result) if max_bytes is not None else 0
+            entries[cache_key] = (result, entry_bytes)
+            if policy == "lfu":
+                counts[cache_key] = 1
+                keys_by_count[1][cache_key] = None
+            total_bytes += entry_bytes
+            stats.size += 1
+            stats.bytes += entry_bytes
+            while entries and ((maxsize is not None and len(entries) > maxsize)
+                               or (max_bytes is not None and total_bytes > max_bytes)):
+                evict()
+            return result
+
+        def cache_info() -> MemoStats:
+            """ :return: Counters of this cache only. """
+            return stats
+
+        def cache_clear():
+            nonlocal total_bytes
+            stats.size -= len(entries)
+            stats.bytes -= total_bytes
+            entries.clear()
+            counts.clear()
+            keys_by_count.clear()
+            total_bytes = 0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _caches[id(stats)] = (f"{func.__module__}.{func.__qualname__}", stats)
+        weakref.finalize(wrapper, _retire, id(stats))
+        return wrapper
+
+    return decorator
+
+
+def stats() -> dict[str, MemoStats]:
+    """
+    :return: Counters of all memoized functions, by module and qualified function name. Size and bytes are the sums
+        over the live caches of a function, the other counters include the caches that were already dropped.
+    """
+    totals = {name: MemoStats(retired.hits, retired.misses, retired.evictions) for name, retired in _retired.items()}
+    for name, cache_stats in _caches.values():
+        total = totals.setdefault(name, MemoStats())
+        total.hits += cache_stats.hits
+        total.misses += cache_stats.misses
+        total.evictions += cache_stats.evictions
+        total.size += cache_stats.size
+        total.bytes += cache_stats.bytes
+    return totals
+
+
+def print_stats():
+    for name, func_stats in sorted(stats().items()):
+        print(f"{name}: {func_stats.hits} hits, {func_stats.misses} misses ({func_stats.hit_rate:.1%} hit rate), "
+              f"{func_stats.evictions} evictions, {func_stats.size} entries, {func_stats.bytes} bytes")
@@ -1,9 +1,6 @@
 import time
 from typing import Iterable
 
-with open(f'{__file__.split(".")[0]}.txt') as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 
 def input_to_direction(line: str) -> int:
     """ Return a tuple of direction letter and the amount of steps to take (direction already considered as sign) """
@@ -36,19 +33,33 @@ def dial_wheel(moves: Iterable[int], dial_pos=50, max_number=99) -> Iterable[tup
         yield dial_pos, wraps
 
 
-if __name__ == "__main__":
-    start_time = time.perf_counter_ns()
+def parse(text: str) -> list[int]:
+    return [input_to_direction(line) for line in text.splitlines() if line.strip()]
 
-    dial_inputs = list(map(input_to_direction, input_lines))
-    # Part 1
+
+def part1(dial_inputs: list[int]) -> int:
     # Go through the moves and store the position, if it is 0.
     # Then count the length of that list.
     dial_positions = [x for x, _ in dial_wheel(dial_inputs) if x == 0]
-    print(f"Part 1: {len(dial_positions)}")
+    return len(dial_positions)
 
-    # Part 2
+
+def part2(dial_inputs: list[int]) -> int:
     dial_wraps = [wraps for _, wraps in dial_wheel(dial_inputs)]
-    print(f"Part 2: {sum(dial_wraps)}")
+    return sum(dial_wraps)
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt') as f:
+        input_text = f.read()
+    start_time = time.perf_counter_ns()
+
+    dial_inputs = parse(input_text)
+    # Part 1
+    print(f"Part 1: {part1(dial_inputs)}")
+
+    # Part 2
+    print(f"Part 2: {part2(dial_inputs)}")
 
     end_time = time.perf_counter_ns()
     print(f"Execution time: {(end_time - start_time) / 1_000_000} ms")
@@ -1,15 +1,11 @@
 import itertools
 import math
+import sys
 import time
 from typing import Iterable
 
 import numba
-
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
-ranges = [r.split("-") for r in input_lines[0].split(",")]
-ranges = [(int(x), int(y)) for x, y in ranges]
+import numpy as np
 
 
 @numba.njit
@@ -55,37 +51,223 @@ def id_repeats_twice(n: int) -> bool:
     return repeated_number * multiplier == n
 
 
+def repunit(length: int, period: int) -> int:
+    """ Multiplier repeating a number of `period` digits to `length` digits, i.e. 10101 for length 6 and period 2. """
+    return sum(10 ** m for m in range(0, length, period))
+
+
+def prime_factors(n: int) -> list[int]:
+    factors = []
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            factors.append(factor)
+            while n % factor == 0:
+                n //= factor
+        factor += 1
+    if n > 1:
+        factors.append(n)
+    return factors
+
+
+def length_slices(start: int, end: int) -> Iterable[tuple[int, int, int]]:
+    """
+    Splits the range (inclusive) into parts, where all numbers have the same length.
+
+    :return: `(length, lo, hi)` of each part.
+    """
+    length = 1
+    while 10 ** length <= start:
+        length += 1
+    while 10 ** (length - 1) <= end:
+        lo, hi = max(start, 10 ** (length - 1)), min(end, 10 ** length - 1)
+        if lo <= hi:
+            yield length, lo, hi
+        length += 1
+
+
+def base_range(lo: int, hi: int, length: int, period: int) -> tuple[int, int, int]:
+    """
+    Every number of `length` digits repeating `period` digits is `base * repunit`, with a base of `period` digits.
+
+    :return: Multiplier (repunit) and the first and last base (inclusive), whose repetition lies within `[lo, hi]`.
+        The first base is bigger than the last one, if there are none.
+    """
+    multiplier = repunit(length, period)
+    first_base = max(-(-lo // multiplier), 10 ** (period - 1))
+    last_base = min(hi // multiplier, 10 ** period - 1)
+    return multiplier, first_base, last_base
+
+
+def period_factors(length: int, only_twice: bool) -> list[int]:
+    """
+    Every repeating number of `length` digits also repeats `length // factor` digits for one of these factors,
+    which are the prime factors of the length. Repeating twice only leaves the factor 2.
+    """
+    if only_twice:
+        return [2] if length % 2 == 0 else []
+    return prime_factors(length)
+
+
+def repeating_ids(start: int, end: int, only_twice: bool = False) -> Iterable[int]:
+    """
+    Builds the repeating numbers of the range (inclusive) right away, instead of checking every number in it.
+    A number like 222222 repeats with several periods (2, 22 and 222), so they are deduplicated per length.
+
+    :return: Repeating numbers in ascending order.
+    """
+    for length, lo, hi in length_slices(start, end):
+        numbers = set()
+        for period in (length // factor for factor in period_factors(length, only_twice)):
+            multiplier, first_base, last_base = base_range(lo, hi, length, period)
+            numbers.update(base * multiplier for base in range(first_base, last_base + 1))
+        yield from sorted(numbers)
+
+
+def sum_repeating_ids(start: int, end: int, only_twice: bool = False) -> int:
+    """
+    Sums the repeating numbers of the range (inclusive), without building them. Per length and period, the numbers are
+    `base * repunit` for consecutive bases, so their sum is the repunit times an arithmetic series of the bases.
+
+    Numbers repeating several periods are deduplicated by inclusion-exclusion: Numbers repeating both `length / p` and
+    `length / q` digits repeat `length / (p * q)` digits, so these are added once too often and subtracted again.
+    The runtime only depends on the amount of lengths and prime factors, not on the width of the range.
+    """
+    total = 0
+    for length, lo, hi in length_slices(start, end):
+        factors = period_factors(length, only_twice)
+        for combination_size in range(1, len(factors) + 1):
+            sign = 1 if combination_size % 2 else -1
+            for combination in itertools.combinations(factors, combination_size):
+                period = length // math.prod(combination)
+                multiplier, first_base, last_base = base_range(lo, hi, length, period)
+                if first_base <= last_base:
+                    total += sign * multiplier * (first_base + last_base) * (last_base - first_base + 1) // 2
+    return total
+
+
 def find_invalid_ids(ranges_list: list[tuple[int, int]], only_twice: bool = False) -> Iterable[int]:
     """
-    Takes a list of tuples, each having a start and end number (inclusive) and checks each number within them.
+    Takes a list of tuples, each having a start and end number (inclusive).
     A number `n` of these ranges is returned, if it consists of a number, cleanly repeated throughout `n`.
     """
-    is_repeating = id_repeats_twice if only_twice else id_repeats
-    ranges = (range(x, y + 1) for x, y in ranges_list)
-    for n in itertools.chain(*ranges):
-        if is_repeating(n):
-            yield n
+    for start, end in ranges_list:
+        yield from repeating_ids(start, end, only_twice)
 
 
 def check_range(start: int, end: int, only_twice: bool = False) -> tuple[int, ...]:
     """
-    Takes a start and end number (inclusive) and checks each number within them.
+    Takes a start and end number (inclusive) and checks each number within them. Much slower than `repeating_ids()`,
+    as it goes through the whole range, but useful to verify it.
     A number `n` of this range is returned, if it consists of a number, cleanly repeated throughout `n`.
     """
     is_repeating = id_repeats_twice if only_twice else id_repeats
     return tuple(n for n in range(start, end + 1) if is_repeating(n))
 
 
+def _scan_chunks(starts: np.ndarray, ends: np.ndarray, only_twice: bool) -> int:
+    # Each chunk is a (part of a) range, handed to the cores by `prange`. The sum is reduced by Numba itself.
+    total = 0
+    for chunk in numba.prange(len(starts)):
+        for n in range(starts[chunk], ends[chunk] + 1):
+            if id_repeats_twice(n) if only_twice else id_repeats(n):
+                total += n
+    return total
+
+
+# Compiled scanner, per `cache` option
+_scanners: dict[bool, numba.core.registry.CPUDispatcher] = {}
+
+
+def compile_scanner(cache: bool = True) -> numba.core.registry.CPUDispatcher:
+    """
+    :param cache: Store the compiled machine code next to this file (in `__pycache__`), so later runs skip the JIT.
+    :return: Parallel version of `_scan_chunks()`. It is compiled on its first call.
+    """
+    if cache not in _scanners:
+        _scanners[cache] = numba.njit(parallel=True, cache=cache)(_scan_chunks)
+    return _scanners[cache]
+
+
+def split_into_chunks(ranges_list: list[tuple[int, int]], chunk_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Splits the ranges (inclusive) into chunks of at most `chunk_size` numbers, so a wide range doesn't keep one core
+    busy, while the others are done already.
+
+    :return: Start and end (inclusive) of each chunk.
+    """
+    starts, ends = [], []
+    for start, end in ranges_list:
+        for chunk_start in range(start, end + 1, chunk_size):
+            starts.append(chunk_start)
+            ends.append(min(chunk_start + chunk_size - 1, end))
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def scan_invalid_ids(ranges_list: list[tuple[int, int]],
+                     only_twice: bool = False,
+                     chunk_size: int | None = None,
+                     cache: bool = True) -> int:
+    """
+    Checks every number of the ranges like `find_invalid_ids()`, but entirely in compiled code and on all cores.
+    Only works for numbers fitting into 64 bit integers, i.e. up to 18 digits.
+
+    :param chunk_size: Numbers per chunk, by default enough for 16 chunks per thread.
+    :return: Sum of the repeating numbers.
+    """
+    if chunk_size is None:
+        total_numbers = sum(end - start + 1 for start, end in ranges_list)
+        chunk_size = max(1, total_numbers // (16 * numba.get_num_threads()))
+    starts, ends = split_into_chunks(ranges_list, chunk_size)
+    return int(compile_scanner(cache)(starts, ends, only_twice))
+
+
+def benchmark_scanner(ranges_list: list[tuple[int, int]], repeat: int = 3, cache: bool = True):
+    """ Prints the time of the first call (JIT or loading the cache) and the numbers scanned per second after it. """
+    total_numbers = sum(end - start + 1 for start, end in ranges_list)
+    for only_twice in (True, False):
+        start_time = time.perf_counter_ns()
+        total = scan_invalid_ids(ranges_list, only_twice, cache=cache)
+        first_call = (time.perf_counter_ns() - start_time) / 10 ** 9
+        timings = []
+        for _ in range(repeat):
+            start_time = time.perf_counter_ns()
+            scan_invalid_ids(ranges_list, only_twice, cache=cache)
+            timings.append((time.perf_counter_ns() - start_time) / 10 ** 9)
+        expected = sum(sum_repeating_ids(start, end, only_twice) for start, end in ranges_list)
+        print(f"Scanner ({'twice' if only_twice else 'any'}): {total} ({'ok' if total == expected else 'WRONG'}), "
+              f"first call {first_call:.3f} s, {total_numbers / min(timings):,.0f} numbers/s "
+              f"on {numba.get_num_threads()} threads")
+
+
+def parse(text: str) -> list[tuple[int, int]]:
+    ranges = [r.split("-") for r in text.strip().split(",")]
+    return [(int(x), int(y)) for x, y in ranges]
+
+
+def part1(ranges: list[tuple[int, int]]) -> int:
+    return sum(sum_repeating_ids(start, end, only_twice=True) for start, end in ranges)
+
+
+def part2(ranges: list[tuple[int, int]]) -> int:
+    return sum(sum_repeating_ids(start, end, only_twice=False) for start, end in ranges)
+
+
 if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        input_text = f.read()
     start_time = time.perf_counter_ns()
 
+    ranges = parse(input_text)
     # Part 1
-    invalid_ids = list(find_invalid_ids(ranges, only_twice=True))
-    print(f"Part 1: {sum(invalid_ids)}")
+    print(f"Part 1: {part1(ranges)}")
 
     # Part 2
-    repeating_ids = find_invalid_ids(ranges, only_twice=False)
-    print(f"Part 2: {sum(repeating_ids)}")
+    print(f"Part 2: {part2(ranges)}")
 
     end_time = time.perf_counter_ns()
     print(f"Execution time: {(end_time - start_time) / 1_000_000} ms")
+
+    # Checking every number, only to compare the scanner's throughput
+    if "--benchmark-scanner" in sys.argv:
+        benchmark_scanner(ranges)
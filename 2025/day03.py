@@ -1,8 +1,5 @@
 import time
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 
 def find_max(row: list[int]) -> tuple[int, int]:
     """
@@ -29,17 +26,31 @@ def highest_joltage(row: list[int], enabled_batteries: int) -> int:
     return joltage + highest_joltage(row[max_idx + 1:], enabled_batteries - 1)
 
 
+def parse(text: str) -> list[list[int]]:
+    return [[int(j) for j in row.strip()] for row in text.splitlines() if row.strip()]
+
+
+def part1(batteries: list[list[int]]) -> int:
+    joltages = [highest_joltage(row, enabled_batteries=2) for row in batteries]
+    return sum(joltages)
+
+
+def part2(batteries: list[list[int]]) -> int:
+    big_joltages = [highest_joltage(row, enabled_batteries=12) for row in batteries]
+    return sum(big_joltages)
+
+
 if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        input_text = f.read()
     start_time = time.perf_counter_ns()
 
-    batteries = [[int(j) for j in row] for row in input_lines]
+    batteries = parse(input_text)
     # Part 1
-    joltages = [highest_joltage(row, enabled_batteries=2) for row in batteries]
-    print(f"Part 1: {sum(joltages)}")
+    print(f"Part 1: {part1(batteries)}")
 
     # Part 2
-    big_joltages = [highest_joltage(row, enabled_batteries=12) for row in batteries]
-    print(f"Part 2: {sum(big_joltages)}")
+    print(f"Part 2: {part2(batteries)}")
 
     end_time = time.perf_counter_ns()
     print(f"Execution time: {(end_time - start_time) / 1_000_000} ms")
@@ -3,8 +3,7 @@ from collections import Counter
 import time
 from typing import Iterable
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    input_lines = [l.strip() for l in f.readlines()]
+import numpy as np
 
 
 def neighbor_idxs(idx: int, row_len: int, total_len: int) -> tuple[int, ...]:
@@ -31,23 +30,91 @@ def available_rolls(inventory: Iterable[int], row_len: int) -> list[int]:
     return available_rolls
 
 
-if __name__ == "__main__":
-    start_time = time.perf_counter_ns()
+def neighbor_counts(inventory: list[bool], row_len: int) -> list[int]:
+    """ :return: Amount of neighboring paper rolls for each field. Each roll announces itself to its neighbors once. """
+    counts = [0] * len(inventory)
+    for idx, is_paper in enumerate(inventory):
+        if is_paper:
+            for neighbor in neighbor_idxs(idx, row_len, len(inventory)):
+                counts[neighbor] += 1
+    return counts
 
-    row_len = len(input_lines[0])
 
-    # Part 1
-    inventory = [s == "@" for s in "".join(input_lines)]
-    print(f"Part 1: {len(available_rolls(inventory, row_len))}")
+def count_available_numpy(inventory: list[bool], row_len: int) -> int:
+    """
+    Same as `len(available_rolls())`, but counts the neighbors of all fields at once: The grid is padded by one empty
+    field on each side, then the 8 shifted copies of it are summed up (a 3x3 convolution, without its center).
+    """
+    grid = np.pad(np.array(inventory, dtype=np.uint8).reshape(-1, row_len), 1)
+    height, width = grid.shape
+    counts = sum(grid[1 + dr:height - 1 + dr, 1 + dc:width - 1 + dc]
+                 for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc)
+    return int(np.count_nonzero(grid[1:-1, 1:-1] & (counts < 4)))
 
-    # Part 2
-    inventory = [s == "@" for s in "".join(input_lines)]
+
+def peel_rolls(inventory: list[bool], row_len: int) -> int:
+    """
+    Removes available rolls until none are left, without going through the whole grid again after each round.
+    The neighbor counts are calculated once. Removing a roll only decreases the counts of its neighbors,
+    and a roll becomes available right when its count drops from 4 to 3, so it is put on the worklist then.
+
+    :return: Amount of removed rolls.
+    """
+    counts = neighbor_counts(inventory, row_len)
+    present = bytearray(inventory)
+    worklist = [idx for idx, is_paper in enumerate(inventory) if is_paper and counts[idx] < 4]
+    removed_rolls = 0
+    while worklist:
+        idx = worklist.pop()
+        present[idx] = False
+        removed_rolls += 1
+        for neighbor in neighbor_idxs(idx, row_len, len(inventory)):
+            if present[neighbor]:
+                counts[neighbor] -= 1
+                if counts[neighbor] == 3:
+                    worklist.append(neighbor)
+    return removed_rolls
+
+
+def parse(text: str) -> tuple[list[bool], int]:
+    """ :return: Flat inventory (`True` for paper rolls) and the length of each row. """
+    input_lines = [line.strip() for line in text.splitlines() if line.strip()]
+    return [s == "@" for s in "".join(input_lines)], len(input_lines[0])
+
+
+def part1(model: tuple[list[bool], int]) -> int:
+    inventory, row_len = model
+    return count_available_numpy(inventory, row_len)
+
+
+def part2(model: tuple[list[bool], int]) -> int:
+    inventory, row_len = model
+    return peel_rolls(inventory, row_len)
+
+
+def part2_rounds(model: tuple[list[bool], int]) -> int:
+    """ Original approach, finding all available rolls again after each round of removals. """
+    # Rolls are removed from the inventory, so work on a copy
+    inventory, row_len = list(model[0]), model[1]
     removed_rolls = 0
     while rolls := available_rolls(inventory, row_len):
         for idx in rolls:
             inventory[idx] = False
         removed_rolls += len(rolls)
-    print(f"Part 2: {removed_rolls}")
+    return removed_rolls
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        input_text = f.read()
+    start_time = time.perf_counter_ns()
+
+    model = parse(input_text)
+    # Part 1
+    print(f"Part 1: {part1(model)}")
+
+    # Part 2
+    print(f"Part 2: {part2(model)}")
 
     end_time = time.perf_counter_ns()
     print(f"Execution time: {(end_time - start_time) / 1_000_000} ms")
@@ -1,10 +1,10 @@
+import bisect
 import itertools
 import time
 from collections.abc import Generator
-from typing import Iterable
+from typing import Iterable, TextIO
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    input_lines = [l.strip() for l in f.readlines()]
+import numpy as np
 
 
 def line_to_range(line: str) -> range:
@@ -30,27 +30,106 @@ def compact_ranges(ranges: Iterable[range]) -> Generator[range]:
     yield range(current_start, current_stop)
 
 
-if __name__ == "__main__":
-    start_time = time.perf_counter_ns()
+class RangeSet:
+    """
+    Set of IDs, given as ranges. The ranges are compacted first, so they are sorted and disjoint.
+    That way, the only range that can contain an ID is the last one starting at or before it, found by binary search.
+    """
+    ranges: list[range]
+    starts: list[int]
+    stops: list[int]
+
+    def __init__(self, ranges: Iterable[range]):
+        self.ranges = list(compact_ranges(ranges))
+        self.starts = [r.start for r in self.ranges]
+        self.stops = [r.stop for r in self.ranges]
+        self.starts_array = np.array(self.starts, dtype=np.int64)
+        self.stops_array = np.array(self.stops, dtype=np.int64)
+
+    def __contains__(self, num: int) -> bool:
+        idx = bisect.bisect_right(self.starts, num) - 1
+        return idx >= 0 and num < self.stops[idx]
+
+    def size(self) -> int:
+        """ :return: Amount of IDs in the set. """
+        return sum(map(len, self.ranges))
+
+    def contains_all(self, nums: np.ndarray) -> np.ndarray:
+        """ Same as `__contains__`, for a whole array of IDs at once. :return: Boolean array. """
+        idxs = np.searchsorted(self.starts_array, nums, side="right") - 1
+        # IDs before the first range get index -1, which has to be clipped to look up the stops
+        return (idxs >= 0) & (nums < self.stops_array[np.maximum(idxs, 0)])
+
+    def count(self, nums: np.ndarray) -> int:
+        return int(np.count_nonzero(self.contains_all(nums)))
+
+
+def read_id_chunks(file: TextIO, chunk_size: int = 1 << 24) -> Generator[np.ndarray]:
+    """
+    Reads whitespace-separated IDs from `file` in chunks of `chunk_size` characters, so millions of IDs don't have to be
+    loaded as Python `int`s at once. An ID cut off at the end of a chunk is completed with the next one.
+
+    :return: Array of the IDs in each chunk.
+    """
+    remainder = ""
+    while chunk := file.read(chunk_size):
+        chunk = remainder + chunk
+        ids = chunk.split()
+        # Unless the chunk ends with whitespace (of any kind), its last ID may continue in the next chunk
+        remainder = ids.pop() if ids and not chunk[-1].isspace() else ""
+        if ids:
+            yield np.array(ids, dtype=np.int64)
+    if remainder:
+        yield np.array([remainder], dtype=np.int64)
+
 
-    iter_lines = iter(input_lines)
+def count_fresh_in_file(file: TextIO, chunk_size: int = 1 << 24) -> int:
+    """
+    Part 1 for inputs too big to be parsed at once: Reads the fresh ranges line by line until the blank line,
+    then counts the fresh ingredients chunk by chunk, see `read_id_chunks()`.
+    """
+    fresh_lines = itertools.takewhile(lambda s: s.strip(), iter(file.readline, ""))
+    fresh_ids = RangeSet(map(line_to_range, fresh_lines))
+    return sum(fresh_ids.count(ids) for ids in read_id_chunks(file, chunk_size))
+
+
+def parse(text: str) -> tuple[RangeSet, list[int]]:
+    """ :return: Fresh IDs and the ingredient IDs. """
+    iter_lines = (line.strip() for line in text.splitlines())
     # Advance iterator and take lines until the blank line
     fresh_lines = itertools.takewhile(lambda s: s.strip(), iter_lines)
     fresh_ranges = map(line_to_range, fresh_lines)
     # Summarize Ranges by combining seamlessly connected or overlapping ranges
-    summarized_ranges = list(compact_ranges(fresh_ranges))
+    fresh_ids = RangeSet(fresh_ranges)
 
     # Continue Iterator `iter_lines`, which is currently at the blank line separating the fresh ranges from ingredients.
     # All remaining lines are ingredient IDs.
-    ingredients = list(map(int, iter_lines))
+    ingredients = list(map(int, filter(None, iter_lines)))
+    return fresh_ids, ingredients
+
+
+def part1(model: tuple[RangeSet, list[int]]) -> int:
+    fresh_ids, ingredients = model
+    # Look up all ingredient IDs at once
+    return fresh_ids.count(np.array(ingredients, dtype=np.int64))
+
+
+def part2(model: tuple[RangeSet, list[int]]) -> int:
+    fresh_ids, _ = model
+    return fresh_ids.size()
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        input_text = f.read()
+    start_time = time.perf_counter_ns()
 
+    model = parse(input_text)
     # Part 1
-    # Count by summing up 1 for ingredient IDs, which are present in any of the ranges
-    fresh_ings = sum(1 for ing_id in ingredients if any(ing_id in fresh_ids for fresh_ids in summarized_ranges))
-    print(f"Part 1: {fresh_ings}")
+    print(f"Part 1: {part1(model)}")
 
     # Part 2
-    print(f"Part 2: {sum(map(len, summarized_ranges))}")
+    print(f"Part 2: {part2(model)}")
 
     end_time = time.perf_counter_ns()
     print(f"Execution time: {(end_time - start_time) / 1_000_000} ms")
@@ -1,12 +1,9 @@
 import itertools as it
+import mmap
 from functools import reduce
 from operator import mul, add
 from typing import Iterable
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
-    input_lines = [l for l in f.readlines()]
-
 
 def split_line(line: str) -> tuple[str, ...]:
     return tuple(s for s in line.split() if s)
@@ -35,17 +32,98 @@ def read_col_vertically(col_nums: Iterable[str]) -> Iterable[int]:
     return (int("".join(col_chars).strip()) for col_chars in zip(*col_nums))
 
 
-if __name__ == "__main__":
-    num_lines = input_lines[:-1]
-    op_line = input_lines[-1]
+class Worksheet:
+    """
+    Solves all problems of the worksheet while it is read row by row, without keeping the rows.
+    The operator line comes first, as its operators mark where each column starts.
+    Each column then keeps a running result, updated with the number of each row (part 1),
+    and the digits read so far for each character position, top to bottom (part 2).
+    Memory only depends on the amount and width of the columns, not on the amount of rows.
+    """
+    operators: str
+    col_idxs: tuple[int, ...]
+    horizontal: list[int]
+    # Per column and character position, the number made of the digits so far, `-1` if there was no digit yet
+    vertical_digits: list[list[int]]
 
-    # Part 1
+    def __init__(self, op_line: str):
+        self.col_idxs = tuple(i for i, char in enumerate(op_line) if char in "+*")
+        self.operators = op_line.replace(" ", "").strip()
+        # Start with the neutral element of each operator
+        self.horizontal = [0 if op == "+" else 1 for op in self.operators]
+        self.vertical_digits = [[] for _ in self.operators]
+
+    def add_row(self, row: str):
+        for col, (op, num) in enumerate(zip(self.operators, row.split())):
+            self.horizontal[col] = self.horizontal[col] + int(num) if op == "+" else self.horizontal[col] * int(num)
+
+        # The last column has no next operator, so it goes on until the end of the row
+        col_ends = it.chain((i - 1 for i in self.col_idxs[1:]), [len(row)])
+        for digits, start, end in zip(self.vertical_digits, self.col_idxs, col_ends):
+            for pos, char in enumerate(row[start:end]):
+                if pos == len(digits):
+                    digits.append(-1)
+                if char.isdigit():
+                    digits[pos] = int(char) if digits[pos] < 0 else digits[pos] * 10 + int(char)
+
+    def horizontal_results(self) -> list[int]:
+        return self.horizontal
+
+    def vertical_results(self) -> list[int]:
+        # Positions without any digit are the separators between the columns, not numbers
+        return [solve_problem((num for num in digits if num >= 0), op)
+                for digits, op in zip(self.vertical_digits, self.operators)]
+
+
+def stream_worksheet(path: str) -> Worksheet:
+    """
+    Reads the worksheet at `path` through a memory map, so the file is never loaded as a whole:
+    The operator line is found from the end first, then the number rows are handed to the `Worksheet` one by one.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as sheet:
+        op_end = len(sheet)
+        while op_end > 0 and sheet[op_end - 1:op_end] in (b"\n", b"\r", b" "):
+            op_end -= 1
+        op_start = sheet.rfind(b"\n", 0, op_end) + 1
+        worksheet = Worksheet(sheet[op_start:op_end].decode())
+        row_start = 0
+        while row_start < op_start:
+            row_end = sheet.find(b"\n", row_start, op_start)
+            worksheet.add_row(sheet[row_start:row_end].decode().rstrip("\r"))
+            row_start = row_end + 1
+    return worksheet
+
+
+def parse(text: str) -> Worksheet:
+    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
+    *num_lines, op_line = text.rstrip("\n").splitlines()
+    worksheet = Worksheet(op_line)
+    for line in num_lines:
+        worksheet.add_row(line)
+    return worksheet
+
+
+def part1(worksheet: Worksheet) -> int:
+    return sum(worksheet.horizontal_results())
+
+
+def part2(worksheet: Worksheet) -> int:
+    return sum(worksheet.vertical_results())
+
+
+def part1_transposed(input_lines: list[str]) -> int:
+    """ Original approach, holding the whole worksheet and transposing it. Only used to verify `Worksheet`. """
     segmented_lines = (split_line(line) for line in input_lines)
     input_cols = list(zip(*segmented_lines))
     results = [solve_problem(col[:-1], col[-1]) for col in input_cols]
-    print(f"Part 1: {sum(results)}")
+    return sum(results)
+
+
+def part2_transposed(input_lines: list[str]) -> int:
+    """ Original approach, holding the whole worksheet and transposing it. Only used to verify `Worksheet`. """
+    num_lines = input_lines[:-1]
+    op_line = input_lines[-1]
 
-    # Part 2
     col_idxs = tuple(i for i, char in enumerate(op_line) if char in "+*")
     operators = op_line.replace(" ", "")
     max_line_length = max(len(line) for line in num_lines)
@@ -59,4 +137,14 @@ if __name__ == "__main__":
     parsed_cols = [list(read_col_vertically(col)) for col in padded_cols]
 
     results_part2 = [solve_problem(col_nums, op) for col_nums, op in zip(parsed_cols, operators)]
-    print(f"Part 2: {sum(results_part2)}")
+    return sum(results_part2)
+
+
+if __name__ == "__main__":
+    worksheet = stream_worksheet(f'{__file__.split(".")[0]}.txt')
+
+    # Part 1
+    print(f"Part 1: {part1(worksheet)}")
+
+    # Part 2
+    print(f"Part 2: {part2(worksheet)}")
@@ -1,9 +1,26 @@
 import itertools as it
 from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import cached_property
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
-    input_lines = [l.strip() for l in f.readlines()]
+import numpy as np
+
+# Turns a line into a binary number string, "1" for each splitter
+SPLITTER_BITS = str.maketrans({".": "0", "S": "0", "^": "1"})
+
+
+@dataclass
+class Manifold:
+    width: int
+    start_index: int
+    # Bitmap of the splitters of each row with splitters, bit `i` is set for a splitter at index `i`
+    splitter_rows: list[int]
+
+    @cached_property
+    def counts(self) -> tuple[int, int]:
+        """ Both parts come from the same pass, so it runs once per manifold. :return: See `propagate()`. """
+        return propagate(self)
 
 
 def split_beams(beam_idxs: set[int], splitter_idx: set[int]) -> tuple[set[int], int]:
@@ -19,20 +36,87 @@ def find_splitters(s: str) -> set[int]:
     return {i for i, char in enumerate(s) if char == "^"}
 
 
-if __name__ == "__main__":
+def splitter_bitmap(line: str) -> int:
+    # Reversed, so the first character ends up as lowest bit
+    return int(line.translate(SPLITTER_BITS)[::-1], 2)
+
+
+def bitmap_to_array(bitmap: int, width: int) -> np.ndarray:
+    """ :return: Boolean array, with entry `i` set if bit `i` of `bitmap` is set. """
+    bitmap_bytes = np.frombuffer(bitmap.to_bytes((width + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(bitmap_bytes, bitorder="little")[:width].astype(bool)
+
+
+def read_manifold(lines: Iterable[str]) -> Manifold:
+    """ Takes the lines one by one (i.e. straight from a file), only rows with splitters are kept, as bitmaps. """
+    lines = (line.strip() for line in lines)
+    first_line = next(line for line in lines if line)
+    splitter_rows = [splitter_bitmap(line) for line in lines if "^" in line]
+    return Manifold(len(first_line), first_line.index("S"), splitter_rows)
+
+
+def propagate(manifold: Manifold) -> tuple[int, int]:
+    """
+    Sends the beam through all rows in one go, solving both parts at once.
+
+    Part 1: The beams are a bitmap as well, so the beams hitting a splitter are just `beams & splitters`.
+    These continue on both sides, which is shifting them by one bit to the left and right.
+
+    Part 2: The timelines per index are a NumPy vector, with one extra index on each side for timelines leaving the
+    manifold. Timelines at splitters are removed and added to both neighboring indices by adding shifted slices.
+    The timelines can at most double per row, so they only fit into 64 bits with less than 63 rows of splitters.
+
+    :return: Amount of splits and amount of timelines.
+    """
+    width = manifold.width
+    beams = 1 << manifold.start_index
+    splits = 0
+    dtype = np.int64 if len(manifold.splitter_rows) < 63 else object
+    timelines = np.zeros(width + 2, dtype=dtype)
+    timelines[manifold.start_index + 1] = 1
+    for splitters in manifold.splitter_rows:
+        hits = beams & splitters
+        splits += hits.bit_count()
+        # Beams leaving the manifold cannot hit any splitter, so they can be dropped
+        beams = (beams & ~splitters | hits << 1 | hits >> 1) & ((1 << width) - 1)
+
+        is_splitter = np.zeros(width + 2, dtype=bool)
+        is_splitter[1:-1] = bitmap_to_array(splitters, width)
+        split_timelines = np.where(is_splitter, timelines, 0)
+        timelines -= split_timelines
+        timelines[:-1] += split_timelines[1:]
+        timelines[1:] += split_timelines[:-1]
+    return splits, int(timelines.sum())
+
+
+def parse(text: str) -> Manifold:
+    return read_manifold(text.splitlines())
+
+
+def part1(manifold: Manifold) -> int:
+    return manifold.counts[0]
+
+
+def part2(manifold: Manifold) -> int:
+    return manifold.counts[1]
+
+
+def part1_sets(input_lines: list[str]) -> int:
+    """ Original approach with a `set` of beam indices. Only used to verify `propagate()`. """
     start_index = input_lines[0].index("S")
     splitter_lines = [line for line in input_lines[1:] if "^" in line]
 
-    # Part 1
     iter_lines = iter(splitter_lines)
     beam_indices = {start_index}
     total_splits_performed = 0
     for line in iter_lines:
         beam_indices, splits = split_beams(beam_indices, find_splitters(line))
         total_splits_performed += splits
-    print(f"Part 1: {total_splits_performed}")
+    return total_splits_performed
 
-    # Part 2
+
+def part2_dict(input_lines: list[str]) -> int:
+    """ Original approach with a `dict` of timelines per index. Only used to verify `propagate()`. """
     iter_lines = iter(input_lines)
     # Start with a single timeline at the starting index
     timelines = defaultdict(int, {next(iter_lines).index("S"): 1})
@@ -48,4 +132,15 @@ if __name__ == "__main__":
         # Timelines on each index, resulting from a split must be added to the existing count of timelines.
         for idx, count in new_timelines.items():
             timelines[idx] += count
-    print(f"Part 2: {sum(timelines.values())}")
+    return sum(timelines.values())
+
+
+if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        splits, timelines = propagate(read_manifold(f))
+
+    # Part 1
+    print(f"Part 1: {splits}")
+
+    # Part 2
+    print(f"Part 2: {timelines}")
@@ -1,72 +1,241 @@
+import heapq
 import itertools as it
 import math
 import time
-from collections import defaultdict
+from collections import Counter
+from collections.abc import Iterator
 from typing import Iterable
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    input_lines = [l.strip() for l in f.readlines()]
-
 
 def strs_to_num_tuple(nums: list[str | int]) -> tuple[int, ...]:
     return tuple(int(n) for n in nums)
 
 
-def vector_distance(vector1: tuple[int, int, int], vector2: tuple[int, int, int]) -> float:
-    return sum((a - b) ** 2 for a, b in zip(vector1, vector2)) ** 0.5
+def squared_distance(vector1: tuple[int, ...], vector2: tuple[int, ...]) -> int:
+    # Ordering by squared distance is the same as ordering by distance, and stays in exact integers
+    return sum((a - b) ** 2 for a, b in zip(vector1, vector2))
+
+
+class KDTree:
+    """
+    Static k-d tree over integer points, stored in flat lists. Each node splits its points at the median of the axis
+    with the widest spread, until at most `leaf_size` points are left. Nodes store the bounding box of their points,
+    so the squared distance from any point to the box is a lower bound for all points inside.
+    """
+    points: list[tuple[int, ...]]
+    # Point indices, ordered so each node covers the slice `order[start:end]`
+    order: list[int]
+    node_ranges: list[tuple[int, int]]
+    node_boxes: list[tuple[tuple[int, ...], tuple[int, ...]]]
+    # Child nodes of inner nodes, `None` for leaves
+    node_children: list[tuple[int, int] | None]
+
+    def __init__(self, points: list[tuple[int, ...]], leaf_size: int = 8):
+        self.points = points
+        self.order = list(range(len(points)))
+        self.node_ranges, self.node_boxes, self.node_children = [], [], []
+        if not points:
+            return
+        self.add_node(0, len(points))
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            start, end = self.node_ranges[node]
+            if end - start <= leaf_size:
+                continue
+            lower, upper = self.node_boxes[node]
+            axis = max(range(len(lower)), key=lambda a: upper[a] - lower[a])
+            self.order[start:end] = sorted(self.order[start:end], key=lambda i: points[i][axis])
+            middle = (start + end) // 2
+            children = self.add_node(start, middle), self.add_node(middle, end)
+            self.node_children[node] = children
+            nodes.extend(children)
+
+    def add_node(self, start: int, end: int) -> int:
+        coordinates = list(zip(*(self.points[i] for i in self.order[start:end])))
+        self.node_ranges.append((start, end))
+        self.node_boxes.append((tuple(map(min, coordinates)), tuple(map(max, coordinates))))
+        self.node_children.append(None)
+        return len(self.node_ranges) - 1
+
+    def box_distance(self, node: int, point: tuple[int, ...]) -> int:
+        # Plain loop, as this is called for most nodes of a search and a generator costs twice as much
+        lower, upper = self.node_boxes[node]
+        distance = 0
+        for x, lo, hi in zip(point, lower, upper):
+            if x < lo:
+                distance += (lo - x) * (lo - x)
+            elif x > hi:
+                distance += (x - hi) * (x - hi)
+        return distance
+
+    def neighbours(self, index: int) -> Iterator[tuple[int, int]]:
+        """
+        Best-first search, which only looks into a node once all closer points are done.
+        Points are queued with their exact squared distance, nodes with the lower bound of their box,
+        so whatever is popped next, no closer point can still be hidden in a node.
+
+        :return: Lazy stream of `(squared_distance, other_index)` for all other points, in increasing order.
+            Points with the same distance are ordered by index.
+        """
+        point = self.points[index]
+        # Nodes (kind 0) are opened before points (kind 1) of the same distance, so all points of that distance are
+        # queued before the first one is handed out, and they come out ordered by index
+        queue: list[tuple[int, int, int]] = [(0, 0, 0)] if self.node_ranges else []
+        while queue:
+            distance, kind, item = heapq.heappop(queue)
+            if kind == 1:
+                yield distance, item
+                continue
+            children = self.node_children[item]
+            if children is None:
+                start, end = self.node_ranges[item]
+                for other in self.order[start:end]:
+                    if other != index:
+                        heapq.heappush(queue, (squared_distance(point, self.points[other]), 1, other))
+            else:
+                for child in children:
+                    heapq.heappush(queue, (self.box_distance(child, point), 0, child))
+
+
+def nearest_pairs(points: list[tuple[int, ...]]) -> Iterator[tuple[int, int, int]]:
+    """
+    Lazy stream of all pairs of points, closest first, without holding all O(n²) pairs at any time.
+
+    Merges the neighbour streams of all points with a heap, which holds the next neighbour of each point.
+    Every pair shows up in the streams of both its points, so it is only handed out when coming from the lower index.
+    Each stream is sorted by `(distance, other_index)`, which is also the order of `(distance, lower, higher)`
+    within one stream, so merging them yields the pairs in the same order as sorting `combinations()` by distance.
+
+    :return: `(squared_distance, i, j)` with `i < j`.
+    """
+    tree = KDTree(points)
+    streams = [tree.neighbours(index) for index in range(len(points))]
+    queue: list[tuple[int, int, int, int]] = []
+    for index, stream in enumerate(streams):
+        for distance, other in it.islice(stream, 1):
+            queue.append((distance, min(index, other), max(index, other), index))
+    heapq.heapify(queue)
+    while queue:
+        distance, i, j, index = queue[0]
+        if index == i:
+            yield distance, i, j
+        for distance, other in it.islice(streams[index], 1):
+            heapq.heapreplace(queue, (distance, min(index, other), max(index, other), index))
+            break
+        else:
+            heapq.heappop(queue)
+
+
+class Circuits:
+    """
+    Disjoint-set forest over the Box IDs `0..n-1`, stored in flat lists.
+    Finding the circuit of a Box compresses the path to its root, and a union hangs the smaller circuit below the
+    bigger one, so both take nearly constant time. Circuit sizes are counted per size, for the biggest circuits.
+    """
+    parents: list[int]
+    sizes: list[int]
+    # Amount of circuits of each size
+    size_counts: Counter[int]
+    remaining: int
+
+    def __init__(self, box_count: int):
+        self.parents = list(range(box_count))
+        self.sizes = [1] * box_count
+        self.size_counts = Counter({1: box_count} if box_count else {})
+        self.remaining = box_count
+
+    def find(self, box: int) -> int:
+        root = box
+        while self.parents[root] != root:
+            root = self.parents[root]
+        # Let all boxes on the way point to the root directly
+        while self.parents[box] != root:
+            self.parents[box], box = root, self.parents[box]
+        return root
+
+    def connect(self, box1: int, box2: int) -> bool:
+        """ :return: Whether the boxes were in different circuits before. """
+        root1, root2 = self.find(box1), self.find(box2)
+        if root1 == root2:
+            return False
+        if self.sizes[root1] < self.sizes[root2]:
+            root1, root2 = root2, root1
+        size1, size2 = self.sizes[root1], self.sizes[root2]
+        for size in (size1, size2):
+            self.size_counts[size] -= 1
+            if not self.size_counts[size]:
+                del self.size_counts[size]
+        self.size_counts[size1 + size2] += 1
+        self.parents[root2] = root1
+        self.sizes[root1] = size1 + size2
+        self.remaining -= 1
+        return True
+
+    def biggest(self, k: int) -> list[int]:
+        """ :return: Sizes of the `k` biggest circuits. Only goes through the distinct sizes, not all circuits. """
+        sizes = []
+        for size in sorted(self.size_counts, reverse=True):
+            sizes.extend([size] * min(self.size_counts[size], k - len(sizes)))
+            if len(sizes) == k:
+                break
+        return sizes
+
+
+def build_n_connections(connections: Iterable[tuple[int, int]], box_count: int, n: int) -> Circuits:
+    circuits = Circuits(box_count)
+    for box1, box2 in it.islice(connections, n):
+        circuits.connect(box1, box2)
+    return circuits
+
+
+def connect_until_one_circuit(connections: Iterable[tuple[int, int]], box_count: int) -> tuple[int, int]:
+    circuits = Circuits(box_count)
+    for box1, box2 in connections:
+        # Stop, if we found the big circuit
+        if circuits.connect(box1, box2) and circuits.remaining == 1:
+            return box1, box2
+    raise RuntimeError("Could not connect all boxes into one circuit")
 
 
-def build_n_connections(connections: Iterable[tuple[tuple[int, int, int], tuple[int, int, int]]],
-                        n: int) -> list[set[tuple[int, int, int]]]:
-    circuits: dict[tuple[int, int, int], set[tuple[int, int, int]]] = defaultdict(set)
+def sorted_connections(boxes: list[tuple[int, ...]]) -> Iterator[tuple[int, int]]:
+    """ :return: Lazy stream of Box ID pairs, closest first. Only as many pairs are searched as are taken. """
+    return ((i, j) for _, i, j in nearest_pairs(boxes))
 
-    for i, (box1, box2) in zip(range(n), connections):
-        b1_circut, b2_circut = circuits[box1], circuits[box2]
-        if b1_circut is not b2_circut:
-            combined_circuit = b1_circut | b2_circut | {box1, box2}
-            for box in combined_circuit:
-                circuits[box] = combined_circuit
 
-    # Deduplicate circuits which are identical objects (= literally the very same set object
-    circuit_ids = {id(circuit): circuit for circuit in circuits.values()}
-    return list(circuit_ids.values())
+def all_connections_sorted(boxes: list[tuple[int, ...]]) -> list[tuple[int, int]]:
+    """ Sorts all pairs at once, which needs O(n²) memory. Only used to verify `sorted_connections()`. """
+    pairs = it.combinations(range(len(boxes)), 2)
+    return sorted(pairs, key=lambda pair: squared_distance(boxes[pair[0]], boxes[pair[1]]))
 
 
-def connect_until_one_circuit(connections: Iterable[tuple[tuple[int, int, int], tuple[int, int, int]]],
-                              circuit_size: int) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
-    circuits: dict[tuple[int, int, int], set[tuple[int, int, int]]] = defaultdict(set)
+def parse(text: str) -> list[tuple[int, ...]]:
+    split_nums_by_row = (line.strip().split(",") for line in text.splitlines() if line.strip())
+    return list(map(strs_to_num_tuple, split_nums_by_row))
 
-    for box1, box2 in connections:
-        b1_circut, b2_circut = circuits[box1], circuits[box2]
-        if b1_circut is not b2_circut:
-            combined_circuit = b1_circut | b2_circut | {box1, box2}
-            for box in combined_circuit:
-                circuits[box] = combined_circuit
-            # Stop, if we found the big circuit
-            if len(combined_circuit) >= circuit_size:
-                return box1, box2
-    raise RuntimeError("Could not connect all boxes into one circuit")
+
+def part1(boxes: list[tuple[int, ...]]) -> int:
+    circuits = build_n_connections(sorted_connections(boxes), box_count=len(boxes), n=len(boxes))
+    return math.prod(circuits.biggest(3))
+
+
+def part2(boxes: list[tuple[int, ...]]) -> int:
+    box1, box2 = connect_until_one_circuit(sorted_connections(boxes), box_count=len(boxes))
+    return boxes[box1][0] * boxes[box2][0]
 
 
 if __name__ == "__main__":
-    split_nums_by_row = map(lambda s: s.split(","), input_lines)
-    int_tuples = map(strs_to_num_tuple, split_nums_by_row)
-    boxes = list(int_tuples)
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        input_text = f.read()
 
     start_time = time.perf_counter_ns()
 
-    distances = {(v1, v2): vector_distance(v1, v2) for v1, v2 in it.combinations(boxes, 2)}
-    sorted_distances = sorted(distances.items(), key=lambda item: item[1])
-    sorted_connections = [pair for pair, dist in sorted_distances]
-
+    boxes = parse(input_text)
     # Part 1
-    circuits = build_n_connections(sorted_connections, n=len(boxes))
-    sorted_circuit_lens = sorted(circuits, key=len, reverse=True)
-    print(f"Part 1: {math.prod(map(len, sorted_circuit_lens[:3]))}")
+    print(f"Part 1: {part1(boxes)}")
 
     # Part 2
-    box1, box2 = connect_until_one_circuit(sorted_connections, circuit_size=len(boxes))
-    print(f"Part 2: {box1[0] * box2[0]}")
+    print(f"Part 2: {part2(boxes)}")
 
     end_time = time.perf_counter_ns()
     print(f"Time: {(end_time - start_time) / 1_000_000:.3f} ms")
@@ -1,9 +1,7 @@
 import itertools
 import math
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
-    input_lines = [l.strip() for l in f.readlines()]
+import numpy as np
 
 
 def line_to_ints(line: str) -> tuple[int, int]:
@@ -15,21 +13,142 @@ def area(a: tuple[int, int], b: tuple[int, int]) -> int:
     return math.prod(abs(x - y) + 1 for x, y in zip(a, b))
 
 
-def vsub(a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
-    return tuple((x - y for x, y in zip(a, b)))
+class CompressedPolygon:
+    """
+    The loop of red and green tiles, on a grid with only the coordinates of the red tiles (and the gaps between them).
+    Coordinate `xs[i]` becomes column `2 * i + 1`, the gap up to `xs[i + 1]` becomes column `2 * i + 2`, and there is
+    an empty column on each side (same for rows), so the grid size only depends on the amount of red tiles.
+    Every cell of this grid is either entirely inside the loop or entirely outside of it.
+    Gaps between neighboring coordinates (like 13 and 14) don't contain any tiles, so they are never counted as outside.
 
+    The outside cells are found by a parity scan (ray casting) and counted with 2D prefix sums. That way,
+    a rectangle lies within the loop if it contains no outside cell, which is checked in constant time.
+    """
+    x_index: dict[int, int]
+    y_index: dict[int, int]
+    # Grid column and row of each vertex
+    vertex_cols: np.ndarray
+    vertex_rows: np.ndarray
+    # `outside_sums[row, col]` is the amount of outside cells above and to the left of `(row, col)`
+    outside_sums: np.ndarray
 
-def vadd(a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
-    return tuple(*(x + y for x, y in zip(a, b)))
+    def __init__(self, vertices: list[tuple[int, int]]):
+        xs, ys = sorted({x for x, _ in vertices}), sorted({y for _, y in vertices})
+        self.x_index = {x: 2 * i + 1 for i, x in enumerate(xs)}
+        self.y_index = {y: 2 * i + 1 for i, y in enumerate(ys)}
+        width, height = 2 * len(xs) + 1, 2 * len(ys) + 1
+        self.vertex_cols = np.array([self.x_index[x] for x, _ in vertices], dtype=np.int64)
+        self.vertex_rows = np.array([self.y_index[y] for _, y in vertices], dtype=np.int64)
+
+        is_loop = np.zeros((height, width), dtype=bool)
+        # Marks the gap rows each vertical edge crosses, as differences: +1 in the first gap row, -1 after the last one
+        crossings = np.zeros((height, width), dtype=np.int8)
+        for (x1, y1), (x2, y2) in itertools.pairwise(vertices + vertices[:1]):
+            if x1 != x2 and y1 != y2:
+                raise ValueError(f"Tiles {(x1, y1)} and {(x2, y2)} are not in the same row or column")
+            col1, col2 = sorted((self.x_index[x1], self.x_index[x2]))
+            row1, row2 = sorted((self.y_index[y1], self.y_index[y2]))
+            is_loop[row1:row2 + 1, col1:col2 + 1] = True
+            if col1 == col2:
+                crossings[row1 + 1, col1] += 1
+                crossings[row2, col1] -= 1
+
+        # A cell between two gaps is inside, if an odd amount of vertical edges lies to its left. This is unambiguous
+        # for cells in gap rows and gap columns (even indices), as the ray never runs along an edge or through a corner.
+        crossings = np.cumsum(crossings, axis=0, dtype=np.int8).astype(np.uint8)
+        is_inside = np.bitwise_xor.accumulate(crossings, axis=1).astype(bool)
+        # Any other cell, which is not on the loop, is in the same area as the gap cell above and to the left of it
+        gap_rows, gap_cols = np.arange(height) & ~1, np.arange(width) & ~1
+        outside = ~is_loop & ~is_inside[np.ix_(gap_rows, gap_cols)]
+
+        has_tiles_x = np.array([True] + [col % 2 == 1 or xs[col // 2] - xs[col // 2 - 1] > 1
+                                         for col in range(1, width - 1)] + [True])
+        has_tiles_y = np.array([True] + [row % 2 == 1 or ys[row // 2] - ys[row // 2 - 1] > 1
+                                         for row in range(1, height - 1)] + [True])
+        outside &= has_tiles_y[:, np.newaxis] & has_tiles_x[np.newaxis, :]
+        outside_sums = outside.cumsum(axis=0, dtype=np.int32).cumsum(axis=1, dtype=np.int32)
+        self.outside_sums = np.pad(outside_sums, ((1, 0), (1, 0)))
+
+    def contains_rectangle(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
+        """ :return: Whether the rectangle with the red tiles `a` and `b` as opposite corners lies within the loop. """
+        col1, col2 = sorted((self.x_index[a[0]], self.x_index[b[0]]))
+        row1, row2 = sorted((self.y_index[a[1]], self.y_index[b[1]]))
+        sums = self.outside_sums
+        return sums[row2 + 1, col2 + 1] - sums[row1, col2 + 1] - sums[row2 + 1, col1] + sums[row1, col1] == 0
+
+    def contains_rectangles(self, vertex: int) -> np.ndarray:
+        """
+        Same as `contains_rectangle()`, for the rectangles of one vertex with each vertex at once.
+
+        :param vertex: Index of the vertex, in the order given to the constructor.
+        :return: Boolean array, whether the rectangle with each vertex lies within the loop.
+        """
+        col1 = np.minimum(self.vertex_cols[vertex], self.vertex_cols)
+        col2 = np.maximum(self.vertex_cols[vertex], self.vertex_cols)
+        row1 = np.minimum(self.vertex_rows[vertex], self.vertex_rows)
+        row2 = np.maximum(self.vertex_rows[vertex], self.vertex_rows)
+        sums = self.outside_sums
+        return sums[row2 + 1, col2 + 1] - sums[row1, col2 + 1] - sums[row2 + 1, col1] + sums[row1, col1] == 0
+
+
+def largest_rectangle(tiles: list[tuple[int, int]],
+                      polygon: CompressedPolygon | None = None,
+                      block_size: int = 256) -> int:
+    """
+    Finds the biggest rectangle with red tiles as opposite corners, which lies within the loop if `polygon` is given
+    (it has to be built from the same `tiles`).
+
+    The biggest rectangle of each tile is an upper bound for the rectangles of that tile, so tiles are tried in order of
+    their bound and all tiles whose bound can't beat the best rectangle found so far are skipped.
+    The rectangles of a tile with all other tiles are checked at once. The areas are only calculated for a block of
+    `block_size` tiles at a time, so memory grows linearly with the amount of tiles.
+
+    :return: Area of the biggest rectangle, 0 if there is none.
+    """
+    xs, ys = np.array(tiles, dtype=np.int64).reshape(-1, 2).T
+
+    def tile_areas(idxs: slice | int) -> np.ndarray:
+        """ :return: Areas of the rectangles of the tiles `idxs` with all tiles, one row per tile if it's a slice. """
+        return (np.abs(xs[idxs, np.newaxis] - xs) + 1) * (np.abs(ys[idxs, np.newaxis] - ys) + 1)
+
+    bounds = np.zeros(len(xs), dtype=np.int64)
+    for start in range(0, len(xs), block_size):
+        bounds[start:start + block_size] = tile_areas(slice(start, start + block_size)).max(axis=1)
+    best = 0
+    for idx in np.argsort(-bounds, kind="stable"):
+        if bounds[idx] <= best:
+            break
+        areas = tile_areas(idx)
+        if polygon is not None:
+            areas = np.where(polygon.contains_rectangles(idx), areas, 0)
+        best = max(best, int(areas.max()))
+    return best
+
+
+def parse(text: str) -> list[tuple[int, int]]:
+    return [line_to_ints(line.strip()) for line in text.splitlines() if line.strip()]
+
+
+def part1(tiles: list[tuple[int, int]]) -> int:
+    return largest_rectangle(tiles)
+
+
+def part1_combinations(tiles: list[tuple[int, int]]) -> int:
+    """ Original approach, going through all combinations in Python. Only used to verify `largest_rectangle()`. """
+    tile_combinations = itertools.combinations(tiles, 2)
+    return max(itertools.starmap(area, tile_combinations))
+
+
+def part2(tiles: list[tuple[int, int]]) -> int:
+    return largest_rectangle(tiles, CompressedPolygon(tiles))
 
 
 if __name__ == "__main__":
-    tiles = [line_to_ints(line) for line in input_lines]
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        tiles = parse(f.read())
 
     # Part 1
-    tile_combinations = itertools.combinations(tiles, 2)
-    biggest_tile_area = max(itertools.starmap(area, tile_combinations))
-    print(f"Part 1: {biggest_tile_area}")
+    print(f"Part 1: {part1(tiles)}")
 
     # Part 2
-    vectors = [vsub(v2, v1) for v1, v2 in itertools.pairwise(tiles + tiles[:1])]
+    print(f"Part 2: {part2(tiles)}")
@@ -1,41 +1,89 @@
 import collections
-import itertools
 import itertools as it
+import math
 import operator
+from fractions import Fraction
 from functools import reduce
-from queue import Queue
+from typing import NamedTuple
 
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
-    input_lines = [l.strip() for l in f.readlines()]
+import numpy as np
+
+
+class Machine(NamedTuple):
+    # Desired lights as bitmask, first light is the highest bit
+    lights: int
+    light_count: int
+    # Indices of the lights/counters each button is connected to
+    buttons: tuple[tuple[int, ...], ...]
+    joltages: tuple[int, ...]
 
 
 def nums_to_mask(nums: tuple[int, ...], total_length: int) -> int:
     return sum(1 << (total_length - 1 - n) for n in nums)
 
 
-def light_switch_buttons(line: str) -> tuple[int, ...]:
+def parse_machine(line: str) -> Machine:
     light_chars = line[line.index("[") + 1:line.index("]")]
     lights = sum(1 << (len(light_chars) - 1 - i) for i, c in enumerate(light_chars) if c == "#")
     joltages = tuple(int(s) for s in line[line.index("{") + 1:line.index("}")].split(","))
     connection_blocks = (block.strip("()") for block in line[line.index(" ") + 1:line.index("{") - 1].split())
     connections = tuple(tuple(map(int, block.split(","))) for block in connection_blocks)
-    # Bit-masks for each button
-    btn_masks: tuple[int, ...] = tuple(nums_to_mask(btn, len(light_chars)) for btn in connections)
-    btn_presses = it.chain.from_iterable(it.combinations(btn_masks, r=n) for n in range(1, len(btn_masks) + 1))
+    return Machine(lights, len(light_chars), connections, joltages)
+
+
+def light_switch_buttons(machine: Machine) -> tuple[int, ...]:
+    """
+    Solves the lights as linear system over GF(2): pressing a button XORs its mask, so each button is pressed once or
+    not at all. The button masks are eliminated into a basis (one mask per leading bit), each basis entry remembers the
+    combination of buttons it was built from. Buttons reducing to `0` are combinations toggling nothing, any of them can
+    be added to a solution, so only these few (2^free buttons) solutions are compared for the fewest presses.
+
+    :return: Bitmasks of the buttons to press, in button order.
+    """
+    btn_masks = tuple(nums_to_mask(btn, machine.light_count) for btn in machine.buttons)
+    # Leading bit -> (mask, combination of buttons XORed into it, as bitmask of button indices)
+    basis: dict[int, tuple[int, int]] = {}
+    idle_combinations: list[int] = []
+    for idx, mask in enumerate(btn_masks):
+        combination = 1 << idx
+        while mask:
+            leading_bit = mask.bit_length() - 1
+            if leading_bit not in basis:
+                basis[leading_bit] = (mask, combination)
+                break
+            mask ^= basis[leading_bit][0]
+            combination ^= basis[leading_bit][1]
+        else:
+            idle_combinations.append(combination)
+
+    remaining, solution = machine.lights, 0
+    while remaining:
+        leading_bit = remaining.bit_length() - 1
+        if leading_bit not in basis:
+            raise RuntimeError("No solution found")
+        remaining ^= basis[leading_bit][0]
+        solution ^= basis[leading_bit][1]
+
+    idle_subsets = it.chain.from_iterable(
+        it.combinations(idle_combinations, r=n) for n in range(len(idle_combinations) + 1))
+    best = min((reduce(operator.xor, subset, solution) for subset in idle_subsets), key=int.bit_count)
+    return tuple(mask for idx, mask in enumerate(btn_masks) if best >> idx & 1)
+
+
+def light_switch_buttons_slow(machine: Machine) -> tuple[int, ...]:
+    """ Tries all combinations of button presses, fewest presses first. """
+    btn_masks = tuple(nums_to_mask(btn, machine.light_count) for btn in machine.buttons)
+    btn_presses = it.chain.from_iterable(it.combinations(btn_masks, r=n) for n in range(len(btn_masks) + 1))
     for press_combination in btn_presses:
-        result = reduce(operator.xor, press_combination, lights)
-        if result == 0:
+        if reduce(operator.xor, press_combination, machine.lights) == 0:
             return press_combination
     raise RuntimeError("No solution found")
 
 
-def joltage_buttons_slow(line: str) -> tuple[tuple[int, ...], ...]:
-    target_joltages = tuple(int(s) for s in line[line.index("{") + 1:line.index("}")].split(","))
-    connection_blocks = (block.strip("()") for block in line[line.index(" ") + 1:line.index("{") - 1].split())
-    connections = tuple(tuple(map(int, block.split(","))) for block in connection_blocks)
+def joltage_buttons_slow(machine: Machine) -> tuple[tuple[int, ...], ...]:
+    target_joltages = machine.joltages
     btn_presses = it.chain.from_iterable(
-        it.combinations_with_replacement(connections, r=n) for n in it.count(max(target_joltages)))
+        it.combinations_with_replacement(machine.buttons, r=n) for n in it.count(max(target_joltages)))
     for press_combination in btn_presses:
         raised_joltage_indices = it.chain.from_iterable(press_combination)
         counted_increases: dict[int, int] = collections.Counter(raised_joltage_indices)
@@ -45,57 +93,143 @@ def joltage_buttons_slow(line: str) -> tuple[tuple[int, ...], ...]:
     raise RuntimeError("No solution found")
 
 
-def joltage_buttons(line: str) -> int:
-    target_joltages = tuple(int(s) for s in line[line.index("{") + 1:line.index("}")].split(","))
-    connection_blocks = (block.strip("()") for block in line[line.index(" ") + 1:line.index("{") - 1].split())
-    connections = tuple(tuple(map(int, block.split(","))) for block in connection_blocks)
-    return eliminate_slot_big_jump_first(target_joltages, frozenset(connections), 0)
-
-
-def eliminate_slot_big_jump_first(joltages: tuple[int, ...], buttons: frozenset[tuple[int, ...]],
-                                  presses_taken: int) -> int:
-    min_idx = joltages.index(min(filter(lambda x: x > 0, joltages)))
-    # Check if all joltages that need to be configured, have a button left, which configures them.
-    joltages_to_configure = (idx for idx, j in enumerate(joltages) if j > 0)
-    if not all(idx in it.chain.from_iterable(buttons) for idx, j in enumerate(joltages_to_configure) if j > 0):
-        return 0
-    # If no buttons are available, this path is invalid, thus return 0, to not contribute to the sum.
-    possible_buttons = list(filter(lambda btn: min_idx in btn, buttons))
-    if len(possible_buttons) == 0:
-        return 0
-    button_to_press = max(possible_buttons, key=len)
-    # Press maximum amount of times, down to a single press, testing each amount.
-    # If solution is found, return immediately with the amount of presses taken.
-    # If no solution is found, but nothing is negative yet (valid button press),
-    #     add the presses takes (i) and recurse.
-    #     Remove the pressed button from the available buttons, so others are tried.
-    # If no available button can be pressed without going negative (end of loop), return 0, as this is a failed path.
-    for i in range(joltages[min_idx], -1, -1):
-        new_joltages = tuple(x - (i if idx in button_to_press else 0) for idx, x in enumerate(joltages))
-        if all(x == 0 for x in new_joltages):
-            return presses_taken + i
-        if all(x >= 0 for x in new_joltages):
-            new_buttons: frozenset[tuple[int, ...]] = frozenset(
-                btn for btn in buttons
-                if btn != button_to_press and all(new_joltages[idx] > 0 for idx in btn)
-            )
-            presses = eliminate_slot_big_jump_first(joltages=new_joltages, buttons=new_buttons,
-                                                    presses_taken=presses_taken + i)
-            if presses > 0:
-                return presses
-    # No button can be pressed without going negative
-    return 0
+def reduced_row_echelon(matrix: list[list[Fraction]]) -> list[int]:
+    """
+    Gauss-Jordan elimination in place, the last column is the right-hand side.
+
+    :return: Column of the pivot of each non-zero row, in row order.
+    """
+    pivot_cols: list[int] = []
+    for col in range(len(matrix[0]) - 1):
+        row = len(pivot_cols)
+        pivot_row = next((r for r in range(row, len(matrix)) if matrix[r][col] != 0), None)
+        if pivot_row is None:
+            continue
+        matrix[row], matrix[pivot_row] = matrix[pivot_row], matrix[row]
+        pivot = matrix[row][col]
+        matrix[row] = [value / pivot for value in matrix[row]]
+        for other in range(len(matrix)):
+            factor = matrix[other][col]
+            if other != row and factor != 0:
+                matrix[other] = [value - factor * pivot_value for value, pivot_value in zip(matrix[other], matrix[row])]
+        pivot_cols.append(col)
+    return pivot_cols
+
+
+def joltage_buttons(machine: Machine) -> int:
+    """
+    Solves `A x = b` for the fewest total presses `sum(x)`, with `x` non-negative integers. `A` is the incidence matrix
+    of counters (rows) and buttons (columns), `b` the joltages.
+
+    After elimination over rationals, each pivot button is determined by the presses of the free buttons, so only the
+    free buttons are searched. Each row is scaled to integers, `d * x_pivot = m - sum(n_f * x_f)`, and a combination of
+    free presses is valid if every right-hand side is divisible by `d` and between `0` and `d` times the most presses of
+    the pivot button (the lowest joltage of its counters, as presses can't be undone).
+    Going depth-first, these limits narrow down the presses of the next free button, given the presses so far and the
+    range the remaining free buttons can still add. The last free button is checked for its whole range with numpy.
+
+    :return: Fewest total button presses reaching the joltages.
+    """
+    buttons, joltages = machine.buttons, machine.joltages
+    matrix = [[Fraction(int(counter in button)) for button in buttons] + [Fraction(joltage)]
+              for counter, joltage in enumerate(joltages)]
+    pivot_cols = reduced_row_echelon(matrix)
+    if any(row[-1] != 0 for row in matrix[len(pivot_cols):]):
+        raise RuntimeError("No solution found")
+    matrix = matrix[:len(pivot_cols)]
+    most_presses = [min(joltages[counter] for counter in button) if button else 0 for button in buttons]
+    # Free buttons with the fewest possible presses first, the last one is checked with numpy at once
+    free_cols = sorted((col for col in range(len(buttons)) if col not in pivot_cols), key=lambda col: most_presses[col])
+
+    # Integer rows, `d * x_pivot = m - sum(n_f * x_f)`, as scales `d`, numerators `m` and factors `n_f`
+    scales, numerators, factors, pivot_limits = [], [], [], []
+    for row, pivot_col in zip(matrix, pivot_cols):
+        scale = math.lcm(*(value.denominator for value in row))
+        scales.append(scale)
+        numerators.append(int(row[-1] * scale))
+        factors.append([int(row[col] * scale) for col in free_cols])
+        pivot_limits.append(scale * most_presses[pivot_col])
+    free_limits = [most_presses[col] for col in free_cols]
+    # Range of `sum(n_f * x_f)` over the free buttons from `depth` on, per row
+    lowest = [[sum(min(row[f] * free_limits[f], 0) for f in range(depth, len(free_cols))) for row in factors]
+              for depth in range(len(free_cols) + 1)]
+    highest = [[sum(max(row[f] * free_limits[f], 0) for f in range(depth, len(free_cols))) for row in factors]
+               for depth in range(len(free_cols) + 1)]
+    # Total presses are `sum(m / d) + sum(c_f * x_f)`, each pivot button contributes `-n_f / d` to `c_f`.
+    # Scaled by a common denominator, so the search can compare with integers.
+    denominator = math.lcm(*scales)
+    costs = [int((1 - sum(row[col] for row in matrix)) * denominator) for col in free_cols]
+    # Least the scaled total can still change by the free buttons from `depth` on
+    cost_floor = [sum(min(costs[f], 0) * free_limits[f] for f in range(depth, len(free_cols)))
+                  for depth in range(len(free_cols) + 1)]
+    scale_column = np.array(scales, dtype=np.int64)[:, None]
+    best = math.inf
+
+    def search(depth: int, remaining: list[int], presses: int, total: int):
+        nonlocal best
+        if total + cost_floor[depth] >= best * denominator:
+            return
+        if depth == len(free_cols):
+            # Only reached without free buttons, the elimination determined all presses already
+            if all(0 <= numerator <= limit and numerator % scale == 0
+                   for numerator, limit, scale in zip(remaining, pivot_limits, scales)):
+                best = presses + sum(numerator // scale for numerator, scale in zip(remaining, scales))
+            return
+        low, high = 0, free_limits[depth]
+        for r, row in enumerate(factors):
+            # `n_f * x_f` has to keep the numerator between 0 and its limit, whatever the later free buttons add
+            most = remaining[r] - lowest[depth + 1][r]
+            least = remaining[r] - pivot_limits[r] - highest[depth + 1][r]
+            factor = row[depth]
+            if factor > 0:
+                low, high = max(low, -(-least // factor)), min(high, most // factor)
+            elif factor < 0:
+                low, high = max(low, -(-most // factor)), min(high, least // factor)
+            elif most < 0 or least > 0:
+                return
+        if low > high:
+            return
+        if depth == len(free_cols) - 1:
+            free_presses = np.arange(low, high + 1, dtype=np.int64)
+            column = np.array([row[depth] for row in factors], dtype=np.int64)[:, None]
+            chunk_numerators = np.array(remaining, dtype=np.int64)[:, None] - column * free_presses
+            valid = (chunk_numerators % scale_column == 0).all(axis=0)
+            if valid.any():
+                totals = presses + free_presses + (chunk_numerators // scale_column).sum(axis=0)
+                best = min(best, int(totals[valid].min()))
+            return
+        # Cheaper presses first, so the bound on the total prunes early
+        for p in range(high, low - 1, -1) if costs[depth] < 0 else range(low, high + 1):
+            search(depth + 1, [numerator - row[depth] * p for numerator, row in zip(remaining, factors)],
+                   presses + p, total + costs[depth] * p)
+
+    search(0, numerators, 0, int(sum(row[-1] for row in matrix) * denominator))
+    if best == math.inf:
+        raise RuntimeError("No solution found")
+    return best
+
+
+def parse(text: str) -> list[Machine]:
+    return [parse_machine(line.strip()) for line in text.splitlines() if line.strip()]
+
+
+def part1(machines: list[Machine]) -> int:
+    return sum(len(light_switch_buttons(machine)) for machine in machines)
+
+
+def part2(machines: list[Machine]) -> int:
+    return sum(joltage_buttons(machine) for machine in machines)
 
 
 if __name__ == "__main__":
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        machines = parse(f.read())
+
     # Part 1
-    button_presses = sum(len(light_switch_buttons(line)) for line in input_lines)
-    print(f"Part 1: {button_presses}")
+    print(f"Part 1: {part1(machines)}")
 
     # Part 2
-    # joltage_buttons(input_lines[0])
-    # exit(0)
-    button_presses, results = itertools.tee(joltage_buttons(line) for line in input_lines)
+    button_presses = [joltage_buttons(machine) for machine in machines]
     for i, presses in enumerate(button_presses):
         print(f"Line {i + 1}: {presses} button presses")
-    print(f"Part 2: {sum(results)} button presses")
+    print(f"Part 2: {sum(button_presses)} button presses")
@@ -1,10 +1,5 @@
 import math
-from collections.abc import Mapping
-from functools import cache
-
-with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
-    # Leading and trailing spaces matter in this challenge, so do not strip() lines here
-    input_lines = [l.strip() for l in f.readlines()]
+from collections.abc import Iterable, Mapping
 
 
 def line_to_tuple(line: str) -> tuple[str, tuple[str, ...]]:
@@ -12,34 +7,124 @@ def line_to_tuple(line: str) -> tuple[str, tuple[str, ...]]:
     return parts[0].strip(":"), tuple(parts[1:])
 
 
-def find_possible_paths(connections: dict[str, tuple[str, ...]], start: str, end: str) -> int:
-    @cache
-    def possible_paths(start_mode: str) -> int:
-        if start_mode == end:
-            return 1
-        return sum(possible_paths(conn) for conn in connections.get(start_mode, []))
+class DeviceGraph:
+    """
+    Device connections with the names interned to integer IDs, in topological order.
+    Path counts are calculated by one sweep along that order per source device and kept for later queries.
+
+    :raises ValueError: If the connections contain a cycle, as there would be infinitely many paths.
+    """
+    ids: dict[str, int]
+    names: list[str]
+    successors: list[list[int]]
+    # Device IDs in topological order, along with the position of each device in it
+    order: list[int]
+    position: list[int]
+    # Paths from a source device to every device, by ID
+    path_counts: dict[int, list[int]]
+
+    def __init__(self, connections: Mapping[str, Iterable[str]]):
+        self.ids = {}
+        self.names = []
+        self.successors = []
+        for device, outputs in connections.items():
+            device_id = self.intern(device)
+            self.successors[device_id].extend(self.intern(output) for output in outputs)
+        self.order = self.topological_order()
+        self.position = [0] * len(self.names)
+        for position, device_id in enumerate(self.order):
+            self.position[device_id] = position
+        self.path_counts = {}
+
+    def intern(self, name: str) -> int:
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.successors.append([])
+        return self.ids[name]
+
+    def topological_order(self) -> list[int]:
+        """ Kahn's algorithm, iterative, so long chains of devices don't hit the recursion limit. """
+        in_degree = [0] * len(self.names)
+        for outputs in self.successors:
+            for output in outputs:
+                in_degree[output] += 1
+        order = [device_id for device_id, degree in enumerate(in_degree) if degree == 0]
+        for device_id in order:
+            for output in self.successors[device_id]:
+                in_degree[output] -= 1
+                if in_degree[output] == 0:
+                    order.append(output)
+        if len(order) < len(self.names):
+            raise ValueError(f"Devices are connected in a cycle: {' -> '.join(self.find_cycle(in_degree))}")
+        return order
+
+    def find_cycle(self, in_degree: list[int]) -> list[str]:
+        """
+        :param in_degree: Remaining in-degrees after Kahn's algorithm, non-zero for the devices it couldn't order.
+        :return: Names of the devices along one cycle, the first one repeated at the end.
+        """
+        predecessors: list[list[int]] = [[] for _ in self.names]
+        for device_id, outputs in enumerate(self.successors):
+            if in_degree[device_id] > 0:
+                for output in outputs:
+                    predecessors[output].append(device_id)
+        # Each unordered device has an unordered predecessor, so walking backwards has to end up in a cycle
+        walked: dict[int, int] = {}
+        device_id = next(device_id for device_id, degree in enumerate(in_degree) if degree > 0)
+        while device_id not in walked:
+            walked[device_id] = len(walked)
+            device_id = next(p for p in predecessors[device_id] if in_degree[p] > 0)
+        cycle = [d for d, step in walked.items() if step >= walked[device_id]][::-1]
+        return [self.names[d] for d in cycle + cycle[:1]]
+
+    def paths_from(self, source: int) -> list[int]:
+        """ :return: Amount of paths from `source` to each device, by ID. """
+        if source not in self.path_counts:
+            counts = [0] * len(self.names)
+            counts[source] = 1
+            # Devices before the source in topological order can't be reached from it
+            for device_id in self.order[self.position[source]:]:
+                if counts[device_id]:
+                    for output in self.successors[device_id]:
+                        counts[output] += counts[device_id]
+            self.path_counts[source] = counts
+        return self.path_counts[source]
+
+    def count_paths(self, start: str, end: str, waypoints: Iterable[str] = ()) -> int:
+        """
+        :param waypoints: Devices each path has to pass, in any order.
+        :return: Amount of paths from `start` to `end`, which pass all `waypoints`.
+        """
+        waypoints = list(waypoints)
+        if any(stop not in self.ids for stop in [start, *waypoints, end]):
+            # Unknown devices aren't connected at all, only the empty path stays on one
+            return int(len({start, *waypoints, end}) == 1)
+        # Any path passes the waypoints in topological order, so the paths between consecutive ones are multiplied
+        stop_ids = [self.ids[start]] + sorted((self.ids[w] for w in waypoints), key=self.position.__getitem__)
+        stop_ids.append(self.ids[end])
+        return math.prod(self.paths_from(source)[target] for source, target in zip(stop_ids, stop_ids[1:]))
+
+
+def parse(text: str) -> DeviceGraph:
+    line_tuples = (line_to_tuple(line.strip()) for line in text.splitlines() if line.strip())
+    return DeviceGraph(dict(line_tuples))
+
+
+def part1(graph: DeviceGraph) -> int:
+    return graph.count_paths("you", "out")
+
 
-    return possible_paths(start)
+def part2(graph: DeviceGraph) -> int:
+    return graph.count_paths("svr", "out", waypoints=("fft", "dac"))
 
 
 if __name__ == '__main__':
-    line_tuples = (line_to_tuple(line) for line in input_lines)
-    available_connections = dict(line_tuples)
+    with open(f'{__file__.split(".")[0]}.txt', mode="r") as f:
+        graph = parse(f.read())
 
     # Part 1
-    amount_paths = find_possible_paths(available_connections, "you", "out")
-    print(f"Part 1: {amount_paths}")
+    print(f"Part 1: {part1(graph)}")
 
     # Part 2
-    # Find all paths that lead from the start to either fft or dac
-    start_to_fft = find_possible_paths(available_connections, "svr", "fft")
-    start_to_dac = find_possible_paths(available_connections, "svr", "dac")
-    # Find all paths between fft and dac - pathing is not symmetrical, so find both directions
-    fft_to_dac = find_possible_paths(available_connections, "fft", "dac")
-    dac_to_fft = find_possible_paths(available_connections, "dac", "fft")
-    # Find all paths from either fft or dac to the end
-    fft_to_out = find_possible_paths(available_connections, "fft", "out")
-    dac_to_out = find_possible_paths(available_connections, "dac", "out")
-
-    total_paths = (start_to_fft * fft_to_dac * dac_to_out) + (start_to_dac * dac_to_fft * fft_to_out)
-    print(f"Part 2: {total_paths}")
+    print(f"Part 2: {part2(graph)}")
@@ -0,0 +1,193 @@
+"""
+Benchmarks the solutions of all years in one go.
+
+Each solution registered in `solvers` gets a fresh interpreter, which imports it and times parsing and each part
+separately through the solver API, with warmup runs first. The interpreter reports the time of each phase per run
+and its peak memory (RSS, where the platform reports it) back as JSON. Min/median/p95 per phase are printed
+and appended to a history file, one JSON object per day and benchmark run.
+If a baseline file exists, phases whose median got slower than the baseline (times a threshold) are flagged.
+
+Usage: `python benchmark.py [--years 2023 2025] [--days 5 17] [--repeat 5] [--save-baseline]`
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+import solvers
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak RSS stays unknown there
+    resource = None
+
+PHASES = ("parse", "part1", "part2")
+
+
+@dataclass
+class DayResult:
+    year: str
+    day: int
+    status: str = "ok"
+    # Seconds per measured run, per phase (days without part 2 only have "parse" and "part1")
+    times: dict[str, list[float]] = field(default_factory=dict)
+    peak_rss_kb: int | None = None
+    answers: list[str] = field(default_factory=list)
+    # Median seconds per phase
+    baseline: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def name(self) -> str:
+        return f"{self.year}/day{self.day}"
+
+    def stats(self, phase: str) -> dict[str, float]:
+        times = sorted(self.times[phase])
+        return {
+            "min": times[0],
+            "median": statistics.median(times),
+            # Nearest-rank percentile, so it is always one of the measured times
+            "p95": times[math.ceil(0.95 * len(times)) - 1],
+        }
+
+    def regressions(self, threshold: float, min_seconds: float) -> list[str]:
+        """
+        :param min_seconds: Phases faster than this (in the baseline and now) are too noisy to be compared.
+        :return: Phases whose median got slower than their baseline median times `threshold`.
+        """
+        regressions = []
+        for phase, times in self.times.items():
+            baseline_median = self.baseline.get(phase)
+            if not times or baseline_median is None:
+                continue
+            median = statistics.median(times)
+            if median > max(baseline_median, min_seconds) * threshold:
+                regressions.append(phase)
+        return regressions
+
+
+def measure(year: str, day: int, warmup: int, repeat: int) -> dict:
+    """
+    Runs in the child interpreter. Solves the day in-process with `solvers.solve()`.
+
+    :return: Seconds per run and phase, the answers and the peak RSS in kB of this process (`None` if unknown).
+    :raises RuntimeError: If the solution raises an error.
+    """
+    solver = solvers.registry([year], [day])[0]
+    result = solvers.solve(solver, repeat=repeat, warmup=warmup)
+    if result.error is not None:
+        raise RuntimeError(result.error)
+    peak_rss_kb = None
+    if resource is not None:
+        peak_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS reports the peak RSS in bytes, Linux in kB
+        if sys.platform == "darwin":
+            peak_rss_kb //= 1024
+    return {
+        "times": {phase: list(phase_times) for phase, phase_times in zip(PHASES, zip(*result.runs))},
+        "answers": [str(answer) for answer in result.answers],
+        "peak_rss_kb": peak_rss_kb,
+    }
+
+
+def benchmark_day(year: str, day: int, warmup: int, repeat: int, timeout: float) -> DayResult:
+    """
+    Measures one day in a fresh interpreter, so its imports, caches and memory don't affect other days.
+    `subprocess.run()` kills the interpreter, if it takes longer than `timeout` seconds for all runs.
+    """
+    result = DayResult(year, day)
+    command = [sys.executable, os.path.abspath(__file__), "--measure", year, str(day),
+               "--warmup", str(warmup), "--repeat", str(repeat)]
+    try:
+        process = subprocess.run(command, cwd=solvers.ROOT, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        result.status = f"timeout after {timeout:g} s"
+        return result
+    if process.returncode != 0:
+        last_lines = process.stderr.strip().splitlines()[-1:]
+        result.status = f"exit code {process.returncode}: {' '.join(last_lines)}"
+        return result
+    measurement = json.loads(process.stdout)
+    result.times = measurement["times"]
+    result.peak_rss_kb = measurement["peak_rss_kb"]
+    result.answers = measurement["answers"]
+    return result
+
+
+def load_baseline(path: str) -> dict[str, dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the solutions of all years.")
+    parser.add_argument("--years", nargs="+", default=list(solvers.YEARS))
+    parser.add_argument("--days", nargs="+", type=int, default=None)
+    parser.add_argument("--warmup", type=int, default=1, help="Runs per day before measuring, i.e. for JIT and caches")
+    parser.add_argument("--repeat", type=int, default=5, help="Measured runs per day")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds before all runs of a day are aborted")
+    parser.add_argument("--history", default=os.path.join(solvers.ROOT, "benchmark_history.jsonl"),
+                        help="File the results of this benchmark run are appended to")
+    parser.add_argument("--baseline", default=os.path.join(solvers.ROOT, "benchmark_baseline.json"),
+                        help="Median seconds per day and phase to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the medians of this run as baseline")
+    parser.add_argument("--threshold", type=float, default=1.2,
+                        help="Medians slower than the baseline times this factor are flagged as regression")
+    parser.add_argument("--min-time", type=float, default=0.001,
+                        help="Seconds below which a phase is too fast to be flagged as regression")
+    parser.add_argument("--measure", nargs=2, metavar=("YEAR", "DAY"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure is not None:
+        year, day = args.measure
+        print(json.dumps(measure(year, int(day), args.warmup, args.repeat)))
+        return
+
+    baseline = load_baseline(args.baseline)
+    timestamp = datetime.datetime.now().isoformat(timespec="seconds")
+    results = []
+    print(f"{'Day':<13}{'parse':>10}{'part 1':>10}{'part 2':>10}{'peak RSS':>12}  Notes (medians, p95 in history)")
+    for year, day, _ in solvers.discover(args.years, args.days):
+        result = benchmark_day(year, day, args.warmup, args.repeat, args.timeout)
+        result.baseline = baseline.get(result.name, {})
+        results.append(result)
+        if result.status != "ok":
+            print(f"{result.name:<13}{'-':>10}{'-':>10}{'-':>10}{'-':>12}  {result.status}")
+            continue
+        timings = "".join(f"{result.stats(phase)['median'] * 1000:>8.1f}ms" if phase in result.times else f"{'-':>10}"
+                          for phase in PHASES)
+        peak_rss = f"{result.peak_rss_kb / 1024:>9.1f}MiB" if result.peak_rss_kb is not None else f"{'-':>12}"
+        notes = ", ".join(f"REGRESSION {phase} (baseline median {result.baseline[phase] * 1000:.1f} ms)"
+                          for phase in result.regressions(args.threshold, args.min_time))
+        print(f"{result.name:<13}{timings}{peak_rss}  {notes}")
+
+    with open(args.history, "a") as f:
+        for result in results:
+            record = {"timestamp": timestamp, "year": result.year, "day": result.day, "status": result.status,
+                      "peak_rss_kb": result.peak_rss_kb, "answers": result.answers,
+                      "phases": {phase: {**result.stats(phase), "times": times}
+                                 for phase, times in result.times.items() if times}}
+            f.write(json.dumps(record) + "\n")
+
+    if args.save_baseline:
+        baseline.update({result.name: {phase: result.stats(phase)["median"] for phase in result.times}
+                         for result in results if result.status == "ok" and args.repeat > 0})
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+
+    regressions = [result.name for result in results if result.regressions(args.threshold, args.min_time)]
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Registry of the solutions offering the solver API, so they can be imported and run without their own `__main__` block.
+
+A solution offers the API by defining `parse(text) -> model` and `part1(model)`, and `part2(model)` once it is solved.
+Parts return their answer instead of printing it and must not modify the model, so a model parsed once serves both.
+The driver reads each input once and runs all selected days in this process, with separate timings per phase.
+All main solution files of each year offer the API, alternative versions like `day6.tristan.py` are not registered.
+
+Usage: `python solvers.py [--years 2022 2025] [--days 1 11] [--repeat 3]`
+"""
+
+import argparse
+import importlib.util
+import os
+import re
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from types import ModuleType
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+YEARS = ("2022", "2023", "2025")
+# Only the main solution files, not alternative versions like "day6.tristan.py"
+DAY_FILE = re.compile(r"^day(\d+)\.py$")
+# Checked on the source, as importing a solution without the API would run it
+API_FUNCTIONS = re.compile(r"^def (parse|part1)\(", re.MULTILINE)
+
+
+@dataclass
+class Solver:
+    year: str
+    day: int
+    path: str
+    parse: Callable[[str], object]
+    part1: Callable[[object], object]
+    part2: Callable[[object], object] | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.year}/day{self.day}"
+
+    @property
+    def input_path(self) -> str:
+        return f"{os.path.splitext(self.path)[0]}.txt"
+
+    def read_input(self) -> str:
+        with open(self.input_path) as f:
+            return f.read()
+
+
+@dataclass
+class SolveResult:
+    name: str
+    answers: list[object] = field(default_factory=list)
+    # Seconds of the fastest run of each phase: parsing first, then one entry per part
+    timings: list[float] = field(default_factory=list)
+    # Seconds of each phase, per measured run (warmup runs excluded)
+    runs: list[list[float]] = field(default_factory=list)
+    error: str | None = None
+
+
+def offers_api(path: str) -> bool:
+    with open(path) as f:
+        return {match.group(1) for match in API_FUNCTIONS.finditer(f.read())} == {"parse", "part1"}
+
+
+def discover(years: list[str], days: list[int] | None = None) -> list[tuple[str, int, str]]:
+    """ :return: `(year, day, path)` of each solution file offering the solver API, ordered by year and day. """
+    solutions = []
+    for year in years:
+        year_dir = os.path.join(ROOT, year)
+        if not os.path.isdir(year_dir):
+            continue
+        for file_name in os.listdir(year_dir):
+            match = DAY_FILE.match(file_name)
+            if not match or (days is not None and int(match.group(1)) not in days):
+                continue
+            path = os.path.join(year_dir, file_name)
+            if offers_api(path):
+                solutions.append((year, int(match.group(1)), path))
+            else:
+                print(f"Skipping {year}/{file_name}, as it doesn't offer parse() and part1()", file=sys.stderr)
+    return sorted(solutions)
+
+
+def import_solution(year: str, day: int, path: str) -> ModuleType:
+    """
+    Imports a solution file under a name unique across years (each year has its own `day1.py`).
+    The year folders are not packages, so the folder is added to `sys.path` for their shared modules (i.e. `gridpath`).
+    """
+    year_dir = os.path.dirname(path)
+    if year_dir not in sys.path:
+        sys.path.append(year_dir)
+    module_name = f"aoc{year}_day{day}"
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load(year: str, day: int, path: str | None = None) -> Solver:
+    """
+    :raises ValueError: If the solution doesn't offer the solver API.
+    """
+    path = path or os.path.join(ROOT, year, f"day{day:02}.py" if year == "2025" else f"day{day}.py")
+    if not offers_api(path):
+        raise ValueError(f"{year}/day{day} doesn't offer parse() and part1()")
+    module = import_solution(year, day, path)
+    return Solver(year, day, path, module.parse, module.part1, getattr(module, "part2", None))
+
+
+def registry(years: list[str] | tuple[str, ...] = YEARS, days: list[int] | None = None) -> list[Solver]:
+    return [load(year, day, path) for year, day, path in discover(list(years), days)]
+
+
+def solve(solver: Solver, text: str | None = None, repeat: int = 1, warmup: int = 0) -> SolveResult:
+    """
+    Parses the input once per run and hands the same model to both parts.
+
+    :param text: Input to solve, by default the input file next to the solution.
+    :param repeat: Measured runs of each phase, the fastest one is reported.
+    :param warmup: Runs before the measured ones (i.e. for JIT compilation and caches), their timings are dropped.
+    """
+    result = SolveResult(solver.name)
+    if text is None:
+        text = solver.read_input()
+    phases = [solver.part1] + ([solver.part2] if solver.part2 is not None else [])
+    try:
+        for run in range(warmup + repeat):
+            start_time = time.perf_counter_ns()
+            model = solver.parse(text)
+            timings = [time.perf_counter_ns() - start_time]
+            result.answers = []
+            for phase in phases:
+                start_time = time.perf_counter_ns()
+                result.answers.append(phase(model))
+                timings.append(time.perf_counter_ns() - start_time)
+            if run >= warmup:
+                result.runs.append([t / 10 ** 9 for t in timings])
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+        return result
+    result.timings = [min(phase_timings) for phase_timings in zip(*result.runs)]
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Runs the solutions offering the solver API in one process.")
+    parser.add_argument("--years", nargs="+", default=list(YEARS))
+    parser.add_argument("--days", nargs="+", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per day, the fastest run of each phase is shown")
+    args = parser.parse_args()
+
+    print(f"{'Day':<13}{'parse':>10}{'part 1':>10}{'part 2':>10}  Answers")
+    failures = []
+    for solver in registry(args.years, args.days):
+        result = solve(solver, repeat=args.repeat)
+        if result.error is not None:
+            print(f"{result.name:<13}{'-':>10}{'-':>10}{'-':>10}  {result.error}")
+            failures.append(f"{result.name}: {result.error}")
+            continue
+        timings = [f"{seconds * 1000:>8.1f}ms" for seconds in result.timings]
+        timings += [f"{'-':>10}"] * (3 - len(timings))
+        print(f"{result.name:<13}{''.join(timings)}  {', '.join(map(str, result.answers))}")
+    # A non-zero exit code lets callers like `benchmark.py` notice failed days
+    if failures:
+        sys.exit("\n".join(failures))
+
+
+if __name__ == '__main__':
+    main()